@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Audit Pool - shared directory runner for the file-based auditors
+
+Used by frontend-design/ux_audit.py and mobile-design/mobile_audit.py.
+An auditor is any class with a `findings` FindingCollector, passed_count /
+files_checked counters and an audit_file(path) method.
+
+Files are discovered once, sorted, and audited either in-process or in
+chunks on a process pool. Each worker returns per-file results, which are
+merged back in path order as soon as it is available, so the report is
+identical for any worker count and only in-flight chunks are held in memory.
+
+Per-file results can be persisted in a ResultCache keyed on the file's
+content hash and the auditor's rule-set version, so unchanged files are not
+re-audited on the next run. An auditor whose result also depends on state
+outside the file (e.g. mobile_audit's manifest framework gate) defines
+cache_context(path); an entry is only reused while that value is unchanged.
+The cache lives in the project's .agent-cache (see project_root()), never
+in the audited directory itself, so auditing src/ leaves src/ untouched.
+"""
+
+import os
+import json
+import hashlib
+import inspect
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import findings
+from findings import Finding
+
+DEFAULT_CHUNK_SIZE = 16
+CACHE_DIR_NAME = ".agent-cache"
+# A directory holding any of these is a project root (where .agent-cache goes)
+PROJECT_MARKERS = ('.agent', '.git', 'package.json', 'pyproject.toml', 'pubspec.yaml')
+
+# (path, findings, passed_count delta, files_checked delta)
+FileResult = Tuple[str, List[Finding], int, int]
+
+
+def collect_files(directory: str, extensions: Iterable[str], skip_dirs: Iterable[str],
+                  only: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    All files under directory with a matching suffix, in sorted path order.
+    With only (paths relative to directory), just those of them that exist
+    and would have been found - no walk.
+    """
+    extensions, skip_dirs = set(extensions), set(skip_dirs)
+    found = []
+    if only is not None:
+        for rel in only:
+            parts = Path(rel).parts
+            path = os.path.join(directory, rel)
+            if Path(rel).suffix in extensions and not set(parts[:-1]) & skip_dirs and os.path.isfile(path):
+                found.append(path)
+        return sorted(found)
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in skip_dirs]
+        found.extend(os.path.join(root, f) for f in files if Path(f).suffix in extensions)
+    return sorted(found)
+
+
+def _iter_files(auditor_cls, paths: Iterable[str]) -> Iterator[FileResult]:
+    """Audit paths with a fresh auditor, yielding its complete output per file."""
+    auditor = auditor_cls()
+    auditor.findings.keep_per_rule = None
+    for path in paths:
+        passed, checked = auditor.passed_count, auditor.files_checked
+        auditor.audit_file(path)
+        yield (path, auditor.findings.drain(), auditor.passed_count - passed, auditor.files_checked - checked)
+
+
+_scratch: Dict[type, object] = {}
+
+
+def evaluate_source(auditor_cls, src) -> FileResult:
+    """
+    One already-read file's complete result from a per-process scratch
+    auditor; the frontend engine's evaluate() step for pooled auditors.
+    """
+    auditor = _scratch.get(auditor_cls)
+    if auditor is None:
+        auditor = _scratch[auditor_cls] = auditor_cls()
+        auditor.findings.keep_per_rule = None
+    passed, checked = auditor.passed_count, auditor.files_checked
+    auditor.check(src)
+    return (src.path, auditor.findings.drain(), auditor.passed_count - passed, auditor.files_checked - checked)
+
+
+def audit_files(auditor_cls, paths: List[str]) -> List[FileResult]:
+    """Worker entry point: per-file results for one chunk."""
+    return list(_iter_files(auditor_cls, paths))
+
+
+def merge_results(auditor, results: Iterable[FileResult]) -> None:
+    """Fold per-file results into an auditor, in the order given."""
+    for _, found, passed, checked in results:
+        auditor.findings.extend(found)
+        auditor.passed_count += passed
+        auditor.files_checked += checked
+
+
+def ruleset_version(auditor_cls) -> str:
+    """
+    Hash of the auditor's source file, this module, the findings record
+    format, the shared SourceFile reader and its RULES_VERSION, so any rule
+    edit invalidates cached results.
+    """
+    digest = hashlib.sha256(str(getattr(auditor_cls, 'RULES_VERSION', '')).encode())
+    engine = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend_engine.py')
+    for source in (inspect.getfile(auditor_cls), __file__, findings.__file__, engine):
+        with open(source, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _content_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent per-file audit results: {abs path: [mtime_ns, size, sha256,
+    findings, passed, checked, context]}. A stat match is trusted; otherwise
+    the content hash decides. An entry whose context (see cache_context)
+    differs is a miss; a version mismatch discards the whole file.
+    """
+
+    def __init__(self, path: Path, version: str, context=None):
+        self.path = Path(path)
+        self.version = version
+        self.context = context
+        self.entries: Dict[str, list] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get('version') == version:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def lookup(self, path: str) -> Optional[FileResult]:
+        entry = self.entries.get(os.path.abspath(path))
+        if entry and entry[6] == self._context(path):
+            try:
+                st = os.stat(path)
+                if (entry[0], entry[1]) == (st.st_mtime_ns, st.st_size) or entry[2] == _content_hash(path):
+                    self.hits += 1
+                    return (path, [Finding(*f) for f in entry[3]], entry[4], entry[5])
+            except OSError:
+                pass
+        self.misses += 1
+        return None
+
+    def store(self, result: FileResult) -> None:
+        path, found, passed, checked = result
+        try:
+            st = os.stat(path)
+            entry = [st.st_mtime_ns, st.st_size, _content_hash(path), [list(f) for f in found], passed, checked,
+                     self._context(path)]
+        except OSError:
+            return
+        self.entries[os.path.abspath(path)] = entry
+        self._dirty = True
+
+    def _context(self, path: str) -> str:
+        return self.context(path) if self.context is not None else ''
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text(json.dumps({'version': self.version, 'files': self.entries}), encoding='utf-8')
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError:
+            pass  # a cache that cannot be written just means a cold next run
+
+
+def project_root(directory: str) -> Path:
+    """directory, or the nearest ancestor of it, that holds a PROJECT_MARKERS entry; directory if none does."""
+    start = Path(directory).resolve()
+    for candidate in (start, *start.parents):
+        if any((candidate / marker).exists() for marker in PROJECT_MARKERS):
+            return candidate
+    return start
+
+
+def open_cache(auditor_cls, directory: str, name: str, cache_dir: Optional[str] = None) -> ResultCache:
+    """Cache file <cache_dir or the project root's .agent-cache>/<name>.json for this auditor."""
+    root = Path(cache_dir) if cache_dir else project_root(directory) / CACHE_DIR_NAME
+    return ResultCache(root / f"{name}.json", ruleset_version(auditor_cls),
+                       getattr(auditor_cls, 'cache_context', None))
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def run_pool(auditor, paths: List[str], workers: Optional[int] = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE, cache: Optional[ResultCache] = None) -> None:
+    """
+    Audit paths into auditor. workers=None uses every core; workers=1 (or a
+    single chunk of work) stays in-process. With a cache, only files whose
+    content changed are audited and fresh results are written back.
+    """
+    hits = {}
+    pending = []
+    for path in paths:
+        cached = cache.lookup(path) if cache is not None else None
+        if cached is None:
+            pending.append(path)
+        else:
+            hits[path] = cached
+
+    fresh = _audit_all(type(auditor), pending, workers, chunk_size)
+    for path in paths:
+        result = hits.pop(path, None)
+        if result is None:
+            result = next(fresh)
+            if cache is not None:
+                cache.store(result)
+        merge_results(auditor, (result,))
+
+    if cache is not None:
+        cache.save()
+
+
+def _audit_all(cls, paths: List[str], workers: Optional[int], chunk_size: int) -> Iterator[FileResult]:
+    """Per-file results for paths, in order, using a pool when it pays off."""
+    workers = workers or default_workers()
+    chunk_size = max(1, chunk_size)
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+    if workers <= 1 or len(chunks) <= 1:
+        yield from _iter_files(cls, paths)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        # map() yields chunk results in submission order -> deterministic merge
+        for chunk_results in pool.map(audit_files, [cls] * len(chunks), chunks):
+            yield from chunk_results
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Discovery - one pruned directory walk for a whole set of glob patterns
+
+Path.glob('**/...') walks the full tree once per pattern, node_modules
+included, and the results are filtered afterwards. find_files() walks once,
+removes skipped directories from os.walk before it descends into them, and
+matches every file's root-relative path against all patterns at once (one
+combined regex).
+
+Pattern syntax follows pathlib: '*' and '?' stay within one path segment,
+a '**' segment matches zero or more directories.
+"""
+
+import os
+import re
+import functools
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+
+def _segment_regex(segment: str) -> str:
+    return ''.join('[^/]*' if c == '*' else '[^/]' if c == '?' else re.escape(c) for c in segment)
+
+
+def glob_regex(pattern: str) -> str:
+    """'**/locales/**/*.json' -> regex over a root-relative POSIX path."""
+    parts = pattern.split('/')
+    out = []
+    for i, part in enumerate(parts):
+        last = i == len(parts) - 1
+        if part == '**':
+            out.append('.*' if last else '(?:[^/]+/)*')
+        else:
+            out.append(_segment_regex(part) + ('' if last else '/'))
+    return ''.join(out)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(patterns: tuple):
+    return re.compile('|'.join(f'(?:{glob_regex(p)})' for p in patterns))
+
+
+def compile_patterns(patterns: Iterable[str]):
+    """One compiled regex; .fullmatch(relative POSIX path) is True if any pattern matches."""
+    return _compile(tuple(patterns))
+
+
+def find_files(root, patterns: Iterable[str], skip_dirs: Iterable[str] = (),
+               skip_name: Optional[Callable[[str], bool]] = None) -> List[Path]:
+    """
+    Files under root matching any pattern, in sorted order, from a single
+    walk. Directories named in skip_dirs are never entered; skip_name(name),
+    when given, excludes matching directory and file names as well.
+    """
+    matcher = _compile(tuple(patterns))
+    skip_dirs = set(skip_dirs)
+    root = str(root)
+    found = []
+    for current, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in skip_dirs and not (skip_name and skip_name(d))]
+        rel = os.path.relpath(current, root)
+        prefix = '' if rel == '.' else rel.replace(os.sep, '/') + '/'
+        for name in files:
+            if skip_name and skip_name(name):
+                continue
+            if matcher.fullmatch(prefix + name):
+                found.append(Path(current) / name)
+    return sorted(found)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+File Stream - evaluate every file, in parallel, within an optional time budget
+
+Checkers used to cap how many files they looked at (30, 50, ...) to keep
+runtime down. FileStream replaces the caps: func(item) runs over every item,
+in chunks on a process pool when there is more than one chunk of work, and
+results are yielded in submission order as soon as they are ready, so only
+the in-flight chunks are held in memory.
+
+With budget_seconds, items are ordered most recently modified first and the
+stream stops handing out work once the budget is spent; `checked` / `skipped`
+tell the caller how far it got. Chunks already running when the budget
+expires are abandoned, so the overrun is bounded by one chunk per worker.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from audit_pool import DEFAULT_CHUNK_SIZE, default_workers
+
+
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def by_recency(items: Iterable, path: Callable = str) -> list:
+    """Items ordered most recently modified first (ties keep their order)."""
+    return sorted(items, key=lambda item: _mtime(path(item)), reverse=True)
+
+
+def _apply(func: Callable, chunk: list) -> list:
+    """Worker entry point: func over one chunk."""
+    return [func(item) for item in chunk]
+
+
+class FileStream:
+    """Ordered, chunked, optionally parallel and time-budgeted map over files."""
+
+    def __init__(self, items: Iterable, budget_seconds: Optional[float] = None,
+                 workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 path: Callable = str):
+        items = list(items)
+        self.budget_seconds = budget_seconds
+        self.items = by_recency(items, path) if budget_seconds is not None else items
+        self.workers = workers or default_workers()
+        self.chunk_size = max(1, chunk_size)
+        self.checked = 0
+        # The budget covers evaluation only; discovery has already happened
+        self._deadline = time.monotonic() + budget_seconds if budget_seconds is not None else None
+
+    @property
+    def total(self) -> int:
+        return len(self.items)
+
+    @property
+    def skipped(self) -> int:
+        return self.total - self.checked
+
+    def expired(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def _remaining(self) -> Optional[float]:
+        return None if self._deadline is None else max(0.0, self._deadline - time.monotonic())
+
+    def map(self, func: Callable) -> Iterator[Tuple[object, object]]:
+        """Yield (item, func(item)) in order until done or out of budget."""
+        chunks: List[list] = [self.items[i:i + self.chunk_size]
+                              for i in range(0, len(self.items), self.chunk_size)]
+
+        if self.workers <= 1 or len(chunks) <= 1:
+            for item in self.items:
+                if self.expired():
+                    return
+                result = func(item)
+                self.checked += 1
+                yield item, result
+            return
+
+        workers = min(self.workers, len(chunks))
+        pool = ProcessPoolExecutor(max_workers=workers)
+        drained = False
+        try:
+            queued = iter(chunks)
+            pending = deque()
+            # Keep a bounded window in flight -> memory stays flat for any tree size
+            for chunk in queued:
+                pending.append((chunk, pool.submit(_apply, func, chunk)))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                chunk, future = pending.popleft()
+                try:
+                    results = future.result(timeout=self._remaining())
+                except FutureTimeout:
+                    return
+                for item, result in zip(chunk, results):
+                    self.checked += 1
+                    yield item, result
+                if self.expired():
+                    return
+                chunk = next(queued, None)
+                if chunk is not None:
+                    pending.append((chunk, pool.submit(_apply, func, chunk)))
+            drained = True
+        finally:
+            # Drained: reap the workers (their CPU is then in the caller's RUSAGE_CHILDREN);
+            # cut short: do not wait for chunks still running
+            pool.shutdown(wait=drained, cancel_futures=True)
+
+    def budget_note(self) -> Optional[str]:
+        """One-line explanation when the budget cut the run short, else None."""
+        if not self.skipped:
+            return None
+        return (f"Time budget reached: checked {self.checked} of "
+                f"{self.total} files (most recently changed first), {self.skipped} skipped")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Findings - compact, bounded collection of audit results
+
+Each finding is a Finding tuple (rule, severity, file, line, column,
+end_line, end_column, message). A
+FindingCollector keeps exact per-rule / per-severity counters for every
+finding, but only retains the first `keep_per_rule` of each rule in memory;
+the complete stream can be written to a JSON-lines file as it is produced.
+
+Auditors keep their `self.issues.append(msg, rule=...)` /
+`self.warnings.append(msg, rule=...)` call sites: those are FindingChannel
+objects that turn the message into a Finding with rule id "<tool>/<rule>",
+one per distinct check (e.g. "ux/typography/line-length"), so per-rule
+counts and retention are per check rather than per "[Category]". Rules that
+know where they matched pass span=(start, end) character offsets; those
+become 1-based line/column positions through the file's LineIndex.
+"""
+
+import json
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, TextIO, Tuple
+
+DEFAULT_KEEP_PER_RULE = 100
+
+ERROR = "error"
+WARNING = "warning"
+
+
+class Finding(NamedTuple):
+    rule: str
+    severity: str
+    file: str
+    line: int          # 1-based; 0 when the finding applies to the whole file
+    column: int
+    end_line: int
+    end_column: int
+    message: str
+
+
+class LineIndex:
+    """Offset -> (line, column) through a newline offset array and bisect, built on first use."""
+    __slots__ = ('_text', '_starts')
+
+    def __init__(self, text: str):
+        self._text = text
+        self._starts = None
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        if self._starts is None:
+            starts = [0]
+            find = self._text.find
+            i = find('\n')
+            while i != -1:
+                starts.append(i + 1)
+                i = find('\n', i + 1)
+            self._starts = starts
+        line = bisect_right(self._starts, offset) - 1
+        return line + 1, offset - self._starts[line] + 1
+
+
+class FindingChannel:
+    """
+    List-like view of one severity. append() records a finding; len() is the
+    exact total; iteration and indexing cover the retained findings only.
+    """
+    __slots__ = ('_collector', '_severity')
+
+    def __init__(self, collector: 'FindingCollector', severity: str):
+        self._collector = collector
+        self._severity = severity
+
+    def append(self, message: str, span: Optional[Tuple[int, int]] = None, *, rule: str) -> None:
+        """Record message under rule ('<category>/<check>', prefixed with the tool)."""
+        c = self._collector
+        if span is not None and c.line_index is not None:
+            line, column = c.line_index.position(span[0])
+            end_line, end_column = c.line_index.position(span[1])
+        else:
+            line = column = end_line = end_column = 0
+        c.add(Finding(f"{c.tool}/{rule}", self._severity, c.current_file,
+                      line, column, end_line, end_column, message))
+
+    def _retained(self) -> List[str]:
+        return [f.message for f in self._collector.retained(self._severity)]
+
+    def __len__(self) -> int:
+        return self._collector.severity_counts[self._severity]
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self):
+        return iter(self._retained())
+
+    def __getitem__(self, index):
+        return self._retained()[index]
+
+
+class FindingCollector:
+    """Exact counters for every finding, bounded retention, optional JSONL stream."""
+
+    def __init__(self, tool: str, keep_per_rule: Optional[int] = DEFAULT_KEEP_PER_RULE,
+                 stream: Optional[TextIO] = None):
+        self.tool = tool
+        self.keep_per_rule = keep_per_rule
+        self.stream = stream
+        self.current_file = ""
+        self.line_index: Optional[LineIndex] = None
+        self.rule_counts: Counter = Counter()
+        self.severity_counts: Counter = Counter()
+        self._kept: List[Finding] = []
+        self._rule_severity: Dict[str, str] = {}
+
+    def begin_file(self, path: str, text: Optional[str] = None) -> None:
+        """Attribute following findings to path; text enables span positions."""
+        self.current_file = path
+        self.line_index = LineIndex(text) if text is not None else None
+
+    def channel(self, severity: str) -> FindingChannel:
+        return FindingChannel(self, severity)
+
+    def add(self, finding: Finding) -> None:
+        self.rule_counts[finding.rule] += 1
+        self.severity_counts[finding.severity] += 1
+        if finding.severity == ERROR or finding.rule not in self._rule_severity:
+            self._rule_severity[finding.rule] = finding.severity
+        if self.keep_per_rule is None or self.rule_counts[finding.rule] <= self.keep_per_rule:
+            self._kept.append(finding)
+        if self.stream is not None:
+            self.stream.write(json.dumps(finding._asdict()) + "\n")
+
+    def extend(self, findings: Iterable[Finding]) -> None:
+        for f in findings:
+            self.add(f)
+
+    def drain(self) -> List[Finding]:
+        """Retained findings since the last drain (workers ship these per file)."""
+        kept, self._kept = self._kept, []
+        return kept
+
+    def retained(self, severity: Optional[str] = None) -> List[Finding]:
+        return [f for f in self._kept if severity is None or f.severity == severity]
+
+    def summary(self) -> List[dict]:
+        """Per-rule totals, most frequent first (severity: the worst seen)."""
+        return [
+            {"rule": rule, "severity": self._rule_severity[rule], "count": count}
+            for rule, count in self.rule_counts.most_common()
+        ]
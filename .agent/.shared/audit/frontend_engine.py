@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Frontend Engine - one pass over the source tree for every frontend checker
+
+ux_audit, accessibility_checker, seo_checker, geo_checker and mobile_audit
+register themselves as plugins. The engine walks the project once (never
+entering a directory every active plugin skips), reads and decodes each file
+once into a SourceFile, and hands that same object to every plugin that wants
+the path. Derived views - the case-folded text, the tag tokens, a plugin's own
+parse (ux_audit's ParsedSource) - are built on first use and then shared.
+
+A plugin is any class registered with @register(name) that provides:
+    EXTENSIONS / SKIP_DIRS   file suffixes it reads, directories it ignores
+    wants(path) -> bool      extra path filter (page detection, manifests); no side effects
+    evaluate(src) -> result  per-file work; no plugin state, may run in a worker
+    collect(result)          fold one file's result into the plugin
+    report() -> dict         the checker's JSON report
+    passed() -> bool         its pass/fail verdict
+
+A plugin's file count is the number of files it evaluated: the engine's
+per-plugin total in the summary and the checker's own files_checked both
+count exactly those, so they always agree.
+
+Every matching file is checked - there are no file-count caps. Evaluation
+streams through FileStream: chunks run on a process pool when there is more
+than one, and with a time budget the most recently changed files go first.
+
+The per-checker CLIs are thin filters: they run the engine with just their
+own plugin and format its report.
+
+Usage:
+    python frontend_engine.py <project_path> [--only ux,seo] [--json]
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import functools
+import importlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from audit_pool import DEFAULT_CHUNK_SIZE
+from file_stream import FileStream
+
+SKILLS_DIR = Path(__file__).resolve().parents[2] / "skills"
+
+# Plugin name -> (skill scripts directory, module) that registers it
+PLUGIN_MODULES = {
+    'ux': ('frontend-design/scripts', 'ux_audit'),
+    'accessibility': ('frontend-design/scripts', 'accessibility_checker'),
+    'seo': ('seo-fundamentals/scripts', 'seo_checker'),
+    'geo': ('geo-fundamentals/scripts', 'geo_checker'),
+    'mobile': ('mobile-design/scripts', 'mobile_audit'),
+}
+
+_REGISTRY: Dict[str, type] = {}
+
+_TAG_RE = re.compile(r'<([A-Za-z][\w.:-]*)([^>]*)>')
+
+
+class Tag(NamedTuple):
+    name: str      # lower-cased tag name
+    attrs: str
+    start: int
+    end: int
+
+    @property
+    def text(self) -> str:
+        return f"<{self.name}{self.attrs}>"
+
+
+class SourceFile:
+    """A file read and decoded once; derived views are built on first use."""
+    __slots__ = ('path', 'text', '_folded', '_tags', '_memo')
+
+    def __init__(self, path: str, text: str):
+        self.path = path
+        self.text = text
+        self._folded = None
+        self._tags = None
+        self._memo = {}
+
+    @classmethod
+    def read(cls, path: str) -> Optional['SourceFile']:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return cls(path, f.read())
+        except OSError:
+            return None
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def folded(self) -> str:
+        if self._folded is None:
+            self._folded = self.text.casefold()
+        return self._folded
+
+    def tags(self, *names: str) -> List[Tag]:
+        """Opening tags with one of the given names (all tags if none), from one tokenizer pass."""
+        if self._tags is None:
+            by_name: Dict[str, List[Tag]] = {}
+            for m in _TAG_RE.finditer(self.text):
+                name = m.group(1).lower()
+                by_name.setdefault(name, []).append(Tag(name, m.group(2), m.start(), m.end()))
+            self._tags = by_name
+        if not names:
+            return sorted((t for ts in self._tags.values() for t in ts), key=lambda t: t.start)
+        if len(names) == 1:
+            return self._tags.get(names[0], [])
+        return sorted((t for n in names for t in self._tags.get(n, [])), key=lambda t: t.start)
+
+    def memo(self, key: str, build: Callable):
+        """build(self) once per file, shared by every plugin asking for key."""
+        if key not in self._memo:
+            self._memo[key] = build(self)
+        return self._memo[key]
+
+
+def register(name: str):
+    """Class decorator: make a checker available to the engine under name."""
+    def decorate(cls):
+        cls.PLUGIN_NAME = name
+        _REGISTRY[name] = cls
+        return cls
+    return decorate
+
+
+def load_plugin(name: str) -> type:
+    """Registered plugin class, importing its checker module on first use."""
+    if name not in _REGISTRY:
+        if name not in PLUGIN_MODULES:
+            raise KeyError(f"Unknown frontend checker: {name}")
+        subdir, module = PLUGIN_MODULES[name]
+        scripts = str(SKILLS_DIR / subdir)
+        if scripts not in sys.path:
+            sys.path.insert(0, scripts)
+        importlib.import_module(module)
+    return _REGISTRY[name]
+
+
+def _files(project_path: str, prune: set, only: Optional[Iterable[str]]) -> Iterator[Tuple[set, str]]:
+    """(directories the file is under, path) for every file, or for the existing `only` paths."""
+    if only is not None:
+        for rel in sorted(set(only)):
+            rel_dirs = set(Path(rel).parts[:-1])
+            path = os.path.join(project_path, rel)
+            if not rel_dirs & prune and os.path.isfile(path):
+                yield rel_dirs, path
+        return
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if d not in prune)
+        rel = os.path.relpath(root, project_path)
+        rel_dirs = set() if rel == '.' else set(rel.split(os.sep))
+        for fname in sorted(files):
+            yield rel_dirs, os.path.join(root, fname)
+
+
+def _discover(project_path: str, plugins: list,
+              only: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Tuple[int, ...]]]:
+    """(path, indexes of the plugins that want it) for every file, in sorted path order."""
+    extensions = set().union(*(p.EXTENSIONS for p in plugins)) if plugins else set()
+    # Only directories every plugin skips can be pruned from the walk itself
+    prune = set.intersection(*(set(p.SKIP_DIRS) for p in plugins)) if plugins else set()
+
+    for rel_dirs, path in _files(project_path, prune, only):
+        suffix = os.path.splitext(path)[1]
+        if suffix not in extensions:
+            continue
+        wanting = tuple(i for i, p in enumerate(plugins)
+                        if suffix in p.EXTENSIONS and not rel_dirs & p.SKIP_DIRS and p.wants(path))
+        if wanting:
+            yield path, wanting
+
+
+_instances: Dict[type, object] = {}
+
+
+def _evaluate(classes: Tuple[type, ...], item: Tuple[str, Tuple[int, ...]]) -> Optional[list]:
+    """Worker side: read one file once and evaluate it for every plugin that wants it."""
+    path, wanting = item
+    src = SourceFile.read(path)
+    if src is None:
+        return None
+    results = []
+    for i in wanting:
+        plugin = _instances.get(classes[i])
+        if plugin is None:
+            plugin = _instances[classes[i]] = classes[i]()
+        results.append(plugin.evaluate(src))
+    return results
+
+
+def run(project_path: str, plugins: Iterable, budget_seconds: Optional[float] = None,
+        workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        only_files: Optional[Iterable[str]] = None) -> dict:
+    """
+    Feed every file under project_path to the plugins that want it, reading
+    each file once. Results are collected in sorted path order (most recently
+    changed first under a budget). only_files (paths relative to
+    project_path) limits the run to those files. Returns file totals for the run.
+    """
+    plugins = list(plugins)
+    for plugin in plugins:
+        plugin._engine_files = 0
+
+    stream = FileStream(_discover(project_path, plugins, only_files), budget_seconds, workers, chunk_size,
+                        path=lambda item: item[0])
+    evaluate = functools.partial(_evaluate, tuple(type(p) for p in plugins))
+    files_read = 0
+    for (_, wanting), results in stream.map(evaluate):
+        if results is None:
+            continue
+        files_read += 1
+        for i, result in zip(wanting, results):
+            plugins[i]._engine_files += 1
+            plugins[i].collect(result)
+    return {"files_read": files_read, "files_skipped": stream.skipped, "budget_note": stream.budget_note()}
+
+
+def run_checkers(project_path: str, names: Iterable[str], **options) -> Dict[str, object]:
+    """Instantiate the named plugins, run them in one pass and return them by name."""
+    plugins = {name: load_plugin(name)() for name in names}
+    run(project_path, plugins.values(), **options)
+    return plugins
+
+
+def add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """--budget-seconds / --workers, shared by every engine-backed CLI."""
+    parser.add_argument("--budget-seconds", type=float, default=None,
+                        help="Stop after this long, checking the most recently changed files first")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: all cores, 1 = in-process)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run every frontend checker in one pass over the source tree")
+    parser.add_argument("path", nargs="?", default=".", help="Project path")
+    parser.add_argument("--only", default=",".join(PLUGIN_MODULES),
+                        help=f"Comma-separated checkers (default: {','.join(PLUGIN_MODULES)})")
+    parser.add_argument("--json", action="store_true", help="Print every report as JSON")
+    add_run_arguments(parser)
+    args = parser.parse_args()
+
+    project_path = str(Path(args.path).resolve())
+    names = [n.strip() for n in args.only.split(",") if n.strip()]
+    plugins = {name: load_plugin(name)() for name in names}
+    stats = run(project_path, plugins.values(), budget_seconds=args.budget_seconds, workers=args.workers)
+
+    reports = {name: p.report() for name, p in plugins.items()}
+    verdicts = {name: p.passed() for name, p in plugins.items()}
+
+    if args.json:
+        print(json.dumps({"project": project_path, "files_read": stats["files_read"],
+                          "files_skipped": stats["files_skipped"],
+                          "passed": all(verdicts.values()), "reports": reports}, indent=2))
+    else:
+        print(f"\n[FRONTEND AUDIT] {stats['files_read']} files read once for {len(plugins)} checkers")
+        print("-" * 50)
+        for name in plugins:
+            files = getattr(plugins[name], '_engine_files', 0)
+            print(f"  {'PASS' if verdicts[name] else 'FAIL'}  {name:<14} {files} files")
+        if stats["budget_note"]:
+            print(f"[!] {stats['budget_note']}")
+        print(f"STATUS: {'PASS' if all(verdicts.values()) else 'FAIL'}")
+
+    sys.exit(0 if all(verdicts.values()) else 1)
+
+
+if __name__ == "__main__":
+    # Checkers register with the importable module, not with __main__
+    import frontend_engine
+    frontend_engine.main()
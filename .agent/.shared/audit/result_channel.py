@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Result Channel - hand a check's structured report to the orchestrator
+
+When checklist.py / verify_all.py run a check as a child process they set
+$AGENT_CHECK_RESULT to a file path. emit_report() appends the report there
+as one JSON line, so the orchestrator reads the structured result instead
+of parsing the human-readable output, which is streamed and logged as-is.
+Outside an orchestrated run the variable is unset and emit_report() does
+nothing.
+"""
+
+import os
+import json
+
+RESULT_ENV = "AGENT_CHECK_RESULT"
+
+
+def emit_report(report: dict) -> None:
+    """Append report to this process's result channel, if it has one."""
+    channel = os.environ.get(RESULT_ENV)
+    if not channel:
+        return
+    try:
+        with open(channel, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report, default=str) + "\n")
+    except OSError:
+        pass
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Check Cache - replay a check's previous result when nothing it reads changed
+============================================================================
+
+A check's cache key is a digest of
+    - its skill directory (the script, sibling modules, rule packs) and the
+      shared audit modules,
+    - the content hashes of its input files (CHECK_INPUTS globs, matched
+      against one walk of the project),
+    - the versions of the tools it shells out to (TOOL_PROBES) and of Python,
+    - the options it was run with.
+If the key matches the last run, the stored result is replayed instead of
+running the check. Only completed results (passed / failed) are stored -
+timeouts, errors and cancelled checks always run again, and so do results
+whose report says "cacheable": false (a linter that was missing or came
+from npx: installing it or restoring the network changes no input).
+
+File hashes are remembered with each file's size and mtime, so only files
+that were touched since the last run are read again. Checks not listed in
+CHECK_INPUTS (the URL-bound Lighthouse / Playwright audits) are never cached,
+and neither are the NETWORK_CHECKS: their result also depends on a live
+service (npm audit's advisory database), so an unchanged tree can still
+fail tomorrow. Their CHECK_INPUTS only decide which diffs affect them.
+
+Results live in <project>/.agent-cache/check-results.json.
+
+The same input globs decide which checks a set of changed files can affect
+(changed_since() / affected()), for runs limited to a diff.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared" / "audit"))
+from audit_pool import CACHE_DIR_NAME
+from discovery import compile_patterns, find_files
+
+from check_metrics import METRIC_KEYS
+
+CACHE_FILE = "check-results.json"
+CACHE_VERSION = 1
+SHARED_DIR = Path(__file__).resolve().parents[1] / ".shared" / "audit"
+
+# Never inputs: dependencies, VCS data, caches and outputs the checks themselves write
+SKIP_DIRS = {'node_modules', '.git', CACHE_DIR_NAME, '__pycache__', '.pytest_cache',
+             '.mypy_cache', '.ruff_cache', '.nyc_output', 'coverage'}
+
+SOURCE_GLOBS = ['**/*.js', '**/*.jsx', '**/*.ts', '**/*.tsx', '**/*.mjs', '**/*.cjs', '**/*.vue', '**/*.py']
+PROJECT_GLOBS = ['package.json', 'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'requirements*.txt',
+                 'pyproject.toml', 'setup.cfg', 'mypy.ini', 'ruff.toml', '.ruff.toml',
+                 '**/tsconfig*.json', '**/.eslintrc*', '**/eslint.config.*']
+PAGE_GLOBS = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
+
+# Check script -> files whose content decides its result
+CHECK_INPUTS = {
+    'security_scan.py': ['**/*'],
+    'dependency_analyzer.py': PROJECT_GLOBS,
+    'lint_runner.py': SOURCE_GLOBS + PROJECT_GLOBS,
+    'type_coverage.py': ['**/*.ts', '**/*.tsx', '**/*.py'],
+    'schema_validator.py': ['**/prisma/schema.prisma', '**/drizzle/*.ts', '**/schema/*.ts'],
+    'test_runner.py': ['**/*'],
+    'ux_audit.py': ['**/*.tsx', '**/*.jsx', '**/*.html', '**/*.vue', '**/*.svelte', '**/*.css'],
+    'accessibility_checker.py': ['**/*.html', '**/*.jsx', '**/*.tsx'],
+    'seo_checker.py': PAGE_GLOBS,
+    'geo_checker.py': PAGE_GLOBS,
+    'mobile_audit.py': ['**/*.tsx', '**/*.ts', '**/*.jsx', '**/*.js', '**/*.dart',
+                        '**/package.json', '**/pubspec.yaml'],
+    'i18n_checker.py': ['**/*.tsx', '**/*.jsx', '**/*.ts', '**/*.js', '**/*.vue', '**/*.py', '**/*.json'],
+}
+
+# Checks that query a live service (npm audit): never replayed, however unchanged their inputs
+NETWORK_CHECKS = {'security_scan.py', 'dependency_analyzer.py'}
+
+# Check script -> tools whose version changes its result: ('npm', package) or ('cmd', argv)
+TOOL_PROBES = {
+    'lint_runner.py': [('npm', 'eslint'), ('npm', 'typescript'), ('cmd', ['ruff', '--version']),
+                       ('cmd', ['mypy', '--version'])],
+    'type_coverage.py': [],
+    'test_runner.py': [('npm', 'jest'), ('npm', 'vitest'), ('cmd', ['node', '--version']),
+                       ('cmd', ['python', '-m', 'pytest', '--version'])],
+}
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _tree_digest(root: Path) -> str:
+    """Digest of every file under root (pycache excluded), by relative path and content."""
+    digest = hashlib.sha256()
+    for path in find_files(root, ['**/*'], {'__pycache__'}):
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(_sha256_file(str(path)).encode())
+    return digest.hexdigest()
+
+
+class RunCache:
+    """Cache keys and stored results for one orchestrator run; safe to use from worker threads."""
+
+    def __init__(self, project_path: Path, force: bool = False, cache_dir: Optional[str] = None):
+        self.project_path = Path(project_path)
+        self.force = force
+        self.path = Path(cache_dir or self.project_path / CACHE_DIR_NAME) / CACHE_FILE
+        self._lock = threading.Lock()
+        self._files: Optional[List[Tuple[str, os.stat_result]]] = None
+        self._hashes: Dict[str, str] = {}
+        self._tools: Dict[str, str] = {}
+        self._scripts: Dict[str, str] = {}
+
+        stored = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if stored.get("version") != CACHE_VERSION:
+            stored = {}
+        self._known_files: Dict[str, list] = stored.get("files", {})
+        self.checks: Dict[str, dict] = stored.get("checks", {})
+        self._seen_files: Dict[str, list] = {}
+
+    # -- key -------------------------------------------------------------
+
+    def _walk(self) -> List[Tuple[str, os.stat_result]]:
+        if self._files is None:
+            files = []
+            for path in find_files(self.project_path, ['**/*'], SKIP_DIRS):
+                try:
+                    files.append((path.relative_to(self.project_path).as_posix(), path.stat()))
+                except OSError:
+                    continue
+            self._files = files
+        return self._files
+
+    def _file_hash(self, rel: str, st: os.stat_result) -> str:
+        if rel not in self._hashes:
+            known = self._known_files.get(rel)
+            if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+                sha = known[2]
+            else:
+                try:
+                    sha = _sha256_file(str(self.project_path / rel))
+                except OSError:
+                    sha = "unreadable"
+            self._hashes[rel] = sha
+            self._seen_files[rel] = [st.st_size, st.st_mtime_ns, sha]
+        return self._hashes[rel]
+
+    def _tool_version(self, probe: tuple) -> str:
+        kind, what = probe
+        label = f"{kind}:{what if kind == 'npm' else ' '.join(what)}"
+        if label not in self._tools:
+            if kind == 'npm':
+                try:
+                    manifest = self.project_path / 'node_modules' / what / 'package.json'
+                    version = json.loads(manifest.read_text(encoding='utf-8')).get('version', '?')
+                except (OSError, ValueError):
+                    version = "absent"
+            else:
+                try:
+                    proc = subprocess.run(what, capture_output=True, text=True, timeout=20)
+                    version = (proc.stdout or proc.stderr).strip() if proc.returncode == 0 else "absent"
+                except (OSError, subprocess.TimeoutExpired):
+                    version = "absent"
+            self._tools[label] = version
+        return f"{label}={self._tools[label]}"
+
+    def _script_digest(self, script_path: Path) -> str:
+        skill_dir = script_path.resolve().parents[1]
+        key = str(skill_dir)
+        if key not in self._scripts:
+            self._scripts[key] = _tree_digest(skill_dir)
+            if 'shared' not in self._scripts:
+                self._scripts['shared'] = _tree_digest(SHARED_DIR)
+        return self._scripts[key] + self._scripts['shared']
+
+    def key(self, script_path: Path, **opts) -> Optional[str]:
+        """Cache key for running script_path with opts, or None if the check is never cached."""
+        patterns = CHECK_INPUTS.get(script_path.name)
+        if patterns is None or script_path.name in NETWORK_CHECKS:
+            return None
+        with self._lock:
+            digest = hashlib.sha256()
+            digest.update(self._script_digest(script_path).encode())
+            digest.update(sys.version.encode())
+            for probe in TOOL_PROBES.get(script_path.name, []):
+                digest.update(self._tool_version(probe).encode())
+            digest.update(json.dumps(opts, sort_keys=True, default=str).encode())
+            matcher = compile_patterns(patterns)
+            for rel, st in self._walk():
+                if matcher.fullmatch(rel):
+                    digest.update(rel.encode())
+                    digest.update(self._file_hash(rel, st).encode())
+            return digest.hexdigest()
+
+    def refresh(self, changed: List[str]) -> None:
+        """
+        Forget what changed paths may have invalidated, keeping everything
+        else warm (for a long-lived process: watch mode). The tree is walked
+        again on the next key(); unchanged files keep their memoized hashes.
+        """
+        with self._lock:
+            self._files = None
+            for rel in changed:
+                self._hashes.pop(rel, None)
+            if any(rel.startswith('.agent/') for rel in changed):
+                self._scripts.clear()
+            # Manifests and lockfiles decide the tool versions
+            project_files = compile_patterns(PROJECT_GLOBS)
+            if any(project_files.fullmatch(rel) for rel in changed):
+                self._tools.clear()
+
+    # -- results ---------------------------------------------------------
+
+    def lookup(self, name: str, key: Optional[str]) -> Optional[dict]:
+        """The stored result for name if its key still matches (never with force)."""
+        if key is None or self.force:
+            return None
+        with self._lock:
+            entry = self.checks.get(name)
+        if not entry or entry.get("key") != key:
+            return None
+        result = dict(entry["result"])
+        result["cached"] = True
+        return result
+
+    def store(self, name: str, key: Optional[str], result: dict) -> None:
+        """Remember a completed result under key, unless its report is marked not cacheable."""
+        if key is None or result.get("status") not in ("passed", "failed"):
+            return
+        if (result.get("report") or {}).get("cacheable") is False:
+            return
+        with self._lock:
+            # A replay costs nothing, so the original run's metrics are not kept with it
+            self.checks[name] = {"key": key, "result": {k: v for k, v in result.items()
+                                                         if k != "cached" and k not in METRIC_KEYS}}
+
+    def save(self) -> None:
+        """Write the cache (atomically). Hashes of files that no longer exist are dropped."""
+        with self._lock:
+            files = dict(self._known_files)
+            files.update(self._seen_files)
+            if self._files is not None:
+                present = {rel for rel, _ in self._files}
+                files = {rel: entry for rel, entry in files.items() if rel in present}
+            data = {"version": CACHE_VERSION, "files": files, "checks": self.checks}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def changed_since(project_path: Path, ref: str) -> List[str]:
+    """
+    Project-relative paths that differ between ref and the working tree
+    (committed, staged or not, deleted included) plus untracked files.
+    Raises ValueError when git cannot answer.
+    """
+    commands = (["git", "diff", "--name-only", "--relative", ref, "--"],
+                ["git", "ls-files", "--others", "--exclude-standard"])
+    changed = set()
+    for cmd in commands:
+        try:
+            proc = subprocess.run(cmd, cwd=str(project_path), capture_output=True, text=True, timeout=60)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise ValueError(f"{' '.join(cmd)}: {e}")
+        if proc.returncode != 0:
+            raise ValueError(proc.stderr.strip() or f"{' '.join(cmd)} failed")
+        changed.update(line for line in proc.stdout.splitlines() if line)
+    return sorted(changed)
+
+
+def affected(script_path: Path, project_path: Path, changed: List[str]) -> bool:
+    """
+    Whether any changed path is an input of the check (CHECK_INPUTS) or part
+    of its skill. Checks without declared inputs always count as affected.
+    """
+    patterns = CHECK_INPUTS.get(script_path.name)
+    if patterns is None:
+        return True
+    matcher = compile_patterns(patterns)
+    try:
+        skill_dir = script_path.resolve().parents[1].relative_to(Path(project_path).resolve()).as_posix() + "/"
+    except ValueError:
+        skill_dir = None
+    for rel in changed:
+        if SKIP_DIRS.intersection(rel.split("/")[:-1]):
+            continue
+        if matcher.fullmatch(rel) or (skill_dir and rel.startswith(skill_dir)):
+            return True
+    return False
+
+
+def split_cached(results: List[dict]) -> Tuple[List[str], List[str]]:
+    """(names replayed from the cache, names executed) among the checks that ran."""
+    ran = [r for r in results if not r.get("skipped")]
+    return ([r["name"] for r in ran if r.get("cached")],
+            [r["name"] for r in ran if not r.get("cached")])
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Check Metrics - per-check wall/CPU/memory figures and a timeline across runs
+============================================================================
+
+Every executed check gets
+    wall_s          monotonic wall time
+    cpu_user_s      user CPU seconds
+    cpu_sys_s       system CPU seconds
+    cpu_scope       what the CPU figures cover: "check" (all of it) or
+                    "thread" (an in-process run()'s own thread only)
+    peak_rss_kb     peak resident set size (None for in-process checks)
+    output_bytes    size of what it produced (stdout+stderr, or its JSON report)
+    alone           no other check was active at any point while it ran
+
+Subprocess checks are measured from the child's own rusage (os.wait4), so
+concurrent checks do not blur each other: --subprocess gives complete
+per-check CPU and memory figures. An in-process check shares the
+orchestrator process. When it ran alone, its CPU is the process's own plus
+its reaped children's (helper threads, tsc / eslint / npm); otherwise only
+the CPU of the thread that ran run() is attributable to it, and that is
+what is recorded, scoped "thread" (its child processes are not counted).
+The process's peak RSS says nothing about one check, so none is recorded.
+check_activity() marks each check's execution; an abandoned run() stays
+active until it returns.
+
+Wall times of checks that overlapped others include contention, so only
+runs made alone are compared for regressions.
+
+Each run is appended to a timeline - JSON lines, or CSV when the path ends
+in .csv - one row per check, so history accumulates across runs.
+regressions() compares a run against the median of recent executed runs of
+the same check.
+"""
+
+import sys
+import csv
+import json
+import time
+import uuid
+import threading
+import contextlib
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared" / "audit"))
+from audit_pool import CACHE_DIR_NAME
+
+TIMELINE_FILE = "check-timeline.jsonl"
+NUMERIC_METRICS = ("wall_s", "cpu_user_s", "cpu_sys_s", "peak_rss_kb", "output_bytes")
+METRIC_KEYS = NUMERIC_METRICS + ("cpu_scope", "rss_scope", "alone")
+TIMELINE_FIELDS = ("run_id", "timestamp", "orchestrator", "check", "status", "cached", "mode") + METRIC_KEYS
+
+# A check has regressed when it is this much slower than its recent median...
+REGRESSION_RATIO = 1.2
+# ...and by at least this many seconds (ignores noise on sub-second checks)
+REGRESSION_MIN_SECONDS = 0.5
+REGRESSION_WINDOW = 5
+
+_activity_lock = threading.Lock()
+# Checks using CPU in this process right now (abandoned run() calls included), and how many ever started
+_active = 0
+_started = 0
+
+
+def new_run_id() -> str:
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def _maxrss_kb(ru) -> int:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return ru.ru_maxrss // 1024 if sys.platform == 'darwin' else ru.ru_maxrss
+
+
+def activity_started() -> None:
+    global _active, _started
+    with _activity_lock:
+        _active += 1
+        _started += 1
+
+
+def activity_stopped() -> None:
+    global _active
+    with _activity_lock:
+        _active -= 1
+
+
+@contextlib.contextmanager
+def check_activity():
+    """Count the enclosed work (one check's execution) as CPU spent on a check; also a decorator."""
+    activity_started()
+    try:
+        yield
+    finally:
+        activity_stopped()
+
+
+def thread_cpu() -> Optional[Tuple[float, float]]:
+    """(user, sys) CPU seconds used so far by the calling thread."""
+    if RESOURCE_AVAILABLE and hasattr(resource, 'RUSAGE_THREAD'):
+        ru = resource.getrusage(resource.RUSAGE_THREAD)
+        return ru.ru_utime, ru.ru_stime
+    return time.thread_time(), 0.0
+
+
+def metrics_start() -> dict:
+    """The activity counts and process CPU (own + reaped children) when a check starts."""
+    with _activity_lock:
+        cpu = None
+        if RESOURCE_AVAILABLE:
+            own, children = resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+            cpu = (own.ru_utime + children.ru_utime, own.ru_stime + children.ru_stime)
+        return {"active": _active, "started": _started, "cpu": cpu}
+
+
+def _ran_alone(start: dict) -> bool:
+    # Only this check was active at the start, and none started since
+    with _activity_lock:
+        return start["active"] == 1 and _started == start["started"]
+
+
+def subprocess_metrics(completed, wall: float, start: dict) -> dict:
+    """Metrics for a finished run_command() child started at start (metrics_start())."""
+    out = getattr(completed, 'output_bytes', None)
+    if out is None:
+        out = len((completed.stdout or '').encode('utf-8', 'replace')) + \
+            len((completed.stderr or '').encode('utf-8', 'replace'))
+    alone = _ran_alone(start)
+    ru = getattr(completed, 'rusage', None)
+    if ru is None:
+        return {"wall_s": wall, "cpu_user_s": None, "cpu_sys_s": None, "cpu_scope": None, "peak_rss_kb": None,
+                "output_bytes": out, "rss_scope": None, "alone": alone}
+    return {"wall_s": wall, "cpu_user_s": ru.ru_utime, "cpu_sys_s": ru.ru_stime, "cpu_scope": "check",
+            "peak_rss_kb": _maxrss_kb(ru), "output_bytes": out, "rss_scope": "check", "alone": alone}
+
+
+def in_process_metrics(start: dict, wall: float, report: Optional[dict],
+                       run_thread_cpu: Optional[Tuple[float, float]]) -> dict:
+    """
+    Metrics for a run() call started at start (metrics_start()) that used
+    run_thread_cpu in its own thread: the whole process's CPU if the check
+    ran alone, else that thread's.
+    """
+    alone = _ran_alone(start)
+    end = metrics_start()["cpu"]
+    if alone and start["cpu"] is not None:
+        user, system, scope = end[0] - start["cpu"][0], end[1] - start["cpu"][1], "check"
+    elif run_thread_cpu is not None:
+        (user, system), scope = run_thread_cpu, "thread"
+    else:
+        user, system, scope = None, None, None
+    out = len(json.dumps(report, default=str).encode('utf-8')) if report is not None else 0
+    return {"wall_s": wall, "cpu_user_s": user, "cpu_sys_s": system, "cpu_scope": scope,
+            "peak_rss_kb": None, "output_bytes": out, "rss_scope": None, "alone": alone}
+
+
+def default_timeline(project_path: Path) -> Path:
+    return Path(project_path) / CACHE_DIR_NAME / TIMELINE_FILE
+
+
+class Timeline:
+    """Append-only per-check history (JSON lines, or CSV for a .csv path)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.is_csv = self.path.suffix.lower() == '.csv'
+
+    def rows(self) -> List[dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8', newline='') as f:
+                if self.is_csv:
+                    return [_from_csv(row) for row in csv.DictReader(f)]
+                return [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            return []
+
+    def append(self, run_id: str, orchestrator: str, results: List[dict]) -> List[dict]:
+        """Record every check that ran (cached ones without metrics); returns the new rows."""
+        stamp = datetime.now().isoformat(timespec='seconds')
+        rows = []
+        for r in results:
+            if r.get("skipped"):
+                continue
+            row = {"run_id": run_id, "timestamp": stamp, "orchestrator": orchestrator,
+                   "check": r["name"], "status": r.get("status"), "cached": bool(r.get("cached")),
+                   "mode": r.get("mode")}
+            for key in METRIC_KEYS:
+                row[key] = None if r.get("cached") else r.get(key)
+            rows.append(row)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            new_file = not self.path.exists()
+            fields = TIMELINE_FIELDS
+            if self.is_csv and not new_file:
+                # Keep appending in the file's own column order (older files lack newer columns)
+                with open(self.path, 'r', encoding='utf-8', newline='') as f:
+                    fields = next(csv.reader(f), None) or TIMELINE_FIELDS
+            with open(self.path, 'a', encoding='utf-8', newline='') as f:
+                if self.is_csv:
+                    writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+                    if new_file:
+                        writer.writeheader()
+                    writer.writerows(rows)
+                else:
+                    for row in rows:
+                        f.write(json.dumps(row) + "\n")
+        except OSError:
+            pass
+        return rows
+
+
+def _from_csv(row: dict) -> dict:
+    out = dict(row)
+    out["cached"] = row.get("cached") == "True"
+    out["alone"] = row.get("alone") == "True"
+    for key in NUMERIC_METRICS:
+        try:
+            out[key] = float(row[key]) if row.get(key) not in (None, '') else None
+        except ValueError:
+            out[key] = None
+    return out
+
+
+def regressions(history: List[dict], current: List[dict]) -> List[Tuple[str, float, float]]:
+    """
+    (check, baseline wall, current wall) for checks in current that are
+    REGRESSION_RATIO slower than the median of their last REGRESSION_WINDOW
+    executed (non-cached) runs in history. Only runs made alone count, on
+    either side: an overlapped run's wall time includes contention.
+    """
+    found = []
+    for row in current:
+        if row["cached"] or row["wall_s"] is None or not row.get("alone"):
+            continue
+        past = [h["wall_s"] for h in history
+                if h["check"] == row["check"] and h["orchestrator"] == row["orchestrator"]
+                and not h["cached"] and h.get("alone") and h.get("wall_s") is not None
+                and h["status"] in ("passed", "failed")]
+        past = past[-REGRESSION_WINDOW:]
+        if not past:
+            continue
+        baseline = statistics.median(past)
+        if row["wall_s"] >= baseline * REGRESSION_RATIO and row["wall_s"] - baseline >= REGRESSION_MIN_SECONDS:
+            found.append((row["check"], baseline, row["wall_s"]))
+    return found
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Check Report - machine-readable run reports and a SQLite trend store
+====================================================================
+
+run_document() turns an orchestrator run into one JSON-ready dict: the run's
+verdict and counts, then one entry per check with its status, duration,
+CPU, peak RSS and finding count. write_json() writes it as-is and
+write_junit() as JUnit XML (a <testsuite> per category, a <testcase> per
+check) for CI dashboards.
+
+TrendStore records every run in <project>/.agent-cache/trends.sqlite, so
+verification cost can be queried over time, and compare() lines a run up
+against an earlier one check by check: slower checks (by the same
+thresholds as check_metrics.regressions, and likewise only between runs
+made alone), verdict changes and finding count changes.
+"""
+
+import sys
+import json
+import sqlite3
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from check_metrics import REGRESSION_MIN_SECONDS, REGRESSION_RATIO
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared" / "audit"))
+from audit_pool import CACHE_DIR_NAME
+
+TREND_DB = "trends.sqlite"
+ERROR_CHARS = 2000
+
+# Report keys the checks use for "how many problems" (security_scan nests it in summary)
+FINDING_KEYS = ("issues_found", "issue_count", "critical_issues")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    orchestrator TEXT,
+    started TEXT,
+    duration REAL,
+    passed INTEGER,
+    total INTEGER,
+    failed INTEGER,
+    skipped INTEGER,
+    cached INTEGER
+);
+CREATE TABLE IF NOT EXISTS checks (
+    run_id TEXT REFERENCES runs(run_id),
+    name TEXT,
+    category TEXT,
+    status TEXT,
+    passed INTEGER,
+    cached INTEGER,
+    mode TEXT,
+    duration REAL,
+    cpu_s REAL,
+    peak_rss_kb INTEGER,
+    findings INTEGER,
+    alone INTEGER,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS checks_by_name ON checks(name, run_id);
+"""
+
+
+def finding_count(report: Optional[dict]) -> Optional[int]:
+    """Number of findings in a check's structured report, or None if it does not say."""
+    if not isinstance(report, dict):
+        return None
+    for key in FINDING_KEYS:
+        if isinstance(report.get(key), int):
+            return report[key]
+    summary = report.get("summary")
+    if isinstance(summary, dict) and isinstance(summary.get("total_findings"), int):
+        return summary["total_findings"]
+    return None
+
+
+def check_entry(result: dict) -> dict:
+    """One check of a run document."""
+    cpu = None
+    if result.get("cpu_user_s") is not None:
+        cpu = result["cpu_user_s"] + (result.get("cpu_sys_s") or 0)
+    return {
+        "name": result["name"],
+        "category": result.get("category", ""),
+        "status": result["status"],
+        "passed": bool(result["passed"]),
+        "skipped": bool(result.get("skipped")),
+        "cached": bool(result.get("cached")),
+        "mode": result.get("mode"),
+        "duration": result.get("duration", result.get("wall_s")),
+        "started": result.get("started"),
+        "cpu_s": cpu,
+        "cpu_scope": result.get("cpu_scope"),
+        "alone": bool(result.get("alone")),
+        "peak_rss_kb": result.get("peak_rss_kb"),
+        "rss_scope": result.get("rss_scope"),
+        "output_bytes": result.get("output_bytes"),
+        "findings": finding_count(result.get("report")),
+        "error": (result.get("error") or "")[-ERROR_CHARS:],
+        "log": result.get("log"),
+    }
+
+
+def run_document(run_id: str, orchestrator: str, started: datetime, duration: float,
+                 results: List[dict]) -> dict:
+    checks = [check_entry(r) for r in results]
+    ran = [c for c in checks if not c["skipped"]]
+    failed = sum(1 for c in ran if not c["passed"])
+    return {
+        "run_id": run_id,
+        "orchestrator": orchestrator,
+        "started": started.isoformat(timespec='seconds'),
+        "duration": duration,
+        "passed": failed == 0,
+        "summary": {
+            "total": len(checks),
+            "passed": len(ran) - failed,
+            "failed": failed,
+            "skipped": len(checks) - len(ran),
+            "cached": sum(1 for c in ran if c["cached"]),
+        },
+        "checks": checks,
+    }
+
+
+def write_json(path: Path, document: dict) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+
+
+def write_junit(path: Path, document: dict) -> None:
+    """JUnit XML: a <testsuite> per category, a <testcase> per check."""
+    root = ET.Element("testsuites", name=document["orchestrator"], time=f"{document['duration']:.3f}")
+    suites: Dict[str, ET.Element] = {}
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    for check in document["checks"]:
+        category = check["category"] or document["orchestrator"]
+        suite = suites.get(category)
+        if suite is None:
+            suite = suites[category] = ET.SubElement(root, "testsuite", name=category)
+            suite.attrib.update(tests="0", failures="0", errors="0", skipped="0", time="0.000")
+        case = ET.SubElement(suite, "testcase", classname=category, name=check["name"],
+                             time=f"{check['duration'] or 0:.3f}")
+        kind = None
+        if check["skipped"]:
+            kind = "skipped"
+            ET.SubElement(case, "skipped", message=check["status"])
+        elif check["status"] == "failed":
+            kind = "failures"
+            ET.SubElement(case, "failure", message=check["error"][:200]).text = check["error"]
+        elif check["status"] in ("timeout", "error"):
+            kind = "errors"
+            ET.SubElement(case, "error", message=check["status"]).text = check["error"]
+        if check["log"]:
+            ET.SubElement(case, "system-out").text = f"Full output: {check['log']}"
+        suite.set("tests", str(int(suite.get("tests")) + 1))
+        suite.set("time", f"{float(suite.get('time')) + (check['duration'] or 0):.3f}")
+        totals["tests"] += 1
+        if kind:
+            suite.set(kind, str(int(suite.get(kind)) + 1))
+            totals[kind] += 1
+    root.attrib.update({key: str(value) for key, value in totals.items()})
+    ET.indent(root)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(root).write(path, encoding='utf-8', xml_declaration=True)
+
+
+def default_trend_db(project_path: Path) -> Path:
+    return Path(project_path) / CACHE_DIR_NAME / TREND_DB
+
+
+class TrendStore:
+    """Every recorded run and its checks, in SQLite."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        # Stores created before checks.alone existed
+        columns = {row["name"] for row in self.db.execute("PRAGMA table_info(checks)")}
+        if "alone" not in columns:
+            self.db.execute("ALTER TABLE checks ADD COLUMN alone INTEGER")
+
+    def record(self, document: dict) -> None:
+        summary = document["summary"]
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (document["run_id"], document["orchestrator"], document["started"],
+                             document["duration"], int(document["passed"]), summary["total"],
+                             summary["failed"], summary["skipped"], summary["cached"]))
+            self.db.executemany("INSERT OR REPLACE INTO checks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                [(document["run_id"], c["name"], c["category"], c["status"], int(c["passed"]),
+                                  int(c["cached"]), c["mode"], c["duration"], c["cpu_s"], c["peak_rss_kb"],
+                                  c["findings"], int(c["alone"]))
+                                 for c in document["checks"] if not c["skipped"]])
+
+    def resolve(self, ref: str, orchestrator: str) -> Optional[str]:
+        """A recorded run id; "last" is the most recent run of orchestrator."""
+        if ref == "last":
+            row = self.db.execute("SELECT run_id FROM runs WHERE orchestrator = ? ORDER BY started DESC, "
+                                  "rowid DESC LIMIT 1", (orchestrator,)).fetchone()
+        else:
+            row = self.db.execute("SELECT run_id FROM runs WHERE run_id = ?", (ref,)).fetchone()
+        return row["run_id"] if row else None
+
+    def checks(self, run_id: str) -> Dict[str, dict]:
+        rows = self.db.execute("SELECT * FROM checks WHERE run_id = ?", (run_id,)).fetchall()
+        return {row["name"]: dict(row) for row in rows}
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def compare(baseline: Dict[str, dict], document: dict) -> List[dict]:
+    """
+    Per check present in both runs: durations, verdicts and finding counts,
+    with "regressed" set when it got REGRESSION_RATIO and
+    REGRESSION_MIN_SECONDS slower. Cached runs, and runs that overlapped
+    other checks, are never counted as regressed (or as faster): their
+    duration is not a measurement of the check alone.
+    """
+    rows = []
+    for check in document["checks"]:
+        before = baseline.get(check["name"])
+        if before is None or check["skipped"]:
+            continue
+        measured = (not check["cached"] and not before["cached"]
+                    and check["alone"] and bool(before.get("alone")))
+        old, new = before["duration"] or 0.0, check["duration"] or 0.0
+        rows.append({
+            "name": check["name"],
+            "before": old,
+            "after": new,
+            "measured": measured,
+            "regressed": measured and new >= old * REGRESSION_RATIO and new - old >= REGRESSION_MIN_SECONDS,
+            "status_before": before["status"],
+            "status_after": check["status"],
+            "findings_before": before["findings"],
+            "findings_after": check["findings"],
+        })
+    return rows
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Check Runner - call a check's run() in this process instead of spawning python
+==============================================================================
+
+Every validation script exposes
+
+    run(project_path: str, **opts) -> dict
+
+which returns the report its CLI prints as JSON, with "passed" set to what
+the CLI's exit status would have been. run() neither prints nor exits, so
+the orchestrators can call it from their worker threads: the script is
+imported once per process (its regexes, rule packs and shared audit modules
+with it), and the structured report comes back as-is instead of being
+squeezed through stdout.
+
+Scripts without run(), or whose imports fail in this interpreter, return
+None from run_in_process() and the caller falls back to a subprocess, which
+is also the mode to use when a check needs full isolation (killing it
+mid-run). in_process_result() runs run() on a daemon watchdog thread and
+stops waiting for it at the check's timeout, or as soon as it is cancelled:
+the check is then reported as timed out (or cancelled) and abandoned - a
+thread cannot be killed, but a hung check no longer blocks the run.
+In-process checks never start process pools (workers=1): forking this
+multi-threaded process can deadlock on a lock another check's thread holds,
+and an abandoned run() would keep its pool alive until exit. The
+orchestrators already run the checks themselves concurrently.
+
+run_child() runs a check that way: this file is the child's entry point
+(python check_runner.py SCRIPT ARGS...). It runs the script's own CLI, so
+its output can be streamed as it is printed, and sends every report the
+script's run() returns over the result channel (result_channel.py), so the
+orchestrator never parses human-readable output. CLIs that build their
+report without run() call emit_report() themselves. The child's
+stdout/stderr go to a log file, not memory.
+"""
+
+import os
+import sys
+import json
+import time
+import runpy
+import threading
+import subprocess
+import traceback
+import inspect
+import importlib.util
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from check_metrics import activity_started, activity_stopped, thread_cpu
+from check_report import finding_count
+from check_scheduler import Cancelled, run_command
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared" / "audit"))
+from audit_pool import CACHE_DIR_NAME
+from result_channel import RESULT_ENV, emit_report
+
+LOG_DIR = "logs"
+# How often the watchdog looks at the cancel event while run() is busy
+WATCHDOG_POLL_SECONDS = 0.05
+
+_entries: Dict[str, Optional[Callable]] = {}
+_lock = threading.Lock()
+
+
+def _import_entry(script_path: Path) -> Optional[Callable]:
+    name = script_path.stem
+    module = sys.modules.get(name)
+    if module is not None:
+        # Already imported (e.g. a frontend plugin the engine loaded) - reuse it if it is this script
+        same = Path(getattr(module, '__file__', '') or '').resolve() == script_path.resolve()
+        return getattr(module, 'run', None) if same else None
+
+    scripts_dir = str(script_path.parent)
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    spec = importlib.util.spec_from_file_location(name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered under its plain name so sibling imports (frontend_engine plugins) find this copy
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except (Exception, SystemExit):
+        del sys.modules[name]
+        return None
+    return getattr(module, 'run', None)
+
+
+def load_entry(script_path: Path) -> Optional[Callable]:
+    """The script's run(), imported once per process; None if it has none or cannot be imported."""
+    key = str(script_path.resolve())
+    with _lock:
+        if key not in _entries:
+            _entries[key] = _import_entry(script_path)
+        return _entries[key]
+
+
+def forget(script_path: Path) -> None:
+    """Drop the imported script so the next load_entry() imports its current source."""
+    with _lock:
+        _entries.pop(str(script_path.resolve()), None)
+        module = sys.modules.get(script_path.stem)
+        if module is not None and Path(getattr(module, '__file__', '') or '').resolve() == script_path.resolve():
+            del sys.modules[script_path.stem]
+
+
+def accepts_option(script_path: Path, option: str) -> bool:
+    """Whether the script's run() takes option as a named parameter (e.g. changed_files)."""
+    entry = load_entry(script_path)
+    if entry is None:
+        return False
+    try:
+        return option in inspect.signature(entry).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def run_in_process(script_path: Path, project_path: str, **opts) -> Optional[dict]:
+    """The check's report from run(project_path, **opts), or None when it must run as a subprocess."""
+    entry = load_entry(script_path)
+    if entry is None:
+        return None
+    return entry(project_path, **opts)
+
+
+def _watch(call: Callable[[], Optional[dict]], timeout: float, cancelled: threading.Event) -> dict:
+    """
+    call() on a daemon thread; {"report": ...} or {"exception": ..., "traceback": ...},
+    with "thread_cpu" (that thread's (user, sys) CPU seconds), once it returns. Raises subprocess.TimeoutExpired after timeout seconds and
+    Cancelled once cancelled is set, leaving the thread behind - still counted
+    as a check activity (check_metrics) until call() returns.
+    """
+    outcome = {}
+    done = threading.Event()
+    lock = threading.Lock()
+
+    def target():
+        before = thread_cpu()
+        try:
+            outcome["report"] = call()
+        except (Exception, SystemExit) as e:
+            outcome["exception"], outcome["traceback"] = e, traceback.format_exc()
+        finally:
+            after = thread_cpu()
+            outcome["thread_cpu"] = (after[0] - before[0], after[1] - before[1])
+            with lock:
+                done.set()
+                if outcome.get("abandoned"):
+                    activity_stopped()
+
+    def abandon():
+        with lock:
+            if not done.is_set():
+                outcome["abandoned"] = True
+                activity_started()
+
+    threading.Thread(target=target, name="check-watchdog", daemon=True).start()
+    deadline = time.monotonic() + timeout
+    while not done.wait(min(WATCHDOG_POLL_SECONDS, max(0.0, deadline - time.monotonic()))):
+        if cancelled.is_set():
+            abandon()
+            raise Cancelled()
+        if time.monotonic() >= deadline:
+            abandon()
+            raise subprocess.TimeoutExpired("run()", timeout)
+    return outcome
+
+
+def report_error(report: Optional[dict]) -> str:
+    """
+    Why a failed report failed: its own "error", else each failed entry of
+    its "checks" (lint_runner's per-linter results) with that entry's error
+    and log, else how many findings it reported.
+    """
+    if not isinstance(report, dict):
+        return ""
+    if report.get("error"):
+        return str(report["error"])
+    lines = []
+    for check in report.get("checks") or []:
+        if isinstance(check, dict) and not check.get("passed", True):
+            line = f"{check.get('name', 'check')}: {check.get('error') or 'failed'}"
+            if check.get("log"):
+                line += f" (log: {check['log']})"
+            lines.append(line)
+    if lines:
+        return "\n".join(lines)
+    count = finding_count(report)
+    return f"{count} issue(s) reported" if count else ""
+
+
+def in_process_result(script_path: Path, project_path: str, timeout: float,
+                      cancelled: Optional[threading.Event] = None, **opts) -> Optional[dict]:
+    """
+    run() as an orchestrator result - passed, status, error, the structured
+    report and thread_cpu (CPU used by the thread that ran it; see
+    check_metrics.in_process_metrics) - or None when the check has to run
+    as a subprocess instead.
+    Past timeout seconds it is a "timeout" result, and it raises Cancelled
+    when cancelled is set; either way run() is left to finish on its own.
+    Checks that take workers run serially, without a process pool.
+    """
+    if load_entry(script_path) is None:
+        return None
+    if accepts_option(script_path, "workers"):
+        opts.setdefault("workers", 1)
+    try:
+        outcome = _watch(lambda: run_in_process(script_path, project_path, **opts), timeout,
+                         cancelled or threading.Event())
+    except subprocess.TimeoutExpired:
+        return {"passed": False, "status": "timeout", "mode": "in-process",
+                "error": f"Timeout: run() still busy after {timeout:g}s (abandoned)"}
+    if "exception" in outcome:
+        e = outcome["exception"]
+        return {"passed": False, "status": "error", "error": f"{type(e).__name__}: {e}",
+                "traceback": outcome["traceback"], "mode": "in-process",
+                "thread_cpu": outcome["thread_cpu"]}
+    report = outcome["report"]
+    if report is None:
+        return None
+    passed = bool(report.get("passed"))
+    return {"passed": passed, "status": "passed" if passed else "failed",
+            "error": "" if passed else report_error(report),
+            "report": report, "mode": "in-process", "thread_cpu": outcome["thread_cpu"]}
+
+
+def default_log_dir(project_path: Path) -> Path:
+    return Path(project_path) / CACHE_DIR_NAME / LOG_DIR
+
+
+def log_path_for(log_dir: Path, name: str) -> Path:
+    """<log_dir>/<check-name>.log - the latest run of that check."""
+    slug = ''.join(c if c.isalnum() else '-' for c in name.lower()).strip('-')
+    return Path(log_dir) / f"{slug}.log"
+
+
+def child_command(script_path: Path, args: List[str]) -> List[str]:
+    return ["python", str(Path(__file__).resolve()), str(script_path), *args]
+
+
+def read_reports(channel: Path) -> List[dict]:
+    """The reports a child wrote to its result channel, in order."""
+    try:
+        with open(channel, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except (OSError, ValueError):
+        return []
+
+
+def run_child(script_path: Path, args: List[str], timeout: float, cancelled: threading.Event,
+              log_path: Path, on_line: Optional[Callable[[str, str], None]] = None):
+    """
+    run_command() for the script's CLI with output spilled to log_path and
+    streamed to on_line; the result also carries .report, the last report the
+    child sent over the result channel (None if it sent none).
+    """
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    channel = log_path.with_suffix(".result.jsonl")
+    env = dict(os.environ, PYTHONUNBUFFERED="1", **{RESULT_ENV: str(channel)})
+    try:
+        channel.unlink(missing_ok=True)
+        completed = run_command(child_command(script_path, args), timeout, cancelled, env=env,
+                                log_path=log_path, on_line=on_line)
+        reports = read_reports(channel)
+    finally:
+        channel.unlink(missing_ok=True)
+    completed.report = reports[-1] if reports else None
+    return completed
+
+
+def _child_main(argv: List[str]) -> None:
+    """Run SCRIPT's CLI with ARGS, sending each run() report to $AGENT_CHECK_RESULT."""
+    script_path = Path(argv[0]).resolve()
+    sys.argv = [str(script_path)] + argv[1:]
+    sys.path.insert(0, str(script_path.parent))
+    spec = importlib.util.spec_from_file_location(script_path.stem, script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[script_path.stem] = module
+    spec.loader.exec_module(module)
+
+    main, entry = getattr(module, 'main', None), getattr(module, 'run', None)
+    if main is None:
+        runpy.run_path(str(script_path), run_name="__main__")
+        return
+    if entry is not None:
+        def reporting(*args, **kwargs):
+            report = entry(*args, **kwargs)
+            emit_report(report)
+            return report
+        # main() looks run up as a module global, so it calls this wrapper
+        module.run = reporting
+    main()
+
+
+if __name__ == "__main__":
+    _child_main(sys.argv[1:])
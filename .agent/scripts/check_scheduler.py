@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Check Scheduler - run independent checks concurrently, report them in order
+===========================================================================
+
+The validation scripts do not consume each other's output, so the only edges
+in the check graph are the gates: a required check (Security Scan, Lint
+Check) guards every check listed after it. schedule() starts checks in list
+order (or in a caller-given priority order) on a thread pool sized to the
+machine's cores. A worker thread either waits on a child process or, in
+the default in-process mode, on a watchdog thread calling the check's run()
+(check_runner.in_process_result). Checks behind a gate may start before
+the gate has finished, but their results are only released once every gate
+ahead of them has passed. The moment a gate fails, the checks listed after
+it are cancelled through their cancel event - queued ones are dropped,
+child processes killed, in-process run() calls abandoned by their watchdog
+(a thread cannot be killed; it finishes in the background) - and schedule()
+returns without waiting for them. The report is exactly what a sequential,
+stop-on-failure run would have printed, and wall time is close to the
+slowest check instead of the sum of all of them.
+
+With one worker the checks simply run one after another in start order.
+"""
+
+import os
+import time
+import functools
+import collections
+import threading
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# wait4 polling interval: bounds how late a finished child is noticed
+WAIT_POLL_SECONDS = 0.02
+# Output kept in memory per stream once the full output is spilled to a log file
+TAIL_CHARS = 8192
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+class Cancelled(Exception):
+    """The check was abandoned because a gate ahead of it failed."""
+
+
+def _read(stream, key: str, into: dict, log, log_lock: threading.Lock,
+          on_line: Optional[Callable[[str, str], None]]) -> None:
+    """
+    Consume one of the child's pipes line by line: each line goes to the log
+    (when there is one) and to on_line as it arrives. With a log only the
+    last TAIL_CHARS stay in memory; without one everything is kept.
+    """
+    kept, kept_chars, total = collections.deque(), 0, 0
+    for line in stream:
+        total += len(line.encode('utf-8', 'replace'))
+        if log is not None:
+            with log_lock:
+                log.write(line)
+        if on_line is not None:
+            on_line(key, line.rstrip('\n'))
+        kept.append(line)
+        kept_chars += len(line)
+        while log is not None and kept_chars > TAIL_CHARS and len(kept) > 1:
+            kept_chars -= len(kept.popleft())
+    stream.close()
+    into[key] = ''.join(kept)
+    into[key + '_bytes'] = total
+
+
+def _wait(proc: subprocess.Popen, cmd: List[str], timeout: float, cancelled: threading.Event):
+    """Reap the child (its rusage via os.wait4 where available), killing it on cancel or timeout."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if hasattr(os, 'wait4'):
+            pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                proc.returncode = os.waitstatus_to_exitcode(status)
+                return rusage
+        elif proc.poll() is not None:
+            return None
+        if cancelled.is_set() or time.monotonic() >= deadline:
+            proc.kill()
+            if hasattr(os, 'wait4'):
+                os.wait4(proc.pid, 0)
+                proc.returncode = -9
+            else:
+                proc.wait()
+            if cancelled.is_set():
+                raise Cancelled()
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        cancelled.wait(WAIT_POLL_SECONDS)
+
+
+def run_command(cmd: List[str], timeout: float, cancelled: threading.Event, env: Optional[dict] = None,
+                log_path: Optional[Path] = None,
+                on_line: Optional[Callable[[str, str], None]] = None) -> subprocess.CompletedProcess:
+    """
+    subprocess.run(cmd, capture_output=True, text=True, timeout=timeout) that
+    also kills the child as soon as `cancelled` is set (raising Cancelled).
+
+    The child is reaped with os.wait4, so the result carries its own resource
+    usage as .rusage (CPU time, peak RSS); None where wait4 does not exist.
+
+    With log_path, stdout and stderr are written to that file as they arrive
+    and .stdout / .stderr only hold their last TAIL_CHARS; on_line(stream,
+    line) is called for every line either way. .output_bytes is the full size.
+    """
+    if cancelled.is_set():
+        raise Cancelled()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                            errors='replace', env=env)
+    log = open(log_path, 'w', encoding='utf-8') if log_path else None
+    log_lock = threading.Lock()
+    output = {}
+    readers = [threading.Thread(target=_read, args=(proc.stdout, 'stdout', output, log, log_lock, on_line),
+                                daemon=True),
+               threading.Thread(target=_read, args=(proc.stderr, 'stderr', output, log, log_lock, on_line),
+                                daemon=True)]
+    for reader in readers:
+        reader.start()
+    try:
+        rusage = _wait(proc, cmd, timeout, cancelled)
+    finally:
+        for reader in readers:
+            reader.join()
+        if log is not None:
+            log.close()
+    completed = subprocess.CompletedProcess(cmd, proc.returncode, output.get('stdout', ''), output.get('stderr', ''))
+    completed.rusage = rusage
+    completed.output_bytes = output.get('stdout_bytes', 0) + output.get('stderr_bytes', 0)
+    completed.log_path = log_path
+    return completed
+
+
+def gate_failed(required: bool, result: dict) -> bool:
+    return required and not result["passed"] and not result.get("skipped")
+
+
+def schedule(checks: Sequence[Tuple[object, bool]],
+             execute: Callable[[object, threading.Event], dict],
+             report: Callable[[object, dict], None],
+             workers: Optional[int] = None,
+             priority: Optional[Callable[[int], object]] = None) -> Tuple[List[dict], Optional[object]]:
+    """
+    Run execute(check, cancelled) for every (check, required) pair and call
+    report(check, result) in list order as results become final.
+
+    Checks are started in list order, or sorted by priority(index) when given.
+    execute must honour cancelled (run_command and in_process_result do):
+    the moment a required check fails, every check listed after it is
+    cancelled (queued ones never start, running ones stop) and schedule()
+    returns without waiting for them; checks listed before it keep running
+    and are still reported.
+
+    Returns (results reported, the failed gate or None). After a failed gate
+    nothing further is reported.
+    """
+    workers = max(1, workers or default_workers())
+    count = len(checks)
+    cancelled = [threading.Event() for _ in checks]
+    futures: Dict[int, Future] = {}
+    lock = threading.RLock()
+    first_failed_gate = [count]
+
+    def finished(index: int, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        if not gate_failed(checks[index][1], future.result()):
+            return
+        with lock:
+            if index >= first_failed_gate[0]:
+                return
+            first_failed_gate[0] = index
+            for later in range(index + 1, count):
+                cancelled[later].set()
+                futures[later].cancel()
+
+    order = sorted(range(count), key=priority) if priority else range(count)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    failed = None
+    try:
+        with lock:
+            for i in order:
+                futures[i] = pool.submit(execute, checks[i][0], cancelled[i])
+            for i in order:
+                futures[i].add_done_callback(functools.partial(finished, i))
+
+        results = []
+        for i, (check, required) in enumerate(checks):
+            result = futures[i].result()
+            report(check, result)
+            results.append(result)
+            if gate_failed(required, result):
+                failed = check
+                for later in range(i + 1, count):
+                    cancelled[later].set()
+                break
+    finally:
+        # After a failed gate the cancelled checks are not waited for
+        pool.shutdown(wait=failed is None, cancel_futures=failed is not None)
+    return results, failed
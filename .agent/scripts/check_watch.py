@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Check Watch - wait for files under a project to change, debounced
+=================================================================
+
+A watcher's changes() blocks until files change and returns their
+project-relative paths once the burst has settled - no further change for
+DEBOUNCE_SECONDS - so an editor's save (temp file, rename, chmod) or a
+branch switch is one batch, not dozens.
+
+On Linux the kernel's inotify is used directly (through ctypes, no extra
+package), with a watch on every directory and new directories picked up as
+they appear. Elsewhere, or when inotify cannot be set up (e.g. the watch
+limit is reached), the tree is polled for mtime/size changes every
+POLL_SECONDS.
+
+Directories the checks never read (check_cache.SKIP_DIRS: dependencies,
+VCS data, the tools' own caches) are not watched, and editor swap/backup
+files are ignored.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from typing import Dict, Iterable, Set, Tuple
+
+DEBOUNCE_SECONDS = 0.3
+POLL_SECONDS = 1.0
+
+# <sys/inotify.h>
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len - then len bytes of name
+
+
+def ignored_name(name: str) -> bool:
+    """Editor swap, backup and lock files, which are never check inputs."""
+    return (name.endswith(('~', '.swp', '.swx', '.tmp')) or name.startswith('.#') or name == '4913')
+
+
+class PollingWatcher:
+    """Compares (mtime, size) snapshots of the tree."""
+
+    kind = "polling"
+
+    def __init__(self, root: str, skip_dirs: Iterable[str]):
+        self.root = str(root)
+        self.skip_dirs = set(skip_dirs)
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for root, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in self.skip_dirs]
+            rel_root = os.path.relpath(root, self.root).replace(os.sep, '/')
+            for name in files:
+                if ignored_name(name):
+                    continue
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                snapshot[name if rel_root == '.' else f"{rel_root}/{name}"] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout) -> Set[str]:
+        """Paths changed after up to timeout seconds (one poll interval for None)."""
+        time.sleep(POLL_SECONDS if timeout is None else timeout)
+        current, previous = self._scan(), self._snapshot
+        self._snapshot = current
+        return {rel for rel in current.keys() | previous.keys() if current.get(rel) != previous.get(rel)}
+
+    def changes(self, debounce: float = DEBOUNCE_SECONDS) -> Set[str]:
+        return _debounced(self, max(debounce, POLL_SECONDS))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """One inotify watch per directory; raises OSError if inotify is unavailable."""
+
+    kind = "inotify"
+
+    def __init__(self, root: str, skip_dirs: Iterable[str]):
+        self.root = str(root)
+        self.skip_dirs = set(skip_dirs)
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+        try:
+            self._add_tree('')
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def _add_tree(self, rel: str) -> Set[str]:
+        """Watch rel and every directory under it; returns the files found there."""
+        files = set()
+        top = os.path.join(self.root, rel) if rel else self.root
+        for root, dirs, names in os.walk(top):
+            dirs[:] = [d for d in dirs if d not in self.skip_dirs]
+            rel_root = os.path.relpath(root, self.root).replace(os.sep, '/')
+            rel_root = '' if rel_root == '.' else rel_root
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(root), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOSPC, errno.ENOMEM):
+                    raise OSError(err, "inotify watch limit reached")
+                continue  # removed again before we got to it
+            self._dirs[wd] = rel_root
+            files.update(f"{rel_root}/{n}" if rel_root else n for n in names if not ignored_name(n))
+        return files
+
+    def wait(self, timeout) -> Set[str]:
+        """Paths changed within timeout seconds (None = until something changes)."""
+        changed = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return changed
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + _EVENT.size:offset + _EVENT.size + length].split(b'\0', 1)[0])
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: treat everything as changed
+                changed |= self._add_tree('')
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            rel_dir = self._dirs.get(wd)
+            if rel_dir is None or not name or ignored_name(name):
+                continue
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            if mask & IN_ISDIR:
+                if name not in self.skip_dirs and mask & (IN_CREATE | IN_MOVED_TO):
+                    changed |= self._add_tree(rel)
+                continue
+            changed.add(rel)
+        return changed
+
+    def changes(self, debounce: float = DEBOUNCE_SECONDS) -> Set[str]:
+        return _debounced(self, debounce)
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _debounced(watcher, debounce: float) -> Set[str]:
+    """Block until something changes, then until nothing has for debounce seconds."""
+    changed = set()
+    while not changed:
+        changed |= watcher.wait(None)
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def open_watcher(root: str, skip_dirs: Iterable[str]):
+    """An InotifyWatcher where the platform allows one, else a PollingWatcher."""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root, skip_dirs)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, skip_dirs)
@@ -6,9 +6,45 @@ Master Checklist Runner - Antigravity Kit
 Orchestrates all validation scripts in priority order.
 Use this for incremental validation during development.
 
+Independent checks run concurrently (one per core); output and the summary
+stay in priority order. Security Scan and Lint Check remain gates: if one
+fails, nothing after it is run or reported.
+
+Checks run in-process: each script's run() is imported once and called
+from a worker thread, returning a structured report. Either way a check is
+given CHECK_TIMEOUT_SECONDS: a subprocess is killed, an in-process run() is
+abandoned and reported as TIMEOUT. --subprocess (or a script without run())
+falls back to one python process per check. A
+subprocess check's full output goes to .agent-cache/logs/<check>.log and
+its report comes back over a JSON-lines result channel (check_runner.py);
+--stream also prints its lines live, prefixed with the check name.
+
+--changed-since <git-ref> limits the run to the diff: the changed files are
+listed once, checks none of whose inputs (check_cache.CHECK_INPUTS) changed
+are skipped, and checks whose run() takes changed_files scan only those.
+
+A check whose script, input files and tool versions are unchanged since the
+last run replays its stored result (see check_cache.py); --force re-runs
+everything. The summary lists which checks were cached and which executed.
+
+Each executed check's wall time, user/sys CPU, peak RSS and output size are
+appended to a timeline (check_metrics.py), and the summary flags checks
+that got slower than their recent runs.
+
+--watch keeps the process alive after the first run and re-runs just the
+checks whose inputs changed each time files are saved (inotify, or polling
+where that is unavailable; bursts of saves are debounced into one re-run).
+Imported checks, compiled rules and file hashes stay warm between runs; a
+check whose own script changed is re-imported.
+
 Usage:
     python scripts/checklist.py .                    # Run core checks
     python scripts/checklist.py . --url <URL>        # Include performance checks
+    python scripts/checklist.py . --workers 1        # One check at a time
+    python scripts/checklist.py . --force            # Ignore cached results
+    python scripts/checklist.py . --stream           # Live, prefixed check output
+    python scripts/checklist.py . --changed-since origin/main   # Only what the diff touches
+    python scripts/checklist.py . --watch            # Re-run affected checks on every save
 
 Priority Order:
     P0: Security Scan (vulnerabilities, secrets)
@@ -21,11 +57,21 @@ Priority Order:
 """
 
 import sys
+import time
+import threading
 import subprocess
 import argparse
 from pathlib import Path
 from typing import List, Tuple, Optional
 
+from check_cache import SKIP_DIRS, RunCache, affected, changed_since, split_cached
+from check_metrics import (Timeline, check_activity, default_timeline, in_process_metrics, metrics_start,
+                           new_run_id, regressions, subprocess_metrics)
+from check_runner import (accepts_option, default_log_dir, forget, in_process_result, log_path_for, report_error,
+                          run_child)
+from check_scheduler import Cancelled, schedule
+from check_watch import open_watcher
+
 # ANSI colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -54,6 +100,9 @@ def print_warning(text: str):
 def print_error(text: str):
     print(f"{Colors.RED}❌ {text}{Colors.ENDC}")
 
+# Per-check limit, in-process and subprocess alike
+CHECK_TIMEOUT_SECONDS = 300
+
 # Define priority-ordered checks
 CORE_CHECKS = [
     ("Security Scan", ".agent/skills/vulnerability-scanner/scripts/security_scan.py", True),
@@ -73,59 +122,167 @@ def check_script_exists(script_path: Path) -> bool:
     """Check if script file exists"""
     return script_path.exists() and script_path.is_file()
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               cancelled: Optional[threading.Event] = None, isolate: bool = False,
+               on_line=None, changed_files: Optional[List[str]] = None) -> dict:
     """
-    Run a validation script and capture results
+    Run a validation script and capture results (printing is left to
+    report_result, so concurrent checks still print in order). The script's
+    run() is called in this process unless isolate is set or it has none;
+    then it runs as a python subprocess whose output goes to a log file
+    (and to on_line(stream, line) as it is printed). changed_files is passed
+    on to run(), which may limit itself to those files.
     
     Returns:
-        dict with keys: name, passed, output, skipped
+        dict with keys: name, passed, output, skipped, status, mode, the
+        check_metrics figures (wall_s, cpu_*, peak_rss_kb, output_bytes, alone),
+        report - the structured result - and, for a subprocess, log (its
+        full output; output/error only keep the tail)
     """
     if not check_script_exists(script_path):
-        print_warning(f"{name}: Script not found, skipping")
-        return {"name": name, "passed": True, "output": "", "skipped": True}
+        return {"name": name, "passed": True, "output": "", "skipped": True, "status": "missing"}
     
-    print_step(f"Running: {name}")
+    if cancelled is not None and cancelled.is_set():
+        return {"name": name, "passed": False, "output": "", "error": "Cancelled", "skipped": True, "status": "cancelled"}
+    
+    start = time.monotonic()
+    metrics_at = metrics_start()
+    if not isolate:
+        try:
+            result = in_process_result(script_path, project_path, CHECK_TIMEOUT_SECONDS, cancelled,
+                                       url=url, changed_files=changed_files)
+        except Cancelled:
+            return {"name": name, "passed": False, "output": "", "error": "Cancelled", "skipped": True,
+                    "status": "cancelled"}
+        if result is not None:
+            result.update(name=name, output="", skipped=False)
+            result.update(in_process_metrics(metrics_at, time.monotonic() - start, result.get("report"),
+                                              result.pop("thread_cpu", None)))
+            return result
     
     # Build command
-    cmd = ["python", str(script_path), project_path]
+    args = [project_path]
     if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
-        cmd.append(url)
+        args.append(url)
+    log_path = log_path_for(default_log_dir(project_path), name)
     
     # Run script
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        result = run_child(script_path, args, timeout=CHECK_TIMEOUT_SECONDS,
+                           cancelled=cancelled or threading.Event(), log_path=log_path, on_line=on_line)
         
         passed = result.returncode == 0
         
-        if passed:
-            print_success(f"{name}: PASSED")
-        else:
-            print_error(f"{name}: FAILED")
-            if result.stderr:
-                print(f"  Error: {result.stderr[:200]}")
-        
         return {
             "name": name,
             "passed": passed,
             "output": result.stdout,
-            "error": result.stderr,
-            "skipped": False
+            "error": result.stderr or ("" if passed else report_error(result.report)),
+            "skipped": False,
+            "status": "passed" if passed else "failed",
+            "mode": "subprocess",
+            "report": result.report,
+            "log": str(log_path),
+            **subprocess_metrics(result, time.monotonic() - start, metrics_at)
         }
     
     except subprocess.TimeoutExpired:
-        print_error(f"{name}: TIMEOUT (>5 minutes)")
-        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False}
+        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False, "status": "timeout",
+                "log": str(log_path), "wall_s": time.monotonic() - start}
+    
+    except Cancelled:
+        return {"name": name, "passed": False, "output": "", "error": "Cancelled", "skipped": True, "status": "cancelled"}
     
     except Exception as e:
-        print_error(f"{name}: ERROR - {str(e)}")
-        return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False}
+        return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False, "status": "error"}
+
+def report_result(result: dict):
+    """Print one check's live output lines"""
+    name, status = result["name"], result["status"]
+    if status == "missing":
+        print_warning(f"{name}: Script not found, skipping")
+        return
+    if status == "cancelled":
+        return
+    if status == "unaffected":
+        print(f"{Colors.YELLOW}⏭️  {name}: no changed inputs, skipping{Colors.ENDC}")
+        return
+    
+    print_step(f"Running: {name}")
+    cached = " (cached)" if result.get("cached") else ""
+    if status == "passed":
+        print_success(f"{name}: PASSED{cached}")
+        # A passing report can still carry a caveat (e.g. security_scan: rules aborted, results incomplete)
+        warning = (result.get("report") or {}).get("warning")
+        if warning:
+            print_warning(f"{name}: {warning}")
+    elif status == "failed":
+        print_error(f"{name}: FAILED{cached}")
+        if result["error"]:
+            print(f"  Error: {result['error'][:200]}")
+        if result.get("log"):
+            print(f"  Log: {result['log']}")
+    elif status == "timeout":
+        print_error(f"{name}: TIMEOUT (>{CHECK_TIMEOUT_SECONDS}s)")
+        if result.get("log"):
+            print(f"  Log: {result['log']}")
+    else:
+        print_error(f"{name}: ERROR - {result['error']}")
+
+_stream_lock = threading.Lock()
 
-def print_summary(results: List[dict]):
+def stream_printer(name: str):
+    """on_line callback printing a check's output as it arrives, prefixed with its name"""
+    def on_line(stream: str, line: str):
+        color = Colors.YELLOW if stream == "stderr" else Colors.CYAN
+        with _stream_lock:
+            sys.stdout.write(f"{color}[{name}]{Colors.ENDC} {line}\n")
+            sys.stdout.flush()
+    return on_line
+
+def run_checks(checks: list, project_path: Path, url: Optional[str], workers: Optional[int],
+               isolate: bool = False, cache: Optional[RunCache] = None,
+               stream: bool = False, changed: Optional[List[str]] = None) -> Tuple[List[dict], Optional[str]]:
+    """
+    Run checks concurrently, report them in order. A required check that
+    fails stops everything after it; returns (results, failed gate name).
+    With a cache, checks whose inputs are unchanged replay their last result.
+    With stream, every check runs as a subprocess and its output is shown live.
+    With changed (project-relative paths), checks none of whose inputs
+    changed are skipped and in-process checks that can are limited to them.
+    """
+    @check_activity()
+    def execute(check, cancelled):
+        name, script_path, _ = check
+        script = project_path / script_path
+        exists = check_script_exists(script)
+        if changed is not None and exists and not affected(script, project_path, changed):
+            return {"name": name, "passed": True, "output": "", "skipped": True, "status": "unaffected"}
+        # A run over the changed files only is not the whole-project result the cache holds
+        filtered = (changed is not None and exists and not (isolate or stream)
+                    and accepts_option(script, "changed_files"))
+        run_cache = None if filtered else cache
+        key = run_cache.key(script) if run_cache and exists else None
+        result = run_cache.lookup(name, key) if run_cache else None
+        if result is None:
+            result = run_script(name, script, str(project_path), url, cancelled, isolate or stream,
+                                stream_printer(name) if stream else None, changed if filtered else None)
+            if filtered:
+                result["scope"] = "changed files"
+            if run_cache:
+                run_cache.store(name, key, result)
+        return result
+
+    results, failed_gate = schedule([(check, check[2]) for check in checks], execute,
+                                    lambda check, result: report_result(result), workers)
+    return results, failed_gate[0] if failed_gate else None
+
+def record_timeline(timeline: Timeline, run_id: str, results: List[dict]) -> list:
+    """Append this run to the timeline; returns (check, baseline, now) wall-time regressions."""
+    history = timeline.rows()
+    return regressions(history, timeline.append(run_id, "checklist", results))
+
+def print_summary(results: List[dict], regressed: list = ()):
     """Print final summary report"""
     print_header("📊 CHECKLIST SUMMARY")
     
@@ -148,10 +305,23 @@ def print_summary(results: List[dict]):
         else:
             status = f"{Colors.RED}❌{Colors.ENDC}"
         
-        print(f"{status} {r['name']}")
+        note = " (cached)" if r.get("cached") else f" ({r['scope']})" if r.get("scope") else ""
+        if r.get("status") == "unaffected":
+            note = " (no changed inputs)"
+        print(f"{status} {r['name']}{note}")
     
+    cached, executed = split_cached(results)
+    print()
+    print(f"♻️  Cached: {len(cached)}{' (' + ', '.join(cached) + ')' if cached else ''}")
+    print(f"▶️  Executed: {len(executed)}{' (' + ', '.join(executed) + ')' if executed else ''}")
     print()
     
+    if regressed:
+        print_warning("Slower than recent runs:")
+        for check, before, now in regressed:
+            print(f"  {check}: {now:.1f}s vs {before:.1f}s median (+{(now / before - 1) * 100:.0f}%)")
+        print()
+    
     if failed_count > 0:
         print_error(f"{failed_count} check(s) FAILED - Please fix before proceeding")
         return False
@@ -159,6 +329,61 @@ def print_summary(results: List[dict]):
         print_success("All checks PASSED ✨")
         return True
 
+def watch(project_path: Path, args, cache: RunCache, timeline: Timeline, results: List[dict]) -> bool:
+    """
+    Re-run the core checks whose inputs change until interrupted; checks that
+    never completed (behind a failed gate) run again on the next change.
+    Returns whether every check last passed.
+    """
+    latest = {r["name"]: r for r in results}
+    watcher = open_watcher(str(project_path), SKIP_DIRS)
+    print_header("👀 WATCHING")
+    print(f"Watching {project_path} ({watcher.kind}) - Ctrl+C to stop")
+    try:
+        while True:
+            changed = sorted(watcher.changes())
+            started = time.monotonic()
+            cache.refresh(changed)
+            if any(rel.startswith((".agent/.shared/", ".agent/scripts/")) for rel in changed):
+                print_warning("Shared check modules changed - restart --watch to load them")
+            checks = []
+            for check in CORE_CHECKS:
+                script = project_path / check[1]
+                if not check_script_exists(script):
+                    continue
+                last = latest.get(check[0])
+                if last is None or last["status"] not in ("passed", "failed") or affected(script, project_path, changed):
+                    skill_dir = script.parent.parent.relative_to(project_path).as_posix() + "/"
+                    if any(rel.startswith(skill_dir) for rel in changed):
+                        forget(script)
+                    checks.append(check)
+            shown = ", ".join(changed[:3]) + (f" (+{len(changed) - 3} more)" if len(changed) > 3 else "")
+            print(f"\n{Colors.BOLD}🔁 Changed: {shown}{Colors.ENDC}")
+            if not checks:
+                print("  No check reads these files")
+                continue
+            
+            rerun, failed_gate = run_checks(checks, project_path, None, args.workers, args.subprocess, cache,
+                                            args.stream)
+            cache.save()
+            record_timeline(timeline, new_run_id(), rerun)
+            for r in rerun:
+                latest[r["name"]] = r
+            
+            failing = [name for name, r in latest.items() if not r["passed"] and not r.get("skipped")]
+            elapsed = time.monotonic() - started
+            if failed_gate:
+                print_error(f"{failed_gate} failed - checks after it wait for the next change ({elapsed:.1f}s)")
+            elif failing:
+                print_error(f"Failing: {', '.join(failing)} ({elapsed:.1f}s)")
+            else:
+                print_success(f"All checks passing ({elapsed:.1f}s)")
+    except KeyboardInterrupt:
+        print()
+    finally:
+        watcher.close()
+    return all(r["passed"] or r.get("skipped") for r in latest.values())
+
 def main():
     parser = argparse.ArgumentParser(
         description="Run Antigravity Kit validation checklist",
@@ -172,6 +397,20 @@ Examples:
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", help="URL for performance checks (lighthouse, playwright)")
     parser.add_argument("--skip-performance", action="store_true", help="Skip performance checks even if URL provided")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Checks run at the same time (default: all cores, 1 = one after another)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run every check even if its inputs are unchanged since the last run")
+    parser.add_argument("--timeline", metavar="PATH",
+                        help="Per-check metrics history, JSON lines or .csv (default: .agent-cache/check-timeline.jsonl)")
+    parser.add_argument("--subprocess", action="store_true",
+                        help="Run every check in its own python process (isolation, hard timeouts, per-check CPU and memory)")
+    parser.add_argument("--changed-since", metavar="GIT_REF",
+                        help="Only run checks whose inputs changed since GIT_REF (scanning just the changed files where supported)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running: re-run the checks whose inputs change on every save")
+    parser.add_argument("--stream", action="store_true",
+                        help="Show each check's output live, prefixed with its name (implies --subprocess)")
     
     args = parser.parse_args()
     
@@ -185,31 +424,42 @@ Examples:
     print(f"Project: {project_path}")
     print(f"URL: {args.url if args.url else 'Not provided (performance checks skipped)'}")
     
-    results = []
+    changed = None
+    if args.changed_since:
+        try:
+            changed = changed_since(project_path, args.changed_since)
+        except ValueError as e:
+            print_error(f"Cannot list files changed since {args.changed_since}: {e}")
+            sys.exit(1)
+        print(f"Changed since {args.changed_since}: {len(changed)} file(s)")
     
-    # Run core checks
+    # Run core checks (independent checks concurrently; a failed required check stops the rest)
     print_header("📋 CORE CHECKS")
-    for name, script_path, required in CORE_CHECKS:
-        script = project_path / script_path
-        result = run_script(name, script, str(project_path))
-        results.append(result)
-        
-        # If required check fails, stop
-        if required and not result["passed"] and not result.get("skipped"):
-            print_error(f"CRITICAL: {name} failed. Stopping checklist.")
-            print_summary(results)
-            sys.exit(1)
+    cache = RunCache(project_path, force=args.force)
+    timeline = Timeline(args.timeline or default_timeline(project_path))
+    run_id = new_run_id()
+    results, failed_gate = run_checks(CORE_CHECKS, project_path, None, args.workers, args.subprocess, cache,
+                                      args.stream, changed)
+    cache.save()
+    if failed_gate:
+        print_error(f"CRITICAL: {failed_gate} failed. Stopping checklist.")
+        print_summary(results, record_timeline(timeline, run_id, results))
+        if args.watch:
+            sys.exit(0 if watch(project_path, args, cache, timeline, results) else 1)
+        sys.exit(1)
     
-    # Run performance checks if URL provided
+    # Run performance checks if URL provided (both run; the gate only matters for core checks)
     if args.url and not args.skip_performance:
         print_header("⚡ PERFORMANCE CHECKS")
-        for name, script_path, required in PERFORMANCE_CHECKS:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            results.append(result)
+        performance = [(name, script_path, False) for name, script_path, _ in PERFORMANCE_CHECKS]
+        results += run_checks(performance, project_path, args.url, args.workers, args.subprocess,
+                              stream=args.stream, changed=changed)[0]
     
     # Print summary
-    all_passed = print_summary(results)
+    all_passed = print_summary(results, record_timeline(timeline, run_id, results))
+    
+    if args.watch:
+        all_passed = watch(project_path, args, cache, timeline, results)
     
     sys.exit(0 if all_passed else 1)
 
@@ -6,8 +6,36 @@ Full Verification Suite - Antigravity Kit
 Runs COMPLETE validation including all checks + performance + E2E.
 Use this before deployment or major releases.
 
+Categories run concurrently (one check per core). Security, Code Quality,
+Data Layer and the long URL-bound checks (Lighthouse, Playwright) start
+first; output stays in category order. The report includes each check's
+duration and start offset, and the critical path that bounded wall time.
+
+Checks run in-process (each script's run() imported once, called from a
+worker thread, structured report back); --subprocess, or a script without
+run(), uses one python process per check instead. Either way a check gets
+CHECK_TIMEOUT_SECONDS: a child is killed, an in-process run() is abandoned
+and reported as TIMEOUT. Those children's output
+is spilled to .agent-cache/logs/<check>.log (only a tail is kept in memory),
+their reports come back over a JSON-lines result channel, and --stream
+prints their lines live, prefixed with the check name.
+
+Checks whose script, input files and tool versions are unchanged since the
+last run replay their stored result (check_cache.py); --force re-runs them.
+The report lists which checks were cached and which executed.
+
+Every executed check's wall time, user/sys CPU, peak RSS and output size go
+to a timeline that accumulates across runs (check_metrics.py); the report
+shows CPU/memory per check and flags checks slower than their recent runs.
+
+Every run is also recorded in a SQLite trend store (check_report.py) and
+can be written as JSON (--json-report) or JUnit XML (--junit);
+--compare <run-id> (or "last") lines this run up against an earlier one,
+check by check.
+
 Usage:
     python scripts/verify_all.py . --url <URL>
+    python scripts/verify_all.py . --url <URL> --junit out/verify.xml --compare last
 
 Includes ALL checks:
     ✅ Security Scan (OWASP, secrets, dependencies)
@@ -23,12 +51,21 @@ Includes ALL checks:
 """
 
 import sys
+import time
+import threading
 import subprocess
 import argparse
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from check_cache import RunCache, split_cached
+from check_metrics import (Timeline, check_activity, default_timeline, in_process_metrics, metrics_start,
+                           new_run_id, regressions, subprocess_metrics)
+from check_report import TrendStore, compare, default_trend_db, run_document, write_json, write_junit
+from check_runner import default_log_dir, in_process_result, log_path_for, report_error, run_child
+from check_scheduler import Cancelled, schedule
+
 # ANSI colors
 class Colors:
     HEADER = '\033[95m'
@@ -62,6 +99,7 @@ VERIFICATION_SUITE = [
     # P0: Security (CRITICAL)
     {
         "category": "Security",
+        "priority": True,
         "checks": [
             ("Security Scan", ".agent/skills/vulnerability-scanner/scripts/security_scan.py", True),
             ("Dependency Analysis", ".agent/skills/vulnerability-scanner/scripts/dependency_analyzer.py", False),
@@ -71,6 +109,7 @@ VERIFICATION_SUITE = [
     # P1: Code Quality (CRITICAL)
     {
         "category": "Code Quality",
+        "priority": True,
         "checks": [
             ("Lint Check", ".agent/skills/lint-and-validate/scripts/lint_runner.py", True),
             ("Type Coverage", ".agent/skills/lint-and-validate/scripts/type_coverage.py", False),
@@ -80,6 +119,7 @@ VERIFICATION_SUITE = [
     # P2: Data Layer
     {
         "category": "Data Layer",
+        "priority": True,
         "checks": [
             ("Schema Validation", ".agent/skills/database-design/scripts/schema_validator.py", False),
         ]
@@ -115,6 +155,7 @@ VERIFICATION_SUITE = [
     {
         "category": "Performance",
         "requires_url": True,
+        "priority": True,  # long-running, start early
         "checks": [
             ("Lighthouse Audit", ".agent/skills/performance-profiling/scripts/lighthouse_audit.py", True),
             ("Bundle Analysis", ".agent/skills/performance-profiling/scripts/bundle_analyzer.py", False),
@@ -125,6 +166,7 @@ VERIFICATION_SUITE = [
     {
         "category": "E2E Testing",
         "requires_url": True,
+        "priority": True,  # long-running, start early
         "checks": [
             ("Playwright E2E", ".agent/skills/webapp-testing/scripts/playwright_runner.py", False),
         ]
@@ -147,59 +189,147 @@ VERIFICATION_SUITE = [
     },
 ]
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
-    """Run validation script"""
+# Per-check limit, in-process and subprocess alike (slow checks such as Lighthouse included)
+CHECK_TIMEOUT_SECONDS = 600
+
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               cancelled: Optional[threading.Event] = None, run_start: Optional[float] = None,
+               isolate: bool = False, on_line=None) -> dict:
+    """
+    Run validation script (printing is left to report_result): its run() in
+    this process, or a python subprocess when isolate is set or it has none.
+    A subprocess's output is written to its log file (result["log"]) and
+    passed to on_line(stream, line) as it arrives; its report comes back
+    over the result channel.
+    """
     if not script_path.exists():
-        print_warning(f"{name}: Script not found, skipping")
-        return {"name": name, "passed": True, "skipped": True, "duration": 0}
+        return {"name": name, "passed": True, "skipped": True, "duration": 0, "status": "missing"}
     
-    print_step(f"Running: {name}")
-    start_time = datetime.now()
+    start = time.monotonic()
+    metrics_at = metrics_start()
+    offset = start - run_start if run_start is not None else 0.0
+    
+    if cancelled is not None and cancelled.is_set():
+        return {"name": name, "passed": False, "skipped": True, "duration": 0, "started": offset,
+                "error": "Cancelled", "status": "cancelled"}
+    
+    if not isolate:
+        try:
+            result = in_process_result(script_path, project_path, CHECK_TIMEOUT_SECONDS, cancelled, url=url)
+        except Cancelled:
+            return {"name": name, "passed": False, "skipped": True, "duration": time.monotonic() - start,
+                    "started": offset, "error": "Cancelled", "status": "cancelled"}
+        if result is not None:
+            duration = time.monotonic() - start
+            result.update(name=name, skipped=False, duration=duration, started=offset)
+            result.update(in_process_metrics(metrics_at, duration, result.get("report"),
+                                              result.pop("thread_cpu", None)))
+            return result
     
     # Build command
-    cmd = ["python", str(script_path), project_path]
+    args = [project_path]
     if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
-        cmd.append(url)
+        args.append(url)
+    log_path = log_path_for(default_log_dir(project_path), name)
     
     # Run
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minute timeout for slow checks
-        )
+        result = run_child(script_path, args, timeout=CHECK_TIMEOUT_SECONDS,
+                           cancelled=cancelled or threading.Event(), log_path=log_path, on_line=on_line)
         
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = time.monotonic() - start
         passed = result.returncode == 0
         
-        if passed:
-            print_success(f"{name}: PASSED ({duration:.1f}s)")
-        else:
-            print_error(f"{name}: FAILED ({duration:.1f}s)")
-            if result.stderr:
-                print(f"  {result.stderr[:300]}")
-        
         return {
             "name": name,
             "passed": passed,
             "output": result.stdout,
-            "error": result.stderr,
+            "error": result.stderr or ("" if passed else report_error(result.report)),
             "skipped": False,
-            "duration": duration
+            "duration": duration,
+            "started": offset,
+            "status": "passed" if passed else "failed",
+            "mode": "subprocess",
+            "report": result.report,
+            "log": str(log_path),
+            **subprocess_metrics(result, duration, metrics_at)
         }
     
     except subprocess.TimeoutExpired:
-        duration = (datetime.now() - start_time).total_seconds()
-        print_error(f"{name}: TIMEOUT (>{duration:.0f}s)")
-        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": "Timeout"}
+        duration = time.monotonic() - start
+        return {"name": name, "passed": False, "skipped": False, "duration": duration, "started": offset,
+                "error": "Timeout", "status": "timeout", "log": str(log_path), "wall_s": duration}
+    
+    except Cancelled:
+        duration = time.monotonic() - start
+        return {"name": name, "passed": False, "skipped": True, "duration": duration, "started": offset,
+                "error": "Cancelled", "status": "cancelled"}
     
     except Exception as e:
-        duration = (datetime.now() - start_time).total_seconds()
-        print_error(f"{name}: ERROR - {str(e)}")
-        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": str(e)}
+        duration = time.monotonic() - start
+        return {"name": name, "passed": False, "skipped": False, "duration": duration, "started": offset,
+                "error": str(e), "status": "error"}
+
+def report_result(result: dict):
+    """Print one check's live output lines"""
+    name, status, duration = result["name"], result["status"], result["duration"]
+    if status == "missing":
+        print_warning(f"{name}: Script not found, skipping")
+        return
+    if status == "cancelled":
+        return
+    
+    print_step(f"Running: {name}")
+    timing = "cached" if result.get("cached") else f"{duration:.1f}s"
+    if status == "passed":
+        print_success(f"{name}: PASSED ({timing})")
+        # A passing report can still carry a caveat (e.g. security_scan: rules aborted, results incomplete)
+        warning = (result.get("report") or {}).get("warning")
+        if warning:
+            print_warning(f"{name}: {warning}")
+    elif status == "failed":
+        print_error(f"{name}: FAILED ({timing})")
+        if result["error"]:
+            print(f"  {result['error'][:300]}")
+        if result.get("log"):
+            print(f"  Log: {result['log']}")
+    elif status == "timeout":
+        print_error(f"{name}: TIMEOUT (>{duration:.0f}s)")
+        if result.get("log"):
+            print(f"  Log: {result['log']}")
+    else:
+        print_error(f"{name}: ERROR - {result['error']}")
 
-def print_final_report(results: List[dict], start_time: datetime):
+_stream_lock = threading.Lock()
+
+def stream_printer(name: str):
+    """on_line callback printing a check's output as it arrives, prefixed with its name"""
+    def on_line(stream: str, line: str):
+        color = Colors.YELLOW if stream == "stderr" else Colors.CYAN
+        with _stream_lock:
+            sys.stdout.write(f"{color}[{name}]{Colors.ENDC} {line}\n")
+            sys.stdout.flush()
+    return on_line
+
+def critical_path(results: List[dict]) -> Optional[dict]:
+    """
+    The check that bounds wall time. Checks do not wait on each other, so
+    the critical path is the single longest check.
+    """
+    ran = [r for r in results if not r.get("skipped") and not r.get("cached")]
+    return max(ran, key=lambda r: r["duration"]) if ran else None
+
+def resource_str(r: dict) -> str:
+    """', cpu 2.9s, 85 MB' for a measured check ('' when not measured); 'run() cpu' is thread-only"""
+    parts = []
+    if r.get("cpu_user_s") is not None:
+        label = "run() cpu" if r.get("cpu_scope") == "thread" else "cpu"
+        parts.append(f"{label} {r['cpu_user_s'] + (r.get('cpu_sys_s') or 0):.1f}s")
+    if r.get("peak_rss_kb") is not None and r.get("rss_scope") == "check":
+        parts.append(f"{r['peak_rss_kb'] / 1024:.0f} MB")
+    return "".join(f", {p}" for p in parts)
+
+def print_final_report(results: List[dict], start_time: datetime, regressed: list = ()):
     """Print comprehensive final report"""
     total_duration = (datetime.now() - start_time).total_seconds()
     
@@ -212,10 +342,18 @@ def print_final_report(results: List[dict], start_time: datetime):
     skipped = sum(1 for r in results if r.get("skipped"))
     
     print(f"Total Duration: {total_duration:.1f}s")
+    slowest = critical_path(results)
+    if slowest:
+        serial = sum(r.get("duration", 0) for r in results if not r.get("skipped"))
+        print(f"Critical Path: {slowest['name']} ({slowest['duration']:.1f}s, "
+              f"started at +{slowest.get('started', 0):.1f}s) - serial time would be {serial:.1f}s")
     print(f"Total Checks: {total}")
     print(f"{Colors.GREEN}✅ Passed: {passed}{Colors.ENDC}")
     print(f"{Colors.RED}❌ Failed: {failed}{Colors.ENDC}")
     print(f"{Colors.YELLOW}⏭️  Skipped: {skipped}{Colors.ENDC}")
+    cached, executed = split_cached(results)
+    print(f"♻️  Cached: {len(cached)}{' (' + ', '.join(cached) + ')' if cached else ''}")
+    print(f"▶️  Executed: {len(executed)}{' (' + ', '.join(executed) + ')' if executed else ''}")
     print()
     
     # Category breakdown
@@ -235,11 +373,25 @@ def print_final_report(results: List[dict], start_time: datetime):
         else:
             status = f"{Colors.RED}❌{Colors.ENDC}"
         
-        duration_str = f"({r.get('duration', 0):.1f}s)" if not r.get("skipped") else ""
+        if r.get("skipped"):
+            duration_str = ""
+        elif r.get("cached"):
+            duration_str = "(cached)"
+        else:
+            duration_str = f"({r.get('duration', 0):.1f}s, +{r.get('started', 0):.1f}s{resource_str(r)})"
         print(f"  {status} {r['name']} {duration_str}")
     
+    if any(r.get("cpu_scope") == "thread" and not r.get("cached") for r in results):
+        print(f"  run() cpu: overlapped in-process checks, their own thread only (child processes not counted);"
+              f" --subprocess measures every check in full")
     print()
     
+    if regressed:
+        print(f"{Colors.BOLD}{Colors.YELLOW}⏱️  SLOWER THAN RECENT RUNS:{Colors.ENDC}")
+        for check, before, now in regressed:
+            print(f"  {check}: {now:.1f}s vs {before:.1f}s median (+{(now / before - 1) * 100:.0f}%)")
+        print()
+    
     # Failed checks detail
     if failed > 0:
         print(f"{Colors.BOLD}{Colors.RED}❌ FAILED CHECKS:{Colors.ENDC}")
@@ -249,6 +401,8 @@ def print_final_report(results: List[dict], start_time: datetime):
                 if r.get("error"):
                     error_preview = r["error"][:200]
                     print(f"  Error: {error_preview}")
+                if r.get("log"):
+                    print(f"  Log: {r['log']}")
         print()
     
     # Final verdict
@@ -260,6 +414,32 @@ def print_final_report(results: List[dict], start_time: datetime):
         print_success("✨ ALL CHECKS PASSED - Ready for deployment! ✨")
         return True
 
+def print_comparison(ref: str, rows: Optional[List[dict]]):
+    """Per-check comparison with an earlier run, regressions first"""
+    print(f"{Colors.BOLD}📈 COMPARED WITH RUN {ref}:{Colors.ENDC}")
+    if rows is None:
+        print_warning(f"Run {ref} not found in the trend store")
+        print()
+        return
+    for row in sorted(rows, key=lambda r: not r["regressed"]):
+        if row["measured"]:
+            delta = row["after"] - row["before"]
+            timing = f"{row['before']:.1f}s → {row['after']:.1f}s ({delta:+.1f}s)"
+        else:
+            timing = "cached"
+        verdict = row["status_after"]
+        if row["status_before"] != row["status_after"]:
+            verdict = f"{row['status_before']} → {row['status_after']}"
+        findings = ""
+        if row["findings_after"] is not None and row["findings_before"] != row["findings_after"]:
+            findings = f", findings {row['findings_before']} → {row['findings_after']}"
+        line = f"  {row['name']}: {timing}, {verdict}{findings}"
+        if row["regressed"]:
+            print(f"{Colors.YELLOW}{line}  ⏱️  slower{Colors.ENDC}")
+        else:
+            print(line)
+    print()
+
 def main():
     parser = argparse.ArgumentParser(
         description="Run complete Antigravity Kit verification suite",
@@ -273,7 +453,24 @@ Examples:
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", required=True, help="URL for performance & E2E checks")
     parser.add_argument("--no-e2e", action="store_true", help="Skip E2E tests")
-    parser.add_argument("--stop-on-fail", action="store_true", help="Stop on first failure")
+    parser.add_argument("--stop-on-fail", action="store_true",
+                        help="Stop on first critical failure, cancelling checks still running")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Checks run at the same time (default: all cores, 1 = one after another)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run every check even if its inputs are unchanged since the last run")
+    parser.add_argument("--timeline", metavar="PATH",
+                        help="Per-check metrics history, JSON lines or .csv (default: .agent-cache/check-timeline.jsonl)")
+    parser.add_argument("--subprocess", action="store_true",
+                        help="Run every check in its own python process (isolation, hard timeouts, per-check CPU and memory)")
+    parser.add_argument("--json-report", metavar="PATH", help="Write the run as a JSON report")
+    parser.add_argument("--junit", metavar="PATH", help="Write the run as JUnit XML")
+    parser.add_argument("--trend-db", metavar="PATH",
+                        help="SQLite store every run is recorded in (default: .agent-cache/trends.sqlite)")
+    parser.add_argument("--compare", metavar="RUN_ID",
+                        help='Compare each check with an earlier recorded run ("last" = the previous run)')
+    parser.add_argument("--stream", action="store_true",
+                        help="Show each check's output live, prefixed with its name (implies --subprocess)")
     
     args = parser.parse_args()
     
@@ -289,9 +486,10 @@ Examples:
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     start_time = datetime.now()
-    results = []
+    run_start = time.monotonic()
     
-    # Run all verification categories
+    # Select verification categories
+    checks = []
     for suite in VERIFICATION_SUITE:
         category = suite["category"]
         requires_url = suite.get("requires_url", False)
@@ -304,24 +502,71 @@ Examples:
         if args.no_e2e and category == "E2E Testing":
             continue
         
-        print_header(f"📋 {category.upper()}")
-        
         for name, script_path, required in suite["checks"]:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            result["category"] = category
-            results.append(result)
-            
-            # Stop on critical failure if flag set
-            if args.stop_on_fail and required and not result["passed"] and not result.get("skipped"):
-                print_error(f"CRITICAL: {name} failed. Stopping verification.")
-                print_final_report(results, start_time)
-                sys.exit(1)
+            checks.append((category, name, script_path, suite.get("priority", False),
+                           args.stop_on_fail and required))
+    
+    cache = RunCache(project_path, force=args.force)
+    
+    @check_activity()
+    def execute(check, cancelled):
+        category, name, script_path, _, _ = check
+        script = project_path / script_path
+        key = cache.key(script) if script.exists() else None
+        result = cache.lookup(name, key)
+        if result is not None:
+            result.update(duration=0.0, started=time.monotonic() - run_start)
+        else:
+            result = run_script(name, script, str(project_path), args.url, cancelled, run_start,
+                                args.subprocess or args.stream, stream_printer(name) if args.stream else None)
+            cache.store(name, key, result)
+        result["category"] = category
+        return result
+    
+    current_category = [None]
+    def report(check, result):
+        if check[0] != current_category[0]:
+            current_category[0] = check[0]
+            print_header(f"📋 {check[0].upper()}")
+        report_result(result)
+    
+    # All categories run concurrently; P0-P2 and the long URL-bound checks start first
+    results, failed_gate = schedule([(check, check[4]) for check in checks], execute, report,
+                                    args.workers, priority=lambda i: not checks[i][3])
+    cache.save()
+    run_id = new_run_id()
+    timeline = Timeline(args.timeline or default_timeline(project_path))
+    history = timeline.rows()
+    regressed = regressions(history, timeline.append(run_id, "verify_all", results))
+    
+    # Record the run; the baseline is looked up first so "last" is the previous run
+    document = run_document(run_id, "verify_all", start_time, time.monotonic() - run_start, results)
+    store = TrendStore(args.trend_db or default_trend_db(project_path))
+    comparison = None
+    if args.compare:
+        base_id = store.resolve(args.compare, "verify_all")
+        comparison = (base_id, compare(store.checks(base_id), document)) if base_id else (args.compare, None)
+    store.record(document)
+    store.close()
+    if args.json_report:
+        write_json(Path(args.json_report), document)
+    if args.junit:
+        write_junit(Path(args.junit), document)
+    
+    # Stop on critical failure if flag set
+    if failed_gate:
+        print_error(f"CRITICAL: {failed_gate[1]} failed. Stopping verification.")
     
     # Print final report
-    all_passed = print_final_report(results, start_time)
+    all_passed = print_final_report(results, start_time, regressed)
+    if comparison:
+        print_comparison(*comparison)
+    print(f"Run ID: {run_id}")
+    for path in (args.json_report, args.junit):
+        if path:
+            print(f"Report: {path}")
     
-    sys.exit(0 if all_passed else 1)
+    sys.exit(0 if all_passed and not failed_gate else 1)
 
 if __name__ == "__main__":
     main()
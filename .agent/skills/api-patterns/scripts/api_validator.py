@@ -2,12 +2,20 @@
 """
 API Validator - Checks API endpoints for best practices.
 Validates OpenAPI specs, response formats, and common issues.
+
+Every API file is checked (streamed across worker processes); with
+--budget-seconds the most recently changed files are checked first.
 """
 import sys
 import json
 import re
+import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "audit"))
+from discovery import find_files
+from file_stream import FileStream
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -15,24 +23,21 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
+API_FILE_PATTERNS = [
+    "**/*api*.ts", "**/*api*.js", "**/*api*.py",
+    "**/routes/*.ts", "**/routes/*.js", "**/routes/*.py",
+    "**/controllers/*.ts", "**/controllers/*.js",
+    "**/endpoints/*.ts", "**/endpoints/*.py",
+    "**/*.openapi.json", "**/*.openapi.yaml",
+    "**/swagger.json", "**/swagger.yaml",
+    "**/openapi.json", "**/openapi.yaml"
+]
+
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__'}
+
 def find_api_files(project_path: Path) -> list:
-    """Find API-related files."""
-    patterns = [
-        "**/*api*.ts", "**/*api*.js", "**/*api*.py",
-        "**/routes/*.ts", "**/routes/*.js", "**/routes/*.py",
-        "**/controllers/*.ts", "**/controllers/*.js",
-        "**/endpoints/*.ts", "**/endpoints/*.py",
-        "**/*.openapi.json", "**/*.openapi.yaml",
-        "**/swagger.json", "**/swagger.yaml",
-        "**/openapi.json", "**/openapi.yaml"
-    ]
-    
-    files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
-    
-    # Exclude node_modules, etc.
-    return [f for f in files if not any(x in str(f) for x in ['node_modules', '.git', 'dist', 'build', '__pycache__'])]
+    """Find API-related files (one walk for all patterns, skipped dirs never entered)."""
+    return find_files(project_path, API_FILE_PATTERNS, SKIP_DIRS)
 
 def check_openapi_spec(file_path: Path) -> dict:
     """Check OpenAPI/Swagger specification."""
@@ -159,9 +164,21 @@ def check_api_code(file_path: Path) -> dict:
     
     return {'file': str(file_path), 'passed': passed, 'issues': issues, 'type': 'code'}
 
+def check_api_file(file_path: Path) -> dict:
+    """Spec checks for OpenAPI/Swagger documents, code checks for everything else."""
+    if 'openapi' in file_path.name.lower() or 'swagger' in file_path.name.lower():
+        return check_openapi_spec(file_path)
+    return check_api_code(file_path)
+
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    project_path = Path(target)
+    parser = argparse.ArgumentParser(description="API endpoint best-practice checks")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--budget-seconds", type=float, default=None,
+                        help="Stop after this long, checking the most recently changed files first")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: all cores, 1 = in-process)")
+    args = parser.parse_args()
+    project_path = Path(args.project)
     
     print("\n" + "=" * 60)
     print("  API VALIDATOR - Endpoint Best Practices Check")
@@ -174,19 +191,13 @@ def main():
         print("   Looking for: routes/, controllers/, api/, openapi.json/yaml")
         sys.exit(0)
     
-    results = []
-    for file_path in api_files[:15]:  # Limit
-        if 'openapi' in file_path.name.lower() or 'swagger' in file_path.name.lower():
-            result = check_openapi_spec(file_path)
-        else:
-            result = check_api_code(file_path)
-        results.append(result)
+    stream = FileStream(api_files, args.budget_seconds, args.workers)
     
-    # Print results
+    # Print results as they stream in
     total_issues = 0
     total_passed = 0
     
-    for result in results:
+    for _, result in stream.map(check_api_file):
         print(f"\n[FILE] {result['file']} [{result['type']}]")
         for item in result['passed']:
             print(f"   {item}")
@@ -197,6 +208,8 @@ def main():
                 total_issues += 1
     
     print("\n" + "=" * 60)
+    if stream.budget_note():
+        print(f"[!] {stream.budget_note()}")
     print(f"[RESULTS] {total_passed} passed, {total_issues} critical issues")
     print("=" * 60)
     
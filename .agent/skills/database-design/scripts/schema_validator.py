@@ -19,6 +19,9 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "audit"))
+from discovery import find_files
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -26,19 +29,20 @@ except:
     pass
 
 
+SCHEMA_PATTERNS = ['**/prisma/schema.prisma', '**/drizzle/*.ts', '**/schema/*.ts']
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '.next'}
+
+
 def find_schema_files(project_path: Path) -> list:
-    """Find database schema files."""
-    schemas = []
-    
+    """Find database schema files (one walk; dependency and build dirs never entered)."""
+    found = find_files(project_path, SCHEMA_PATTERNS, SKIP_DIRS)
+
     # Prisma schema
-    prisma_files = list(project_path.glob('**/prisma/schema.prisma'))
-    schemas.extend([('prisma', f) for f in prisma_files])
+    schemas = [('prisma', f) for f in found if f.suffix == '.prisma']
     
     # Drizzle schema files
-    drizzle_files = list(project_path.glob('**/drizzle/*.ts'))
-    drizzle_files.extend(project_path.glob('**/schema/*.ts'))
-    for f in drizzle_files:
-        if 'schema' in f.name.lower() or 'table' in f.name.lower():
+    for f in found:
+        if f.suffix == '.ts' and ('schema' in f.name.lower() or 'table' in f.name.lower()):
             schemas.append(('drizzle', f))
     
     return schemas[:10]  # Limit
@@ -91,22 +95,13 @@ def validate_prisma_schema(file_path: Path) -> list:
     return issues
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    
-    print(f"\n{'='*60}")
-    print(f"[SCHEMA VALIDATOR] Database Schema Validation")
-    print(f"{'='*60}")
-    print(f"Project: {project_path}")
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("-"*60)
-    
-    # Find schema files
+def run(project_path: str, **opts) -> dict:
+    """Validate every schema under project_path; returns the JSON report (no printing)."""
+    project_path = Path(project_path).resolve()
     schemas = find_schema_files(project_path)
-    print(f"Found {len(schemas)} schema files")
     
     if not schemas:
-        output = {
+        return {
             "script": "schema_validator",
             "project": str(project_path),
             "schemas_checked": 0,
@@ -114,15 +109,11 @@ def main():
             "passed": True,
             "message": "No schema files found"
         }
-        print(json.dumps(output, indent=2))
-        sys.exit(0)
     
     # Validate each schema
     all_issues = []
     
     for schema_type, file_path in schemas:
-        print(f"\nValidating: {file_path.name} ({schema_type})")
-        
         if schema_type == 'prisma':
             issues = validate_prisma_schema(file_path)
         else:
@@ -135,6 +126,42 @@ def main():
                 "issues": issues
             })
     
+    total_issues = sum(len(item["issues"]) for item in all_issues)
+    
+    return {
+        "script": "schema_validator",
+        "project": str(project_path),
+        "schemas_checked": len(schemas),
+        "validated": [{"file": f.name, "type": t} for t, f in schemas],
+        "issues_found": total_issues,
+        # Schema issues are warnings, not failures
+        "passed": True,
+        "issues": all_issues
+    }
+
+
+def main():
+    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    
+    print(f"\n{'='*60}")
+    print(f"[SCHEMA VALIDATOR] Database Schema Validation")
+    print(f"{'='*60}")
+    print(f"Project: {project_path}")
+    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("-"*60)
+    
+    output = run(str(project_path))
+    print(f"Found {output['schemas_checked']} schema files")
+    
+    if not output["schemas_checked"]:
+        print(json.dumps(output, indent=2))
+        sys.exit(0)
+    
+    for item in output.pop("validated"):
+        print(f"\nValidating: {item['file']} ({item['type']})")
+    
+    all_issues = output["issues"]
+    
     # Summary
     print("\n" + "="*60)
     print("SCHEMA ISSUES")
@@ -150,19 +177,6 @@ def main():
     else:
         print("No schema issues found!")
     
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    # Schema issues are warnings, not failures
-    passed = True
-    
-    output = {
-        "script": "schema_validator",
-        "project": str(project_path),
-        "schemas_checked": len(schemas),
-        "issues_found": total_issues,
-        "passed": passed,
-        "issues": all_issues
-    }
-    
     print("\n" + json.dumps(output, indent=2))
     
     sys.exit(0)
@@ -12,14 +12,22 @@ Checks:
     - Color contrast hints
     - Keyboard navigation
     - Semantic HTML
+
+Files are read through the shared frontend engine, so a combined run
+(frontend_engine.py) audits them in the same pass as the other checkers.
 """
 
 import sys
 import json
 import re
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "audit"))
+from frontend_engine import SourceFile, add_run_arguments, register, run as run_engine
+from result_channel import emit_report
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -27,89 +35,145 @@ except:
     pass
 
 
-def find_html_files(project_path: Path) -> list:
-    """Find all HTML/JSX/TSX files."""
-    patterns = ['**/*.html', '**/*.jsx', '**/*.tsx']
-    skip_dirs = {'node_modules', '.next', 'dist', 'build', '.git'}
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            if not any(skip in f.parts for skip in skip_dirs):
-                files.append(f)
-    
-    return files[:50]
+BUTTON_RE = re.compile(r'<button[^>]*>[^<]*</button>', re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]+>')
+POSITIVE_TABINDEX_RE = re.compile(r'tabindex="([1-9]\d*)"', re.IGNORECASE)
 
 
-def check_accessibility(file_path: Path) -> list:
+def check_accessibility(src: SourceFile) -> list:
     """Check a single file for accessibility issues."""
     issues = []
-    
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-        
-        # Check for form inputs without labels
-        inputs = re.findall(r'<input[^>]*>', content, re.IGNORECASE)
-        for inp in inputs:
-            if 'type="hidden"' not in inp.lower():
-                if 'aria-label' not in inp.lower() and 'id=' not in inp.lower():
-                    issues.append("Input without label or aria-label")
-                    break
-        
-        # Check for buttons without accessible text
-        buttons = re.findall(r'<button[^>]*>[^<]*</button>', content, re.IGNORECASE)
-        for btn in buttons:
-            # Check if button has text content or aria-label
-            if 'aria-label' not in btn.lower():
-                text = re.sub(r'<[^>]+>', '', btn)
-                if not text.strip():
-                    issues.append("Button without accessible text")
-                    break
-        
-        # Check for missing lang attribute
-        if '<html' in content.lower() and 'lang=' not in content.lower():
-            issues.append("Missing lang attribute on <html>")
-        
-        # Check for missing skip link
-        if '<main' in content.lower() or '<body' in content.lower():
-            if 'skip' not in content.lower() and '#main' not in content.lower():
-                issues.append("Consider adding skip-to-main-content link")
-        
-        # Check for click handlers without keyboard support
-        onclick_count = content.lower().count('onclick=')
-        onkeydown_count = content.lower().count('onkeydown=') + content.lower().count('onkeyup=')
-        if onclick_count > 0 and onkeydown_count == 0:
-            issues.append("onClick without keyboard handler (onKeyDown)")
-        
-        # Check for tabIndex misuse
-        if 'tabindex=' in content.lower():
-            if 'tabindex="-1"' not in content.lower() and 'tabindex="0"' not in content.lower():
-                positive_tabindex = re.findall(r'tabindex="([1-9]\d*)"', content, re.IGNORECASE)
-                if positive_tabindex:
-                    issues.append("Avoid positive tabIndex values")
-        
-        # Check for autoplay media
-        if 'autoplay' in content.lower():
-            if 'muted' not in content.lower():
-                issues.append("Autoplay media should be muted")
-        
-        # Check for role usage
-        if 'role="button"' in content.lower():
-            # Divs with role button should have tabindex
-            div_buttons = re.findall(r'<div[^>]*role="button"[^>]*>', content, re.IGNORECASE)
-            for div in div_buttons:
-                if 'tabindex' not in div.lower():
-                    issues.append("role='button' without tabindex")
-                    break
-        
-    except Exception as e:
-        issues.append(f"Error reading file: {str(e)[:50]}")
-    
+    content = src.text
+    lower = src.folded
+
+    # Check for form inputs without labels
+    for inp in src.tags('input'):
+        attrs = inp.attrs.lower()
+        if 'type="hidden"' not in attrs:
+            if 'aria-label' not in attrs and 'id=' not in attrs:
+                issues.append("Input without label or aria-label")
+                break
+
+    # Check for buttons without accessible text
+    for btn in BUTTON_RE.findall(content):
+        # Check if button has text content or aria-label
+        if 'aria-label' not in btn.lower():
+            text = TAG_RE.sub('', btn)
+            if not text.strip():
+                issues.append("Button without accessible text")
+                break
+
+    # Check for missing lang attribute
+    if '<html' in lower and 'lang=' not in lower:
+        issues.append("Missing lang attribute on <html>")
+
+    # Check for missing skip link
+    if '<main' in lower or '<body' in lower:
+        if 'skip' not in lower and '#main' not in lower:
+            issues.append("Consider adding skip-to-main-content link")
+
+    # Check for click handlers without keyboard support
+    onclick_count = lower.count('onclick=')
+    onkeydown_count = lower.count('onkeydown=') + lower.count('onkeyup=')
+    if onclick_count > 0 and onkeydown_count == 0:
+        issues.append("onClick without keyboard handler (onKeyDown)")
+
+    # Check for tabIndex misuse
+    if 'tabindex=' in lower:
+        if 'tabindex="-1"' not in lower and 'tabindex="0"' not in lower:
+            if POSITIVE_TABINDEX_RE.search(content):
+                issues.append("Avoid positive tabIndex values")
+
+    # Check for autoplay media
+    if 'autoplay' in lower:
+        if 'muted' not in lower:
+            issues.append("Autoplay media should be muted")
+
+    # Check for role usage
+    if 'role="button"' in lower:
+        # Divs with role button should have tabindex
+        for div in src.tags('div'):
+            attrs = div.attrs.lower()
+            if 'role="button"' in attrs and 'tabindex' not in attrs:
+                issues.append("role='button' without tabindex")
+                break
+
     return issues
 
 
+@register('accessibility')
+class AccessibilityChecker:
+    """Engine plugin: per-file WCAG heuristics over HTML/JSX/TSX files."""
+    EXTENSIONS = {'.html', '.jsx', '.tsx'}
+    SKIP_DIRS = {'node_modules', '.next', 'dist', 'build', '.git'}
+
+    def __init__(self):
+        self.files_checked = 0
+        self.results = []
+
+    def wants(self, path: str) -> bool:
+        return True
+
+    def evaluate(self, src: SourceFile) -> dict:
+        return {"file": src.name, "issues": check_accessibility(src)}
+
+    def collect(self, result: dict) -> None:
+        self.files_checked += 1
+        if result["issues"]:
+            self.results.append(result)
+
+    def total_issues(self) -> int:
+        return sum(len(item["issues"]) for item in self.results)
+
+    def passed(self) -> bool:
+        # Accessibility issues are important but not blocking
+        return self.total_issues() < 5  # Allow minor issues
+
+    def report(self) -> dict:
+        return {
+            "script": "accessibility_checker",
+            "files_checked": self.files_checked,
+            "files_with_issues": len(self.results),
+            "issues_found": self.total_issues(),
+            "passed": self.passed()
+        }
+
+
+def json_report(project_path: str, checker: AccessibilityChecker, stats: dict) -> dict:
+    """The CLI's JSON output for a finished engine run."""
+    if not checker.files_checked and not stats["files_skipped"]:
+        return {
+            "script": "accessibility_checker",
+            "project": project_path,
+            "files_checked": 0,
+            "issues_found": 0,
+            "passed": True,
+            "message": "No HTML files found"
+        }
+    report = checker.report()
+    output = {"script": report["script"], "project": project_path}
+    output.update(report)
+    if stats["files_skipped"]:
+        output["files_skipped"] = stats["files_skipped"]
+    return output
+
+
+def run(project_path: str, budget_seconds: float = None, workers: int = None,
+        changed_files: list = None, **opts) -> dict:
+    """Audit project_path (only changed_files, relative paths, if given); returns the JSON report (no printing)."""
+    project_path = str(Path(project_path).resolve())
+    checker = AccessibilityChecker()
+    stats = run_engine(project_path, [checker], budget_seconds=budget_seconds, workers=workers,
+                       only_files=changed_files)
+    return json_report(project_path, checker, stats)
+
+
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    parser = argparse.ArgumentParser(description="WCAG accessibility audit for HTML/JSX/TSX files")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    add_run_arguments(parser)
+    args = parser.parse_args()
+    project_path = Path(args.project).resolve()
     
     print(f"\n{'='*60}")
     print(f"[ACCESSIBILITY CHECKER] WCAG Compliance Audit")
@@ -118,32 +182,19 @@ def main():
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
     
-    # Find HTML files
-    files = find_html_files(project_path)
-    print(f"Found {len(files)} HTML/JSX/TSX files")
+    checker = AccessibilityChecker()
+    stats = run_engine(str(project_path), [checker], budget_seconds=args.budget_seconds, workers=args.workers)
+    print(f"Found {checker.files_checked} HTML/JSX/TSX files")
+    if stats["budget_note"]:
+        print(f"[!] {stats['budget_note']}")
     
-    if not files:
-        output = {
-            "script": "accessibility_checker",
-            "project": str(project_path),
-            "files_checked": 0,
-            "issues_found": 0,
-            "passed": True,
-            "message": "No HTML files found"
-        }
+    if not checker.files_checked and not stats["files_skipped"]:
+        output = json_report(str(project_path), checker, stats)
+        emit_report(output)
         print(json.dumps(output, indent=2))
         sys.exit(0)
     
-    # Check each file
-    all_issues = []
-    
-    for f in files:
-        issues = check_accessibility(f)
-        if issues:
-            all_issues.append({
-                "file": str(f.name),
-                "issues": issues
-            })
+    all_issues = checker.results
     
     # Summary
     print("\n" + "="*60)
@@ -161,22 +212,12 @@ def main():
     else:
         print("No accessibility issues found!")
     
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    # Accessibility issues are important but not blocking
-    passed = total_issues < 5  # Allow minor issues
-    
-    output = {
-        "script": "accessibility_checker",
-        "project": str(project_path),
-        "files_checked": len(files),
-        "files_with_issues": len(all_issues),
-        "issues_found": total_issues,
-        "passed": passed
-    }
+    output = json_report(str(project_path), checker, stats)
+    emit_report(output)
     
     print("\n" + json.dumps(output, indent=2))
     
-    sys.exit(0 if passed else 1)
+    sys.exit(0 if output["passed"] else 1)
 
 
 if __name__ == "__main__":
@@ -87,168 +87,510 @@ Analyzes code for compliance with:
    - Form labels
 
 Total: 80+ checks across all design principles
+
+Each file is tokenized once (ParsedSource) into elements, class names and CSS
+declarations; structural rules query those facts instead of re-scanning text.
 """
 
 import sys
 import os
 import re
 import json
+import argparse
+from collections import Counter
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "audit"))
+from audit_pool import (CACHE_DIR_NAME, DEFAULT_CHUNK_SIZE, collect_files, evaluate_source,
+                        merge_results, open_cache, run_pool)
+from findings import DEFAULT_KEEP_PER_RULE, ERROR, WARNING, FindingCollector
+from frontend_engine import SourceFile, register
+from result_channel import emit_report
+
+
+# ============================================================================
+#  SOURCE PARSER
+# ============================================================================
+
+
+def _braced(depth: int) -> str:
+    """Regex for a balanced {...} expression nested up to `depth` levels."""
+    inner = r'[^{}]*'
+    for _ in range(depth):
+        inner = r'(?:[^{}]|\{' + inner + r'\})*'
+    return r'\{' + inner + r'\}'
+
+
+# Balanced {...} expression (JSX attribute values; inline handlers nest deeply)
+_BRACED = _braced(6)
+
+# Single tokenizer pass: JSX/HTML opening tags (attributes included, so
+# className/style values are parsed with their element) or CSS declarations.
+# camelCase style-object keys (fontSize: ...) count as declarations too.
+_TOKEN_RE = re.compile(r"""
+    <(?P<tag>[A-Za-z][\w.:-]*)
+     (?P<attrs>(?:[^<>{}"']|"[^"]*"|'[^']*'|""" + _BRACED + r""")*)
+     (?P<close>/?>)?
+  | @apply[ \t]+(?P<apply>[^;{}\n]+)
+  | (?<![\w$.-])(?P<prop>-{0,2}[a-zA-Z][\w-]*)[ \t]*:[ \t]*(?P<value>[^;{}\n]+)
+""", re.VERBOSE)
+
+# Inline style objects: a comma only continues the value (font stacks) when the
+# next segment is not itself a key
+_DECL_RE = re.compile(r'(?<![\w$.-])(-{0,2}[a-zA-Z][\w-]*)[ \t]*:[ \t]*([^;{}\n,]+(?:,(?![^,;{}\n]*:)[^;{}\n,]*)*)')
+_CLASS_ATTR_RE = re.compile(r'\bclass(?:Name)?\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|(' + _BRACED + r'))')
+_STYLE_ATTR_RE = re.compile(r'\bstyle\s*=\s*(?:"([^"]*)"|(' + _BRACED + r'))')
+_STRING_RE = re.compile(r'"([^"]*)"|\'([^\']*)\'|`([^`]*)`')
+_TEMPLATE_EXPR_RE = re.compile(r'\$\{[^{}]*\}')
+_CAMEL_RE = re.compile(r'(?<=[a-z0-9])([A-Z])')
+
+
+def _utility(token: str) -> str:
+    """Strip Tailwind variants (md:, hover:, dark:...) but keep [arbitrary:values]."""
+    head, bracket, tail = token.partition('[')
+    return head.rsplit(':', 1)[-1].lstrip('!') + bracket + tail
+
+
+def _class_tokens(attrs: str) -> list:
+    """Class names from className/class attributes, including string literals in {expressions}."""
+    tokens = []
+    for m in _CLASS_ATTR_RE.finditer(attrs):
+        if m.group(3) is None:
+            tokens.extend((m.group(1) or m.group(2) or '').split())
+            continue
+        tokens.extend(_literal_tokens(m.group(3)))
+    return tokens
+
+
+def _literal_tokens(expr: str) -> list:
+    """Whitespace-split string literals of a JS expression, ${...} parts included."""
+    tokens = []
+    for literal in _STRING_RE.findall(expr):
+        if literal[2]:
+            tokens.extend(_TEMPLATE_EXPR_RE.sub(' ', literal[2]).split())
+            for part in _TEMPLATE_EXPR_RE.findall(literal[2]):
+                tokens.extend(_literal_tokens(part[2:-1]))
+        else:
+            tokens.extend((literal[0] or literal[1]).split())
+    return tokens
+
+
+class Element:
+    """An opening JSX/HTML tag."""
+    __slots__ = ('name', 'tag', 'attrs', 'classes', 'start', 'end')
+
+    @property
+    def span(self) -> tuple:
+        return (self.start, self.end)
+
+    def __init__(self, name: str, attrs: str, classes: tuple, start: int, end: int):
+        self.name = name          # as written (NavLink, input, Select...)
+        self.tag = name.lower()
+        self.attrs = attrs
+        self.classes = classes
+        self.start = start
+        self.end = end
+
+
+class ParsedSource:
+    """
+    Facts extracted from one TSX/JSX/HTML/CSS file in a single tokenizer pass:
+    elements (with their class names), CSS declarations (stylesheets, inline
+    style objects and CSS-in-JS), and per-tag / per-utility counters.
+    """
+    __slots__ = ('text', 'elements', 'tags', 'utilities', 'declarations', '_by_prop', '_utility_spans')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.elements = []
+        self.declarations = []      # (prop, value, start, end), document order
+        self.tags = Counter()
+        self.utilities = Counter()
+        self._by_prop = {}
+        self._utility_spans = {}    # utility -> span of its first use
+
+        for m in _TOKEN_RE.finditer(text):
+            if m.group('tag'):
+                attrs = m.group('attrs')
+                classes = tuple(_class_tokens(attrs)) if 'class' in attrs else ()
+                el = Element(m.group('tag'), attrs, classes, m.start(), m.end())
+                self.elements.append(el)
+                self.tags[el.tag] += 1
+                self._add_utilities(classes, el.span)
+                if 'style' in attrs:
+                    self._parse_inline_styles(attrs, m.start('attrs'))
+            elif m.group('apply'):
+                self._add_utilities(m.group('apply').split(), m.span())
+            else:
+                self._add_declaration(m.group('prop'), m.group('value'), m.start(), m.end())
+
+    def _add_utilities(self, classes, span: tuple):
+        for c in classes:
+            u = _utility(c)
+            self.utilities[u] += 1
+            self._utility_spans.setdefault(u, span)
+
+    def _parse_inline_styles(self, attrs: str, base: int):
+        for sm in _STYLE_ATTR_RE.finditer(attrs):
+            body = sm.group(1) if sm.group(1) is not None else sm.group(2)[1:-1]
+            body_start = base + sm.start(1 if sm.group(1) is not None else 2)
+            for dm in _DECL_RE.finditer(body):
+                self._add_declaration(dm.group(1), dm.group(2), body_start + dm.start(), body_start + dm.end())
+
+    def _add_declaration(self, prop: str, value: str, start: int, end: int):
+        prop = _CAMEL_RE.sub(r'-\1', prop).lower()
+        value = value.strip().rstrip(',').strip('\'"`')
+        self.declarations.append((prop, value, start, end))
+        self._by_prop.setdefault(prop, []).append(value)
+
+    # --- queries -----------------------------------------------------------
+
+    def count(self, *tags: str) -> int:
+        """Number of elements with any of these (case-insensitive) tag names."""
+        return sum(self.tags[t] for t in tags)
+
+    def find(self, *tags: str) -> list:
+        return [el for el in self.elements if el.tag in tags]
+
+    def values(self, *props: str) -> list:
+        """Values of CSS declarations for these properties, in document order."""
+        if len(props) == 1:
+            return self._by_prop.get(props[0], [])
+        return [v for p, v, _, _ in self.declarations if p in props]
+
+    def decls(self, *props: str) -> list:
+        """(value, span) of CSS declarations for these properties, in document order."""
+        return [(v, (start, end)) for p, v, start, end in self.declarations if p in props]
+
+    def has_decl(self, *props: str) -> bool:
+        return any(p in self._by_prop for p in props)
+
+    def count_decls(self, predicate) -> int:
+        return sum(1 for p, _, _, _ in self.declarations if predicate(p))
+
+    def has_utility(self, pattern) -> bool:
+        """pattern: compiled regex matched against variant-stripped class names."""
+        return any(pattern.match(u) for u in self.utilities)
+
+    def first_use(self, utility: str):
+        """Span of the first element using this (variant-stripped) utility, or None."""
+        return self._utility_spans.get(utility)
+
+    def utility_span(self, pattern):
+        """Span of the first element using a class matching pattern, or None."""
+        spans = [sp for u, sp in self._utility_spans.items() if pattern.match(u)]
+        return min(spans) if spans else None
+
+    def count_utilities(self, pattern) -> int:
+        return sum(n for u, n in self.utilities.items() if pattern.match(u))
+
+    def has_variant(self, *variants: str) -> bool:
+        """Any raw class using one of these variants (e.g. 'hover:')."""
+        return any(v in c for el in self.elements for c in el.classes for v in variants)
+
+    def text_after(self, el: Element) -> str:
+        """Text content directly after an opening tag, up to the next tag."""
+        nxt = self.text.find('<', el.end)
+        return self.text[el.end:nxt if nxt != -1 else len(self.text)]
+
+
+# Tailwind utility patterns (matched against variant-stripped class names)
+SMALL_HEIGHT_UTILITY = re.compile(r'h-(?:[1-9]|10)(?:\.5)?$')
+BG_UTILITY = re.compile(r'bg-')
+BG_IMAGE_UTILITY = re.compile(r'bg-\[url')
+TRANSLUCENT_BG_UTILITY = re.compile(r'bg-opacity|bg-[a-z0-9-]+/\d+')
+ANIMATE_UTILITY = re.compile(r'animate-')
+BORDER_UTILITY = re.compile(r'border')
+PROSE_WIDTH_UTILITY = re.compile(r'max-w-(?:prose|\[\d+ch\])')
+LEADING_UTILITY = re.compile(r'leading-')
+LEADING_VALUE = re.compile(r'leading-([\d.]+)$')
+TRACKING_UTILITY = re.compile(r'tracking-')
+HEADING_SIZE_UTILITY = re.compile(r'text-(?:xl|2xl|3xl|4xl|5xl|6xl)$')
+DISPLAY_SIZE_UTILITY = re.compile(r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)$')
+TEXT_SIZE_UTILITY = re.compile(r'text-(?:xs|sm|base|lg|xl|2xl)$')
+TEXT_COLOR_UTILITY = re.compile(r'text-(?!(?:xs|sm|base|lg|\d?xl|left|right|center|justify)$)')
+FONT_WEIGHT_UTILITY = re.compile(r'font-(thin|extralight|light|normal|medium|semibold|bold|extrabold|black)$|fw-(\d+)$')
+LIGHT_BG_UTILITY = re.compile(r'bg-(?:gray|slate|zinc)-50$')
+LIGHT_TEXT_UTILITY = re.compile(r'text-(?:gray|slate)-[12]00$')
+DARK_BG_UTILITY = re.compile(r'bg-(?:gray|slate|zinc)-9\d0$')
+DARK_TEXT_UTILITY = re.compile(r'text-(?:gray|slate)-[89]00$')
+BLUE_UTILITY = re.compile(r'(?:bg|text|from)-blue')
+
+# CSS value / attribute patterns
+LAYOUT_PROPERTY = re.compile(r'(?:width|height|top|left|right|bottom|margin|padding)(?:-|$)')
+NUMBER = re.compile(r'[\d.]+')
+FONT_SIZE_VALUE = re.compile(r'(\d+(?:\.\d+)?)(px|rem|em)')
+DURATION_VALUE = re.compile(r'([\d.]+)(s|ms)')
+RADIO_TYPE = re.compile(r'type\s*=\s*["\']radio', re.IGNORECASE)
+SMALL_PX_VALUE = re.compile(r'[0-3]\dpx')
+LARGE_PX_VALUE = re.compile(r'[3-9]\dpx')
+CH_VALUE = re.compile(r'\d+ch')
+Y_OFFSET_VALUE = re.compile(r'\d+px\s+[1-9]\d*px')
+GLOW_VALUE = re.compile(r'0\s+0\s+')
+
+PURPLE_TERMS = ['#8B5CF6', '#A855F7', '#9333EA', '#7C3AED', '#6D28D9',
+                '#A78BFA', '#C4B5FD', '#DDD6FE', '#EDE9FE',
+                'purple', 'violet', 'fuchsia', 'magenta', 'lavender']
+
+# Every colour literal in one pass over the case-folded text
+_COLOR_TOKEN_RE = re.compile(r'#([0-9a-f]{3,6})|rgb|hsl(\((?:(\d+),\s*\d+%,\s*\d+%\))?)?')
+_BLUE_HEX_RE = re.compile(r'00[0-9a-f]{2}|1[0-9a-f]{2}')
+
+
+class ColorTokens:
+    """Colour literals of a case-folded file: hex digits, hsl() count and hues, total."""
+    __slots__ = ('hexes', 'hsl', 'hues', 'total', 'has_blue_hex')
+
+    def __init__(self, folded: str):
+        self.hexes = []
+        self.hsl = 0
+        self.hues = []
+        self.total = 0
+        for m in _COLOR_TOKEN_RE.finditer(folded):
+            self.total += 1
+            if m.group(1):
+                self.hexes.append(m.group(1))
+            elif m.group(2):
+                self.hsl += 1
+                if m.group(3):
+                    self.hues.append(int(m.group(3)))
+        self.has_blue_hex = any(_BLUE_HEX_RE.search(h) for h in self.hexes)
+
+
+
+@register('ux')
 class UXAuditor:
-    def __init__(self):
-        self.issues = []
-        self.warnings = []
+    # Keyword heuristics, compiled once at class load. FOLDED patterns were
+    # case-insensitive and run on the case-folded text; RAW ones on the source.
+    FOLDED = {name: re.compile(pattern) for name, pattern in {
+        'form_keywords': r'password|credit|card|payment',
+        'multi_step': r'step|wizard|stage',
+        'primary_cta': r'primary|bg-primary|button.*primary|variant=["\']primary',
+        'hero': r'hero|<h1|banner',
+        'feedback': r'transition|animate|hover:|focus:|disabled|loading|spinner',
+        'reflective': r'about|story|mission|values|why we|our journey|testimonials',
+        'security': r'ssl|secure|encrypt|lock|padlock|https',
+        'checkout': r'checkout|payment',
+        'social_proof': r'review|testimonial|rating|star|trust|trusted by|customer|logo',
+        'authority': r'certif|award|media|press|featured|as seen in',
+        'progressive': r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more',
+        'price': r'price|pricing|cost|\$\d+',
+        'anchor': r'original|was|strike|del|save \d+%',
+        'community': r'join|subscriber|member|user',
+        'progress': r'progress|step \d+|complete|%|bar',
+        'font_face': r'@font-face\s*\{[^}]*family:\s*["\']?([^;"\'\s}]+)',
+        'google_fonts': r'fonts\.googleapis\.com[^"\']*family=([^"&]+)',
+        'food': r'restaurant|food|cooking|recipe|menu|dish|meal',
+    }.items()}
+
+    RAW = {name: re.compile(pattern) for name, pattern in {
+        'gradient': r'gradient',
+        'state_change': r'setState|useState|disabled|loading',
+        'defaults': r'checked|selected|default|value=["\'].*["\']',
+        'count': r'\d+[+kmb]|\d+,\d+',
+        'fluid': r'clamp\(|responsive:',
+        'alpha': r'rgba?\([^)]+,\s*([\d.]+)\)',
+        'overlay': r'overlay|rgba\(0|gradient.*transparent|::after|::before',
+        'blur': r'backdrop-filter|blur\(',
+        'pure_black': r'color:\s*#000000|#000\b',
+        'pure_white': r'background:\s*#ffffff|#fff\b',
+        'color_vars': r'--color-|color-|primary-|secondary-',
+        'ease_in_entry': r'ease-in\s+.*entry|fade-in.*ease-in',
+        'ease_out_exit': r'ease-out\s+.*exit|fade-out.*ease-out',
+        'async': r'async|await|fetch|axios|loading|isLoading',
+        'loading': r'skeleton|spinner|progress|loading|<circle.*animate',
+        'routing': r'router|navigate|Link.*to|useHistory',
+        'page_transition': r'AnimatePresence|motion\.|transition.*page|fade.*route',
+        'scroll_anim': r'onScroll|scroll.*trigger|IntersectionObserver',
+        'scroll_layout': r'onScroll.*[^\w](width|height|top|left)',
+        'lottie_fallback': r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop',
+        'gsap': r'gsap|ScrollTrigger|from\(.*gsap',
+        'gsap_cleanup': r'kill\(|revert\(|useEffect.*return.*gsap',
+        'transform_3d': r'transform3d|perspective\(|rotate3d|translate3d',
+        'perspective': r'perspective:\s*\d+px|perspective\s*\(',
+        'particles': r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js',
+        'scroll_driven': r'IntersectionObserver.*animate|scroll.*progress|view-timeline',
+        'throttle': r'throttle|debounce|requestAnimationFrame',
+        'functional': r'hover:|focus:|disabled|loading|error|success',
+    }.items()}
+
+    # Purple ban: one alternation instead of a lowercase() + scan per term
+    PURPLE_RE = re.compile('|'.join(re.escape(t.lower()) for t in PURPLE_TERMS))
+
+    def __init__(self, keep_per_rule: int = DEFAULT_KEEP_PER_RULE, findings_stream=None):
+        self.findings = FindingCollector('ux', keep_per_rule, findings_stream)
+        self.issues = self.findings.channel(ERROR)
+        self.warnings = self.findings.channel(WARNING)
         self.passed_count = 0
         self.files_checked = 0
     
     def audit_file(self, filepath: str) -> None:
-        try:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-        except: return
-        
+        self.findings.begin_file(filepath)
+        source = SourceFile.read(filepath)
+        if source is not None:
+            self.check(source)
+
+    def check(self, source: SourceFile) -> None:
+        """Audit one file already read by the caller (or the frontend engine)."""
+        content = source.text
+        self.findings.begin_file(source.path, content)
         self.files_checked += 1
-        filename = os.path.basename(filepath)
+        filename = source.name
+
+        # Parse once; element, class and CSS rules below read these facts.
+        # Keyword heuristics run on one case-folded copy of the file.
+        src = source.memo('ux', lambda s: ParsedSource(s.text))
+        folded = source.folded
+        colors = ColorTokens(folded)
+        text_divs = [el for el in src.find('div', 'span') if any('text' in c for c in el.classes)]
 
         # Pre-calculate common flags
-        has_long_text = bool(re.search(r'<p|<div.*class=.*text|article|<span.*text', content, re.IGNORECASE))
-        has_form = bool(re.search(r'<form|<input|password|credit|card|payment', content, re.IGNORECASE))
-        complex_elements = len(re.findall(r'<input|<select|<textarea|<option', content, re.IGNORECASE))
+        has_long_text = bool(src.count('p', 'article') or text_divs)
+        has_form = bool(src.count('form', 'input') or self.FOLDED['form_keywords'].search(folded))
+        complex_elements = src.count('input', 'select', 'textarea', 'option')
 
         # --- 1. PSYCHOLOGY LAWS ---
         # Hick's Law
-        nav_items = len(re.findall(r'<NavLink|<Link|<a\s+href|nav-item', content, re.IGNORECASE))
+        nav_links = [el for el in src.elements
+                     if el.tag in ('navlink', 'link') or (el.tag == 'a' and 'href' in el.attrs)]
+        nav_items = len(nav_links) + src.utilities['nav-item']
         if nav_items > 7:
-            self.issues.append(f"[Hick's Law] {filename}: {nav_items} nav items (Max 7)")
+            self.issues.append(f"[Hick's Law] {filename}: {nav_items} nav items (Max 7)", rule="hicks-law/nav-items")
         
         # Fitts' Law
-        if re.search(r'height:\s*([0-3]\d)px', content) or re.search(r'h-[1-9]\b|h-10\b', content):
-            self.warnings.append(f"[Fitts' Law] {filename}: Small targets (< 44px)")
+        small_targets = [sp for v, sp in src.decls('height') if SMALL_PX_VALUE.match(v)]
+        small_targets.append(src.utility_span(SMALL_HEIGHT_UTILITY))
+        small_targets = [sp for sp in small_targets if sp]
+        if small_targets:
+            self.warnings.append(f"[Fitts' Law] {filename}: Small targets (< 44px)", span=min(small_targets), rule="fitts-law/small-targets")
         
         # Miller's Law
-        form_fields = len(re.findall(r'<input|<select|<textarea', content, re.IGNORECASE))
-        if form_fields > 7 and not re.search(r'step|wizard|stage', content, re.IGNORECASE):
-            self.warnings.append(f"[Miller's Law] {filename}: Complex form ({form_fields} fields)")
+        form_fields = src.count('input', 'select', 'textarea')
+        if form_fields > 7 and not self.FOLDED['multi_step'].search(folded):
+            self.warnings.append(f"[Miller's Law] {filename}: Complex form ({form_fields} fields)", rule="millers-law/form-fields")
             
         # Von Restorff
-        if 'button' in content.lower() and not re.search(r'primary|bg-primary|Button.*primary|variant=["\']primary', content, re.IGNORECASE):
-            self.warnings.append(f"[Von Restorff] {filename}: No primary CTA")
+        if 'button' in folded and not self.FOLDED['primary_cta'].search(folded):
+            self.warnings.append(f"[Von Restorff] {filename}: No primary CTA", rule="von-restorff/primary-cta")
 
         # Serial Position Effect - Important items at beginning/end
         if nav_items > 3:
             # Check if last nav item is important (contact, login, etc.)
-            nav_content = re.findall(r'<NavLink|<Link|<a\s+href[^>]*>([^<]+)</a>', content, re.IGNORECASE)
+            nav_content = [src.text_after(el).strip() for el in nav_links]
             if nav_content and len(nav_content) > 2:
                 last_item = nav_content[-1].lower() if nav_content else ''
                 if not any(x in last_item for x in ['contact', 'login', 'sign', 'get started', 'cta', 'button']):
-                    self.warnings.append(f"[Serial Position] {filename}: Last nav item may not be important. Place key actions at start/end.")
+                    self.warnings.append(f"[Serial Position] {filename}: Last nav item may not be important. Place key actions at start/end.", rule="serial-position/nav-order")
 
         # --- 1.5 EMOTIONAL DESIGN (Don Norman) ---
 
+        has_background = src.has_decl('background', 'background-color', 'background-image') or src.has_utility(BG_UTILITY)
+
         # Visceral: First impressions (aesthetics, gradients, animations)
-        has_hero = bool(re.search(r'hero|<h1|banner', content, re.IGNORECASE))
+        has_hero = bool(self.FOLDED['hero'].search(folded))
         if has_hero:
             # Check for visual appeal elements
-            has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient', content))
-            has_animation = bool(re.search(r'@keyframes|transition:|animate-', content))
+            has_gradient = bool(self.RAW['gradient'].search(content))
+            has_animation = '@keyframes' in content or src.has_decl('transition') or src.has_utility(ANIMATE_UTILITY)
             has_visual_interest = has_gradient or has_animation
 
-            if not has_visual_interest and not re.search(r'background:|bg-', content):
-                self.warnings.append(f"[Visceral] {filename}: Hero section lacks visual appeal. Consider gradients or subtle animations.")
+            if not has_visual_interest and not has_background:
+                self.warnings.append(f"[Visceral] {filename}: Hero section lacks visual appeal. Consider gradients or subtle animations.", rule="visceral/hero-appeal")
 
         # Behavioral: Instant feedback and usability
         if 'onClick' in content or '@click' in content or 'onclick' in content:
-            has_feedback = re.search(r'transition|animate|hover:|focus:|disabled|loading|spinner', content, re.IGNORECASE)
-            has_state_change = re.search(r'setState|useState|disabled|loading', content)
+            has_feedback = self.FOLDED['feedback'].search(folded)
+            has_state_change = self.RAW['state_change'].search(content)
 
             if not has_feedback and not has_state_change:
-                self.warnings.append(f"[Behavioral] {filename}: Interactive elements lack immediate feedback. Add hover/focus/disabled states.")
+                self.warnings.append(f"[Behavioral] {filename}: Interactive elements lack immediate feedback. Add hover/focus/disabled states.", rule="behavioral/interaction-feedback")
 
         # Reflective: Brand story, values, identity
-        has_reflective = bool(re.search(r'about|story|mission|values|why we|our journey|testimonials', content, re.IGNORECASE))
+        has_reflective = bool(self.FOLDED['reflective'].search(folded))
         if has_long_text and not has_reflective:
-            self.warnings.append(f"[Reflective] {filename}: Long-form content without brand story/values. Add 'About' or 'Why We Exist' section.")
+            self.warnings.append(f"[Reflective] {filename}: Long-form content without brand story/values. Add 'About' or 'Why We Exist' section.", rule="reflective/brand-story")
 
         # --- 1.6 TRUST BUILDING (Enhanced) ---
 
         # Security signals
         if has_form:
-            security_signals = re.findall(r'ssl|secure|encrypt|lock|padlock|https', content, re.IGNORECASE)
-            if len(security_signals) == 0 and not re.search(r'checkout|payment', content, re.IGNORECASE):
-                self.warnings.append(f"[Trust] {filename}: Form without security indicators. Add 'SSL Secure' or lock icon.")
+            security_signals = self.FOLDED['security'].findall(folded)
+            if len(security_signals) == 0 and not self.FOLDED['checkout'].search(folded):
+                self.warnings.append(f"[Trust] {filename}: Form without security indicators. Add 'SSL Secure' or lock icon.", rule="trust/form-security")
 
         # Social proof elements
-        social_proof = re.findall(r'review|testimonial|rating|star|trust|trusted by|customer|logo', content, re.IGNORECASE)
+        social_proof = self.FOLDED['social_proof'].findall(folded)
         if len(social_proof) > 0:
             self.passed_count += 1
         else:
             if has_long_text:
-                self.warnings.append(f"[Trust] {filename}: No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos.")
+                self.warnings.append(f"[Trust] {filename}: No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos.", rule="trust/social-proof")
 
         # Authority indicators
-        has_footer = bool(re.search(r'footer|<footer', content, re.IGNORECASE))
+        has_footer = bool(src.count('footer') or 'footer' in folded)
         if has_footer:
-            authority = re.findall(r'certif|award|media|press|featured|as seen in', content, re.IGNORECASE)
+            authority = self.FOLDED['authority'].findall(folded)
             if len(authority) == 0:
-                self.warnings.append(f"[Trust] {filename}: Footer lacks authority signals. Add certifications, awards, or media mentions.")
+                self.warnings.append(f"[Trust] {filename}: Footer lacks authority signals. Add certifications, awards, or media mentions.", rule="trust/footer-authority")
 
         # --- 1.7 COGNITIVE LOAD MANAGEMENT ---
 
         # Progressive disclosure
         if complex_elements > 5:
-            has_progressive = re.search(r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', content, re.IGNORECASE)
+            has_progressive = self.FOLDED['progressive'].search(folded)
             if not has_progressive:
-                self.warnings.append(f"[Cognitive Load] {filename}: Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle.")
+                self.warnings.append(f"[Cognitive Load] {filename}: Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle.", rule="cognitive-load/progressive-disclosure")
 
         # Visual noise check
-        has_many_colors = len(re.findall(r'#[0-9a-fA-F]{3,6}|rgb|hsl', content)) > 15
-        has_many_borders = len(re.findall(r'border:|border-', content)) > 10
+        has_many_colors = colors.total > 15
+        border_decls = src.count_decls(lambda p: p.startswith('border'))
+        has_many_borders = border_decls + src.count_utilities(BORDER_UTILITY) > 10
         if has_many_colors and has_many_borders:
-            self.warnings.append(f"[Cognitive Load] {filename}: High visual noise detected. Many colors and borders increase cognitive load.")
+            self.warnings.append(f"[Cognitive Load] {filename}: High visual noise detected. Many colors and borders increase cognitive load.", rule="cognitive-load/visual-noise")
 
         # Familiar patterns
         if has_form:
-            has_standard_labels = bool(re.search(r'<label|placeholder|aria-label', content, re.IGNORECASE))
+            has_standard_labels = bool(src.count('label') or any(
+                'placeholder' in el.attrs or 'aria-label' in el.attrs for el in src.elements))
             if not has_standard_labels:
-                self.issues.append(f"[Cognitive Load] {filename}: Form inputs without labels. Use <label> for accessibility and clarity.")
+                self.issues.append(f"[Cognitive Load] {filename}: Form inputs without labels. Use <label> for accessibility and clarity.", rule="cognitive-load/unlabeled-inputs")
 
         # --- 1.8 PERSUASIVE DESIGN (Ethical) ---
 
         # Smart defaults
         if has_form:
-            has_defaults = bool(re.search(r'checked|selected|default|value=["\'].*["\']', content))
-            radio_inputs = len(re.findall(r'type=["\']radio', content, re.IGNORECASE))
+            has_defaults = bool(self.RAW['defaults'].search(content))
+            radio_inputs = sum(1 for el in src.find('input') if RADIO_TYPE.search(el.attrs))
             if radio_inputs > 0 and not has_defaults:
-                self.warnings.append(f"[Persuasion] {filename}: Radio buttons without default selection. Pre-select recommended option.")
+                self.warnings.append(f"[Persuasion] {filename}: Radio buttons without default selection. Pre-select recommended option.", rule="persuasion/default-selection")
 
         # Anchoring (showing original price)
-        if re.search(r'price|pricing|cost|\$\d+', content, re.IGNORECASE):
-            has_anchor = bool(re.search(r'original|was|strike|del|save \d+%', content, re.IGNORECASE))
+        if self.FOLDED['price'].search(folded):
+            has_anchor = bool(self.FOLDED['anchor'].search(folded))
             if not has_anchor:
-                self.warnings.append(f"[Persuasion] {filename}: Prices without anchoring. Show original price to frame discount value.")
+                self.warnings.append(f"[Persuasion] {filename}: Prices without anchoring. Show original price to frame discount value.", rule="persuasion/price-anchoring")
 
         # Social proof live indicators
-        has_social = bool(re.search(r'join|subscriber|member|user', content, re.IGNORECASE))
+        has_social = bool(self.FOLDED['community'].search(folded))
         if has_social:
-            has_count = bool(re.findall(r'\d+[+kmb]|\d+,\d+', content))
+            has_count = bool(self.RAW['count'].search(content))
             if not has_count:
-                self.warnings.append(f"[Persuasion] {filename}: Social proof without specific numbers. Use 'Join 10,000+' format.")
+                self.warnings.append(f"[Persuasion] {filename}: Social proof without specific numbers. Use 'Join 10,000+' format.", rule="persuasion/social-proof-numbers")
 
         # Progress indicators
         if has_form:
-            has_progress = bool(re.search(r'progress|step \d+|complete|%|bar', content, re.IGNORECASE))
+            has_progress = bool(self.FOLDED['progress'].search(folded))
             if complex_elements > 5 and not has_progress:
-                self.warnings.append(f"[Persuasion] {filename}: Long form without progress indicator. Add progress bar or 'Step X of Y'.")
+                self.warnings.append(f"[Persuasion] {filename}: Long form without progress indicator. Add progress bar or 'Step X of Y'.", rule="persuasion/progress-indicator")
 
         # --- 2. TYPOGRAPHY SYSTEM (Complete Coverage) ---
 
         # 2.1 Font Pairing - Too many font families
         font_families = set()
         # Check for @font-face, Google Fonts, font-family declarations
-        font_faces = re.findall(r'@font-face\s*\{[^}]*family:\s*["\']?([^;"\'\s}]+)', content, re.IGNORECASE)
-        google_fonts = re.findall(r'fonts\.googleapis\.com[^"\']*family=([^"&]+)', content, re.IGNORECASE)
-        font_family_css = re.findall(r'font-family:\s*([^;]+)', content, re.IGNORECASE)
+        font_faces = self.FOLDED['font_face'].findall(folded)
+        google_fonts = self.FOLDED['google_fonts'].findall(folded)
+        font_family_css = src.values('font-family')
 
         for font in font_faces: font_families.add(font.strip().lower())
         for font in google_fonts:
@@ -262,84 +604,97 @@ class UXAuditor:
                 font_families.add(first_font.lower())
 
         if len(font_families) > 3:
-            self.issues.append(f"[Typography] {filename}: {len(font_families)} font families detected. Limit to 2-3 for cohesion.")
+            self.issues.append(f"[Typography] {filename}: {len(font_families)} font families detected. Limit to 2-3 for cohesion.", rule="typography/font-families")
 
         # 2.2 Line Length - Character-based width
-        if has_long_text and not re.search(r'max-w-(?:prose|[\[\\]?\d+ch[\]\\]?)|max-width:\s*\d+ch', content):
-            self.warnings.append(f"[Typography] {filename}: No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch].")
+        has_line_length = src.has_utility(PROSE_WIDTH_UTILITY) or any(CH_VALUE.match(v) for v in src.values('max-width'))
+        if has_long_text and not has_line_length:
+            self.warnings.append(f"[Typography] {filename}: No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch].", rule="typography/line-length")
 
         # 2.3 Line Height - Proper leading ratios
         # Check for text without proper line-height
-        text_elements = len(re.findall(r'<p|<span|<div.*text|<h[1-6]', content, re.IGNORECASE))
-        if text_elements > 0 and not re.search(r'leading-|line-height:', content):
-            self.warnings.append(f"[Typography] {filename}: Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3")
+        text_elements = src.count('p', 'span', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6') + len(text_divs)
+        has_leading = src.has_decl('line-height') or src.has_utility(LEADING_UTILITY)
+        if text_elements > 0 and not has_leading:
+            self.warnings.append(f"[Typography] {filename}: Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3", rule="typography/line-height")
 
         # Check for heading-specific line height issues
-        if re.search(r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', content, re.IGNORECASE):
+        if src.count('h1', 'h2', 'h3', 'h4', 'h5', 'h6') or src.has_utility(HEADING_SIZE_UTILITY):
             # Extract line-height values
-            line_heights = re.findall(r'(?:leading-|line-height:\s*)([\d.]+)', content)
-            for lh in line_heights:
+            line_heights = [(m.group(1), src.first_use(m.group(0)))
+                            for m in map(LEADING_VALUE.match, src.utilities) if m]
+            line_heights += [(v, sp) for v, sp in src.decls('line-height') if NUMBER.fullmatch(v)]
+            for lh, span in line_heights:
                 if float(lh) > 1.5:
-                    self.warnings.append(f"[Typography] {filename}: Heading has line-height {lh} (>1.3). Headings should be tighter (1.1-1.3).")
+                    self.warnings.append(f"[Typography] {filename}: Heading has line-height {lh} (>1.3). Headings should be tighter (1.1-1.3).", span=span, rule="typography/heading-line-height")
 
         # 2.4 Letter Spacing (Tracking)
         # Uppercase without tracking
-        if re.search(r'uppercase|text-transform:\s*uppercase', content, re.IGNORECASE):
-            if not re.search(r'tracking-|letter-spacing:', content):
-                self.warnings.append(f"[Typography] {filename}: Uppercase text without tracking. ALL CAPS needs +5-10% spacing.")
+        uppercase = [sp for v, sp in src.decls('text-transform') if v.lower() == 'uppercase']
+        uppercase += [sp for sp in [src.first_use('uppercase')] if sp]
+        if uppercase:
+            if not (src.has_decl('letter-spacing') or src.has_utility(TRACKING_UTILITY)):
+                self.warnings.append(f"[Typography] {filename}: Uppercase text without tracking. ALL CAPS needs +5-10% spacing.", span=min(uppercase), rule="typography/uppercase-tracking")
 
         # Large text (display/hero) should have negative tracking
-        if re.search(r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx', content):
-            if not re.search(r'tracking-tight|letter-spacing:\s*-[0-9]', content):
-                self.warnings.append(f"[Typography] {filename}: Large display text without tracking-tight. Big text needs -1% to -4% spacing.")
+        display_text = [sp for v, sp in src.decls('font-size') if LARGE_PX_VALUE.match(v)]
+        display_text += [sp for sp in [src.utility_span(DISPLAY_SIZE_UTILITY)] if sp]
+        if display_text:
+            if not (src.utilities['tracking-tight'] or any(v.startswith('-') for v in src.values('letter-spacing'))):
+                self.warnings.append(f"[Typography] {filename}: Large display text without tracking-tight. Big text needs -1% to -4% spacing.", span=min(display_text), rule="typography/display-tracking")
 
         # 2.5 Weight and Emphasis - Contrast levels
-        # Check for adjacent weight levels (poor contrast)
-        weights = re.findall(r'font-weight:\s*(\d+)|font-(?:thin|extralight|light|normal|medium|semibold|bold|extrabold|black)|fw-(\d+)', content, re.IGNORECASE)
+        # Check for adjacent weight levels (poor contrast), in document order
+        weight_map = {'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500', 'semibold': '600', 'bold': '700', 'extrabold': '800', 'black': '900'}
+        weights = [(span, value) for value, span in src.decls('font-weight')]
+        for el in src.elements:
+            for c in el.classes:
+                m = FONT_WEIGHT_UTILITY.match(_utility(c))
+                if m:
+                    weights.append((el.span, m.group(1) or m.group(2)))
         weight_values = []
-        for w in weights:
-            val = w[0] or w[1]
-            if val:
-                # Map named weights to numbers
-                weight_map = {'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500', 'semibold': '600', 'bold': '700', 'extrabold': '800', 'black': '900'}
-                val = weight_map.get(val.lower(), val)
-                try:
-                    weight_values.append(int(val))
-                except: pass
+        weight_spans = []
+        for span, val in sorted(weights):
+            val = weight_map.get(val.lower(), val)
+            try:
+                weight_values.append(int(val))
+                weight_spans.append(span)
+            except: pass
 
         # Check for adjacent weights (400/500, 500/600, etc.)
         for i in range(len(weight_values) - 1):
             diff = abs(weight_values[i] - weight_values[i+1])
             if diff == 100:
-                self.warnings.append(f"[Typography] {filename}: Adjacent font weights ({weight_values[i]}/{weight_values[i+1]}). Skip at least 2 levels for contrast.")
+                self.warnings.append(f"[Typography] {filename}: Adjacent font weights ({weight_values[i]}/{weight_values[i+1]}). Skip at least 2 levels for contrast.", span=weight_spans[i+1], rule="typography/adjacent-weights")
 
         # Too many weight levels
         unique_weights = set(weight_values)
         if len(unique_weights) > 4:
-            self.warnings.append(f"[Typography] {filename}: {len(unique_weights)} font weights. Limit to 3-4 per page.")
+            self.warnings.append(f"[Typography] {filename}: {len(unique_weights)} font weights. Limit to 3-4 per page.", rule="typography/weight-count")
 
         # 2.6 Responsive Typography - Fluid sizing with clamp()
-        has_font_sizes = bool(re.search(r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)', content))
-        if has_font_sizes and not re.search(r'clamp\(|responsive:', content):
-            self.warnings.append(f"[Typography] {filename}: Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)")
+        has_font_sizes = src.has_decl('font-size') or src.has_utility(TEXT_SIZE_UTILITY)
+        if has_font_sizes and not self.RAW['fluid'].search(content):
+            self.warnings.append(f"[Typography] {filename}: Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)", rule="typography/fluid-sizes")
 
         # 2.7 Hierarchy - Heading structure
-        headings = re.findall(r'<(h[1-6])', content, re.IGNORECASE)
+        heading_elements = src.find('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+        headings = [el.tag for el in heading_elements]
         if headings:
             # Check for skipped levels (h1 -> h3)
             for i in range(len(headings) - 1):
                 curr = int(headings[i][1])
                 next_h = int(headings[i+1][1])
                 if next_h > curr + 1:
-                    self.warnings.append(f"[Typography] {filename}: Skipped heading level (h{curr} -> h{next_h}). Maintain sequential hierarchy.")
+                    self.warnings.append(f"[Typography] {filename}: Skipped heading level (h{curr} -> h{next_h}). Maintain sequential hierarchy.", span=heading_elements[i+1].span, rule="typography/skipped-heading")
 
             # Check if h1 exists for main content
-            if 'h1' not in [h.lower() for h in headings] and has_long_text:
-                self.warnings.append(f"[Typography] {filename}: No h1 found. Each page should have one primary heading.")
+            if 'h1' not in headings and has_long_text:
+                self.warnings.append(f"[Typography] {filename}: No h1 found. Each page should have one primary heading.", rule="typography/missing-h1")
 
         # 2.8 Modular Scale - Consistent sizing
         # Extract font-size values
-        font_sizes = re.findall(r'font-size:\s*(\d+(?:\.\d+)?)(px|rem|em)', content)
+        font_sizes = [m.groups() for m in map(FONT_SIZE_VALUE.match, src.values('font-size')) if m]
         size_values = []
         for size, unit in font_sizes:
             if unit == 'rem' or unit == 'em':
@@ -359,346 +714,429 @@ class UXAuditor:
             common_ratios = {1.067, 1.125, 1.2, 1.25, 1.333, 1.5, 1.618}
             for ratio in ratios[:3]:  # Check first 3 ratios
                 if not any(abs(ratio - cr) < 0.05 for cr in common_ratios):
-                    self.warnings.append(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio like 1.25 (Major Third).")
+                    self.warnings.append(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio like 1.25 (Major Third).", rule="typography/modular-scale")
                     break
 
         # 2.9 Readability - Content chunking
         # Check for very long paragraphs (>5 lines estimated)
-        paragraphs = re.findall(r'<p[^>]*>([^<]+)</p>', content, re.IGNORECASE)
-        for p in paragraphs:
+        paragraphs = [(src.text_after(el), el) for el in src.find('p')
+                      if content.startswith('</p', el.end + len(src.text_after(el)))]
+        for p, el in paragraphs:
             word_count = len(p.split())
             if word_count > 100:  # ~5-6 lines
-                self.warnings.append(f"[Typography] {filename}: Long paragraph detected ({word_count} words). Break into 3-4 line chunks for readability.")
+                self.warnings.append(f"[Typography] {filename}: Long paragraph detected ({word_count} words). Break into 3-4 line chunks for readability.", span=el.span, rule="typography/long-paragraph")
 
         # Check for missing subheadings in long content
         if len(paragraphs) > 5:
-            subheadings = len(re.findall(r'<h[2-6]', content, re.IGNORECASE))
+            subheadings = src.count('h2', 'h3', 'h4', 'h5', 'h6')
             if subheadings == 0:
-                self.warnings.append(f"[Typography] {filename}: Long content without subheadings. Add h2/h3 to break up text.")
+                self.warnings.append(f"[Typography] {filename}: Long content without subheadings. Add h2/h3 to break up text.", rule="typography/missing-subheadings")
 
         # --- 3. VISUAL EFFECTS (visual-effects.md) ---
         
         # Glassmorphism Check
         if 'backdrop-filter' in content or 'blur(' in content:
-            if not re.search(r'background:\s*rgba|bg-opacity|bg-[a-z0-9]+\/\d+', content):
-                self.warnings.append(f"[Visual] {filename}: Blur used without semi-transparent background (Glassmorphism fail)")
+            has_translucent_bg = (any('rgba' in v for v in src.values('background', 'background-color'))
+                                  or src.has_utility(TRANSLUCENT_BG_UTILITY))
+            if not has_translucent_bg:
+                self.warnings.append(f"[Visual] {filename}: Blur used without semi-transparent background (Glassmorphism fail)", rule="visual/glassmorphism")
         
         # GPU Acceleration / Performance
-        if re.search(r'@keyframes|transition:', content):
-            expensive_props = re.findall(r'width|height|top|left|right|bottom|margin|padding', content)
+        if '@keyframes' in content or src.has_decl('transition'):
+            expensive = [(p, (start, end)) for p, _, start, end in src.declarations if LAYOUT_PROPERTY.match(p)]
+            expensive_props = {p for p, _ in expensive}
             if expensive_props:
-                self.warnings.append(f"[Performance] {filename}: Animating expensive properties ({', '.join(set(expensive_props))}). Use transform/opacity where possible.")
+                self.warnings.append(f"[Performance] {filename}: Animating expensive properties ({', '.join(sorted(expensive_props))}). Use transform/opacity where possible.", span=expensive[0][1], rule="performance/expensive-animation")
             
             # Reduced Motion
-            if not re.search(r'prefers-reduced-motion', content):
-                self.warnings.append(f"[Accessibility] {filename}: Animations found without prefers-reduced-motion check")
+            if 'prefers-reduced-motion' not in content:
+                self.warnings.append(f"[Accessibility] {filename}: Animations found without prefers-reduced-motion check", rule="accessibility/reduced-motion")
 
         # Natural Shadows
-        shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
-        for shadow in shadows:
+        shadow_decls = src.decls('box-shadow')
+        shadows = [shadow for shadow, _ in shadow_decls]
+        for shadow, span in shadow_decls:
             # Check if natural (Y > X) or multiple layers
-            if ',' not in shadow and not re.search(r'\d+px\s+[1-9]\d*px', shadow): # Simple heuristic for Y-offset
-                 self.warnings.append(f"[Visual] {filename}: Simple/Unnatural shadow detected. Consider multiple layers or Y > X offset for realism.")
+            if ',' not in shadow and not Y_OFFSET_VALUE.search(shadow): # Simple heuristic for Y-offset
+                 self.warnings.append(f"[Visual] {filename}: Simple/Unnatural shadow detected. Consider multiple layers or Y > X offset for realism.", span=span, rule="visual/flat-shadow")
 
         # --- 3.1 NEOMORPHISM CHECK ---
         # Check for neomorphism patterns (dual shadows with opposite directions)
-        neo_shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
-        for shadow in neo_shadows:
+        for shadow, span in shadow_decls:
             # Neomorphism has two shadows: positive offset + negative offset
             if ',' in shadow and '-' in shadow:
                 # Check for inset pattern (pressed state)
                 if 'inset' in shadow:
-                    self.warnings.append(f"[Visual] {filename}: Neomorphism inset detected. Ensure adequate contrast for accessibility.")
+                    self.warnings.append(f"[Visual] {filename}: Neomorphism inset detected. Ensure adequate contrast for accessibility.", span=span, rule="visual/neomorphism-contrast")
 
         # --- 3.2 SHADOW HIERARCHY ---
         # Count shadow levels to check for elevation consistency
         shadow_count = len(shadows)
         if shadow_count > 0:
             # Check for shadow opacity levels (should indicate hierarchy)
-            opacities = re.findall(r'rgba?\([^)]+,\s*([\d.]+)\)', content)
+            opacities = self.RAW['alpha'].findall(content)
             shadow_opacities = [float(o) for o in opacities if float(o) < 0.5]
             if shadow_count >= 3 and len(shadow_opacities) > 0:
                 # Check if there's variety in shadow opacities for different elevations
                 unique_opacities = len(set(shadow_opacities))
                 if unique_opacities < 2:
-                    self.warnings.append(f"[Visual] {filename}: All shadows at same opacity level. Vary shadow intensity for elevation hierarchy.")
+                    self.warnings.append(f"[Visual] {filename}: All shadows at same opacity level. Vary shadow intensity for elevation hierarchy.", rule="visual/shadow-elevation")
 
         # --- 3.3 GRADIENT CHECKS ---
         # Check for gradient usage
-        has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient|conic-gradient', content))
+        has_gradient = bool(self.RAW['gradient'].search(content))
         if has_gradient:
             # Warn about mesh/aurora gradients (can be overused)
-            gradient_count = len(re.findall(r'gradient', content, re.IGNORECASE))
+            gradient_count = folded.count('gradient')
             if gradient_count > 5:
-                self.warnings.append(f"[Visual] {filename}: Many gradients detected ({gradient_count}). Ensure this serves purpose, not decoration.")
+                self.warnings.append(f"[Visual] {filename}: Many gradients detected ({gradient_count}). Ensure this serves purpose, not decoration.", rule="visual/gradient-count")
         else:
             # Check if hero section exists without gradient
-            if has_hero and not re.search(r'background:|bg-', content):
-                self.warnings.append(f"[Visual] {filename}: Hero section without visual interest. Consider gradient for depth.")
+            if has_hero and not has_background:
+                self.warnings.append(f"[Visual] {filename}: Hero section without visual interest. Consider gradient for depth.", rule="visual/hero-depth")
 
         # --- 3.4 BORDER EFFECTS ---
         # Check for gradient borders or animated borders
-        has_border = bool(re.search(r'border:|border-', content))
-        if has_border:
+        if border_decls:
             # Check for overly complex borders
-            border_count = len(re.findall(r'border:', content))
+            border_count = len(src.values('border'))
             if border_count > 8:
-                self.warnings.append(f"[Visual] {filename}: Many border declarations ({border_count}). Simplify for cleaner look.")
+                self.warnings.append(f"[Visual] {filename}: Many border declarations ({border_count}). Simplify for cleaner look.", rule="visual/border-count")
 
         # --- 3.5 GLOW EFFECTS ---
         # Check for text-shadow or multiple box-shadow layers (glow effects)
-        text_shadows = re.findall(r'text-shadow:', content)
-        for ts in text_shadows:
+        text_shadows = src.values('text-shadow')
+        for ts, span in src.decls('text-shadow'):
             # Multiple text-shadow layers indicate glow
             if ',' in ts:
-                self.warnings.append(f"[Visual] {filename}: Text glow effect detected. Ensure readability is maintained.")
+                self.warnings.append(f"[Visual] {filename}: Text glow effect detected. Ensure readability is maintained.", span=span, rule="visual/text-glow")
 
         # Check for box-shadow glow (multiple layers with 0 offset)
-        glow_shadows = re.findall(r'box-shadow:\s*[^;]*0\s+0\s+', content)
+        glow_shadows = [s for s in shadows if GLOW_VALUE.search(s)]
         if len(glow_shadows) > 2:
-            self.warnings.append(f"[Visual] {filename}: Multiple glow effects detected. Use sparingly for emphasis only.")
+            self.warnings.append(f"[Visual] {filename}: Multiple glow effects detected. Use sparingly for emphasis only.", rule="visual/glow-count")
 
         # --- 3.6 OVERLAY TECHNIQUES ---
         # Check for image overlays (for readability)
-        has_images = bool(re.search(r'<img|background-image:|bg-\[url', content))
+        has_images = bool(src.count('img') or src.has_decl('background-image') or src.has_utility(BG_IMAGE_UTILITY))
         if has_images and has_long_text:
-            has_overlay = bool(re.search(r'overlay|rgba\(0|gradient.*transparent|::after|::before', content))
+            has_overlay = bool(self.RAW['overlay'].search(content))
             if not has_overlay:
-                self.warnings.append(f"[Visual] {filename}: Text over image without overlay. Add gradient overlay for readability.")
+                self.warnings.append(f"[Visual] {filename}: Text over image without overlay. Add gradient overlay for readability.", rule="visual/text-over-image")
 
         # --- 3.7 PERFORMANCE: will-change ---
         # Check for will-change usage
-        if re.search(r'will-change:', content):
-            will_change_props = re.findall(r'will-change:\s*([^;]+)', content)
-            for prop in will_change_props:
-                prop = prop.strip().lower()
-                if prop in ['width', 'height', 'top', 'left', 'right', 'bottom', 'margin', 'padding']:
-                    self.issues.append(f"[Performance] {filename}: will-change on '{prop}' (layout property). Use only for transform/opacity.")
+        will_change_props = src.values('will-change')
+        for prop, span in src.decls('will-change'):
+            prop = prop.strip().lower()
+            if prop in ['width', 'height', 'top', 'left', 'right', 'bottom', 'margin', 'padding']:
+                self.issues.append(f"[Performance] {filename}: will-change on '{prop}' (layout property). Use only for transform/opacity.", span=span, rule="performance/will-change-layout")
 
         # Check for excessive will-change usage
-        will_change_count = len(re.findall(r'will-change:', content))
+        will_change_count = len(will_change_props)
         if will_change_count > 3:
-            self.warnings.append(f"[Performance] {filename}: Many will-change declarations ({will_change_count}). Use sparingly, only for heavy animations.")
+            self.warnings.append(f"[Performance] {filename}: Many will-change declarations ({will_change_count}). Use sparingly, only for heavy animations.", rule="performance/will-change-count")
 
         # --- 3.8 EFFECT SELECTION ---
         # Check for effect overuse (too many visual effects)
         effect_count = (
             (1 if has_gradient else 0) +
             shadow_count +
-            len(re.findall(r'backdrop-filter|blur\(', content)) +
-            len(re.findall(r'text-shadow:', content))
+            len(self.RAW['blur'].findall(content)) +
+            len(text_shadows)
         )
         if effect_count > 10:
-            self.warnings.append(f"[Visual] {filename}: Many visual effects ({effect_count}). Ensure effects serve purpose, not decoration.")
+            self.warnings.append(f"[Visual] {filename}: Many visual effects ({effect_count}). Ensure effects serve purpose, not decoration.", rule="visual/effect-count")
 
         # Check for static/flat design (no depth)
         if has_long_text and effect_count == 0:
-            self.warnings.append(f"[Visual] {filename}: Flat design with no depth. Consider shadows or subtle gradients for hierarchy.")
+            self.warnings.append(f"[Visual] {filename}: Flat design with no depth. Consider shadows or subtle gradients for hierarchy.", rule="visual/flat-design")
 
         # --- 4. COLOR SYSTEM (color-system.md) ---
 
         # 4.1 PURPLE BAN - Critical check from color-system.md
-        purple_hexes = ['#8B5CF6', '#A855F7', '#9333EA', '#7C3AED', '#6D28D9',
-                        '#8B5CF6', '#A78BFA', '#C4B5FD', '#DDD6FE', '#EDE9FE',
-                        '#8b5cf6', '#a855f7', '#9333ea', '#7c3aed', '#6d28d9',
-                        'purple', 'violet', 'fuchsia', 'magenta', 'lavender']
-        for purple in purple_hexes:
-            if purple.lower() in content.lower():
-                self.issues.append(f"[Color] {filename}: PURPLE DETECTED ('{purple}'). Banned by Maestro rules. Use Teal/Cyan/Emerald instead.")
+        purple_found = set(self.PURPLE_RE.findall(folded))
+        for purple in PURPLE_TERMS:
+            if purple.lower() in purple_found:
+                m = re.search(re.escape(purple), content, re.IGNORECASE)
+                self.issues.append(f"[Color] {filename}: PURPLE DETECTED ('{purple}'). Banned by Maestro rules. Use Teal/Cyan/Emerald instead.",
+                                   span=m.span() if m else None, rule="color/purple")
                 break
 
         # 4.2 60-30-10 Rule check
         # Count color usage to estimate ratio
-        color_hex_count = len(re.findall(r'#[0-9a-fA-F]{3,6}', content))
-        hsl_count = len(re.findall(r'hsl\(', content))
-        total_colors = color_hex_count + hsl_count
+        total_colors = len(colors.hexes) + colors.hsl
         if total_colors > 3:
             # Check for dominant colors (should be ~60%)
-            bg_declarations = re.findall(r'(?:background|bg-|bg\[)([^;}\s]+)', content)
-            text_declarations = re.findall(r'(?:color|text-)([^;}\s]+)', content)
-            if len(bg_declarations) > 0 and len(text_declarations) > 0:
+            has_bg_colors = has_background
+            has_text_colors = src.has_decl('color') or src.has_utility(TEXT_COLOR_UTILITY)
+            if has_bg_colors and has_text_colors:
                 # Just warn if too many distinct colors
-                unique_hexes = set(re.findall(r'#[0-9a-fA-F]{6}', content))
+                unique_hexes = {h for h in colors.hexes if len(h) == 6}
                 if len(unique_hexes) > 5:
-                    self.warnings.append(f"[Color] {filename}: {len(unique_hexes)} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%).")
+                    self.warnings.append(f"[Color] {filename}: {len(unique_hexes)} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%).", rule="color/palette-size")
 
         # 4.3 Color Scheme Pattern Detection
         # Detect monochromatic (same hue, different lightness)
-        hsl_matches = re.findall(r'hsl\((\d+),\s*\d+%,\s*\d+%\)', content)
-        if len(hsl_matches) >= 3:
-            hues = [int(h) for h in hsl_matches]
+        if len(colors.hues) >= 3:
+            hues = colors.hues
             hue_range = max(hues) - min(hues)
             if hue_range < 10:
-                self.warnings.append(f"[Color] {filename}: Monochromatic palette detected (hue variance: {hue_range}deg). Ensure adequate contrast.")
+                self.warnings.append(f"[Color] {filename}: Monochromatic palette detected (hue variance: {hue_range}deg). Ensure adequate contrast.", rule="color/monochromatic")
 
         # 4.4 Dark Mode Compliance
         # Check for pure black (#000000) or pure white (#FFFFFF) text (forbidden)
-        if re.search(r'color:\s*#000000|#000\b', content):
-            self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode.")
-        if re.search(r'background:\s*#ffffff|#fff\b', content) and re.search(r'dark:\s*|dark:', content):
-            self.warnings.append(f"[Color] {filename}: Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain.")
+        pure_black = self.RAW['pure_black'].search(content)
+        if pure_black:
+            self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode.", span=pure_black.span(), rule="color/pure-black")
+        pure_white = self.RAW['pure_white'].search(content)
+        if pure_white and 'dark:' in content:
+            self.warnings.append(f"[Color] {filename}: Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain.", span=pure_white.span(), rule="color/pure-white-dark")
 
         # 4.5 WCAG Contrast Pattern Check
-        # Look for potential low-contrast combinations
-        light_bg_light_text = bool(re.search(r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]', content))
-        dark_bg_dark_text = bool(re.search(r'bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]', content))
-        if light_bg_light_text or dark_bg_dark_text:
-            self.warnings.append(f"[Color] {filename}: Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text).")
+        # Look for potential low-contrast combinations (within one element's classes)
+        low_contrast = False
+        for el in src.elements:
+            if not el.classes:
+                continue
+            utilities = [_utility(c) for c in el.classes]
+            if (any(LIGHT_BG_UTILITY.match(u) for u in utilities) or
+                    ('bg-white' in utilities and any(LIGHT_TEXT_UTILITY.match(u) for u in utilities)) or
+                    any(DARK_BG_UTILITY.match(u) for u in utilities) or
+                    ('bg-black' in utilities and any(DARK_TEXT_UTILITY.match(u) for u in utilities))):
+                low_contrast = True
+                break
+        if low_contrast:
+            self.warnings.append(f"[Color] {filename}: Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text).", rule="color/low-contrast")
 
         # 4.6 Color Psychology Context Check
         # Warn if blue used for food/restaurant context
-        has_blue = bool(re.search(r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}', content))
-        has_food_context = bool(re.search(r'restaurant|food|cooking|recipe|menu|dish|meal', content, re.IGNORECASE))
+        has_blue = src.has_utility(BLUE_UTILITY) or colors.has_blue_hex
+        has_food_context = bool(self.FOLDED['food'].search(folded))
         if has_blue and has_food_context:
-            self.warnings.append(f"[Color] {filename}: Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow).")
+            self.warnings.append(f"[Color] {filename}: Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow).", rule="color/blue-food")
 
         # 4.7 HSL-Based Palette Detection
         # Check if using HSL for palette (recommended in color-system.md)
-        has_color_vars = bool(re.search(r'--color-|color-|primary-|secondary-', content))
-        if has_color_vars and not re.search(r'hsl\(', content):
-            self.warnings.append(f"[Color] {filename}: Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness).")
+        has_color_vars = bool(self.RAW['color_vars'].search(content))
+        if has_color_vars and not colors.hsl:
+            self.warnings.append(f"[Color] {filename}: Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness).", rule="color/hsl-variables")
 
         # --- 5. ANIMATION GUIDE (animation-guide.md) ---
 
         # 5.1 Duration Appropriateness
         # Check for excessively long or short animations
-        durations = re.findall(r'(?:duration|animation-duration|transition-duration):\s*([\d.]+)(s|ms)', content)
-        for duration, unit in durations:
+        durations = [(DURATION_VALUE.match(v), span) for v, span in src.decls(
+            'duration', 'animation-duration', 'transition-duration')]
+        for m, span in durations:
+            if not m:
+                continue
+            duration, unit = m.groups()
             duration_ms = float(duration) * (1000 if unit == 's' else 1)
             if duration_ms < 50:
-                self.warnings.append(f"[Animation] {filename}: Very fast animation ({duration}{unit}). Minimum 50ms for visibility.")
-            elif duration_ms > 1000 and 'transition' in content.lower():
-                self.warnings.append(f"[Animation] {filename}: Long transition ({duration}{unit}). Transitions should be 100-300ms for responsiveness.")
+                self.warnings.append(f"[Animation] {filename}: Very fast animation ({duration}{unit}). Minimum 50ms for visibility.", span=span, rule="animation/too-fast")
+            elif duration_ms > 1000 and 'transition' in folded:
+                self.warnings.append(f"[Animation] {filename}: Long transition ({duration}{unit}). Transitions should be 100-300ms for responsiveness.", span=span, rule="animation/too-slow")
 
         # 5.2 Easing Function Correctness
         # Check for incorrect easing patterns
-        if re.search(r'ease-in\s+.*entry|fade-in.*ease-in', content):
-            self.warnings.append(f"[Animation] {filename}: Entry animation with ease-in. Entry should use ease-out for snappy feel.")
-        if re.search(r'ease-out\s+.*exit|fade-out.*ease-out', content):
-            self.warnings.append(f"[Animation] {filename}: Exit animation with ease-out. Exit should use ease-in for natural feel.")
+        ease_in_entry = self.RAW['ease_in_entry'].search(content)
+        if ease_in_entry:
+            self.warnings.append(f"[Animation] {filename}: Entry animation with ease-in. Entry should use ease-out for snappy feel.", span=ease_in_entry.span(), rule="animation/entry-easing")
+        ease_out_exit = self.RAW['ease_out_exit'].search(content)
+        if ease_out_exit:
+            self.warnings.append(f"[Animation] {filename}: Exit animation with ease-out. Exit should use ease-in for natural feel.", span=ease_out_exit.span(), rule="animation/exit-easing")
 
         # 5.3 Micro-interaction Feedback Patterns
         # Check for interactive elements without hover/focus states
-        interactive_elements = len(re.findall(r'<button|<a\s+href|onClick|@click', content))
-        has_hover_focus = bool(re.search(r'hover:|focus:|:hover|:focus', content))
+        interactive_elements = (src.count('button') + sum(1 for el in src.find('a') if 'href' in el.attrs) +
+                                sum(1 for el in src.elements if 'onClick' in el.attrs or '@click' in el.attrs))
+        has_hover_focus = src.has_variant('hover:', 'focus:') or ':hover' in content or ':focus' in content
         if interactive_elements > 2 and not has_hover_focus:
-            self.warnings.append(f"[Animation] {filename}: Interactive elements without hover/focus states. Add micro-interactions for feedback.")
+            self.warnings.append(f"[Animation] {filename}: Interactive elements without hover/focus states. Add micro-interactions for feedback.", rule="animation/micro-interactions")
 
         # 5.4 Loading State Indicators
         # Check for loading patterns
-        has_async = bool(re.search(r'async|await|fetch|axios|loading|isLoading', content))
-        has_loading_indicator = bool(re.search(r'skeleton|spinner|progress|loading|<circle.*animate', content))
+        has_async = bool(self.RAW['async'].search(content))
+        has_loading_indicator = bool(self.RAW['loading'].search(content))
         if has_async and not has_loading_indicator:
-            self.warnings.append(f"[Animation] {filename}: Async operations without loading indicator. Add skeleton or spinner for perceived performance.")
+            self.warnings.append(f"[Animation] {filename}: Async operations without loading indicator. Add skeleton or spinner for perceived performance.", rule="animation/loading-indicator")
 
         # 5.5 Page Transition Patterns
         # Check for page/view transitions
-        has_routing = bool(re.search(r'router|navigate|Link.*to|useHistory', content))
-        has_page_transition = bool(re.search(r'AnimatePresence|motion\.|transition.*page|fade.*route', content))
+        has_routing = bool(self.RAW['routing'].search(content))
+        has_page_transition = bool(self.RAW['page_transition'].search(content))
         if has_routing and not has_page_transition:
-            self.warnings.append(f"[Animation] {filename}: Routing detected without page transitions. Consider fade/slide for context continuity.")
+            self.warnings.append(f"[Animation] {filename}: Routing detected without page transitions. Consider fade/slide for context continuity.", rule="animation/page-transitions")
 
         # 5.6 Scroll Animation Performance
         # Check for scroll-driven animations
-        has_scroll_anim = bool(re.search(r'onScroll|scroll.*trigger|IntersectionObserver', content))
+        has_scroll_anim = bool(self.RAW['scroll_anim'].search(content))
         if has_scroll_anim:
             # Check if using expensive properties in scroll handlers
-            if re.search(r'onScroll.*[^\w](width|height|top|left)', content):
-                self.issues.append(f"[Animation] {filename}: Scroll handler animating layout properties. Use transform/opacity for 60fps.")
+            scroll_layout = self.RAW['scroll_layout'].search(content)
+            if scroll_layout:
+                self.issues.append(f"[Animation] {filename}: Scroll handler animating layout properties. Use transform/opacity for 60fps.", span=scroll_layout.span(), rule="animation/scroll-layout")
 
         # --- 6. MOTION GRAPHICS (motion-graphics.md) ---
 
         # 6.1 Lottie Animation Checks
-        has_lottie = bool(re.search(r'lottie|Lottie|@lottie-react', content))
+        has_lottie = bool('lottie' in folded)
         if has_lottie:
             # Check for reduced motion fallback
-            has_lottie_fallback = bool(re.search(r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop', content))
+            has_lottie_fallback = bool(self.RAW['lottie_fallback'].search(content))
             if not has_lottie_fallback:
-                self.warnings.append(f"[Motion] {filename}: Lottie animation without reduced-motion fallback. Add pause/stop for accessibility.")
+                self.warnings.append(f"[Motion] {filename}: Lottie animation without reduced-motion fallback. Add pause/stop for accessibility.", rule="motion/lottie-reduced-motion")
 
         # 6.2 GSAP Memory Leak Risks
-        has_gsap = bool(re.search(r'gsap|ScrollTrigger|from\(.*gsap', content))
+        gsap = self.RAW['gsap'].search(content)
+        has_gsap = bool(gsap)
         if has_gsap:
             # Check for cleanup patterns
-            has_gsap_cleanup = bool(re.search(r'kill\(|revert\(|useEffect.*return.*gsap', content))
+            has_gsap_cleanup = bool(self.RAW['gsap_cleanup'].search(content))
             if not has_gsap_cleanup:
-                self.issues.append(f"[Motion] {filename}: GSAP animation without cleanup (kill/revert). Memory leak risk on unmount.")
+                self.issues.append(f"[Motion] {filename}: GSAP animation without cleanup (kill/revert). Memory leak risk on unmount.", span=gsap.span(), rule="motion/gsap-cleanup")
 
         # 6.3 SVG Animation Performance
-        svg_animations = re.findall(r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset', content)
-        if len(svg_animations) > 3:
-            self.warnings.append(f"[Motion] {filename}: Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance.")
+        svg_animations = (src.count('animate', 'animatetransform') +
+                          len(src.values('stroke-dasharray')) + len(src.values('stroke-dashoffset')))
+        if svg_animations > 3:
+            self.warnings.append(f"[Motion] {filename}: Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance.", rule="motion/svg-animation-count")
 
         # 6.4 3D Transform Performance
-        has_3d_transform = bool(re.search(r'transform3d|perspective\(|rotate3d|translate3d', content))
-        if has_3d_transform:
+        transform_3d = self.RAW['transform_3d'].search(content)
+        if transform_3d:
             # Check for perspective on parent
-            has_perspective_parent = bool(re.search(r'perspective:\s*\d+px|perspective\s*\(', content))
+            has_perspective_parent = bool(self.RAW['perspective'].search(content))
             if not has_perspective_parent:
-                self.warnings.append(f"[Motion] {filename}: 3D transform without perspective parent. Add perspective: 1000px for realistic depth.")
+                self.warnings.append(f"[Motion] {filename}: 3D transform without perspective parent. Add perspective: 1000px for realistic depth.", span=transform_3d.span(), rule="motion/missing-perspective")
 
             # Warn about mobile performance
-            self.warnings.append(f"[Motion] {filename}: 3D transforms detected. Test on mobile; can impact performance on low-end devices.")
+            self.warnings.append(f"[Motion] {filename}: 3D transforms detected. Test on mobile; can impact performance on low-end devices.", span=transform_3d.span(), rule="motion/3d-transforms")
 
         # 6.5 Particle Effect Warnings
         # Check for canvas/WebGL particle systems
-        has_particles = bool(re.search(r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js', content))
-        if has_particles:
-            self.warnings.append(f"[Motion] {filename}: Particle effects detected. Ensure fallback or reduced-quality option for mobile devices.")
+        particles = self.RAW['particles'].search(content)
+        if particles:
+            self.warnings.append(f"[Motion] {filename}: Particle effects detected. Ensure fallback or reduced-quality option for mobile devices.", span=particles.span(), rule="motion/particles")
 
         # 6.6 Scroll-Driven Animation Performance
-        has_scroll_driven = bool(re.search(r'IntersectionObserver.*animate|scroll.*progress|view-timeline', content))
-        if has_scroll_driven:
+        scroll_driven = self.RAW['scroll_driven'].search(content)
+        if scroll_driven:
             # Check for throttling/debouncing
-            has_throttle = bool(re.search(r'throttle|debounce|requestAnimationFrame', content))
+            has_throttle = bool(self.RAW['throttle'].search(content))
             if not has_throttle:
-                self.issues.append(f"[Motion] {filename}: Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps.")
+                self.issues.append(f"[Motion] {filename}: Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps.", span=scroll_driven.span(), rule="motion/scroll-throttling")
 
         # 6.7 Motion Decision Tree - Context Check
         # Check if animation serves purpose (not just decoration)
         total_animations = (
-            len(re.findall(r'@keyframes|transition:|animate-', content)) +
+            content.count('@keyframes') + len(src.values('transition')) +
+            src.count_utilities(ANIMATE_UTILITY) +
             (1 if has_lottie else 0) +
             (1 if has_gsap else 0)
         )
         if total_animations > 5:
             # Check if animations are functional
-            functional_animations = len(re.findall(r'hover:|focus:|disabled|loading|error|success', content))
+            functional_animations = len(self.RAW['functional'].findall(content))
             if functional_animations < total_animations / 2:
-                self.warnings.append(f"[Motion] {filename}: Many animations ({total_animations}). Ensure majority serve functional purpose (feedback, guidance), not decoration.")
+                self.warnings.append(f"[Motion] {filename}: Many animations ({total_animations}). Ensure majority serve functional purpose (feedback, guidance), not decoration.", rule="motion/animation-count")
 
         # --- 7. ACCESSIBILITY ---
-        if re.search(r'<img(?![^>]*alt=)[^>]*>', content):
-            self.issues.append(f"[Accessibility] {filename}: Missing img alt text")
+        missing_alt = [el for el in src.find('img') if 'alt=' not in el.attrs and 'alt =' not in el.attrs]
+        if missing_alt:
+            self.issues.append(f"[Accessibility] {filename}: Missing img alt text", span=missing_alt[0].span, rule="accessibility/img-alt")
+
+    EXTENSIONS = {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'}
+    SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '.next', CACHE_DIR_NAME}
+
+    def audit_directory(self, directory: str, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        use_cache: bool = True, cache_dir: str = None, only_files: list = None) -> None:
+        """
+        Audit every matching file (or only_files, relative to directory);
+        workers > 1 fans chunks out to a process pool.
+        Unchanged files reuse their results from the ux_audit cache.
+        """
+        files = collect_files(directory, self.EXTENSIONS, self.SKIP_DIRS, only_files)
+        cache = open_cache(type(self), directory, 'ux_audit', cache_dir) if use_cache else None
+        run_pool(self, files, workers=workers, chunk_size=chunk_size, cache=cache)
+
+    def wants(self, path: str) -> bool:
+        return True
 
-    def audit_directory(self, directory: str) -> None:
-        extensions = {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+    def evaluate(self, src: SourceFile):
+        return evaluate_source(type(self), src)
+
+    def collect(self, result) -> None:
+        merge_results(self, (result,))
+
+    def passed(self) -> bool:
+        return len(self.issues) == 0
+
+    def report(self) -> dict:
+        return self.get_report()
 
     def get_report(self):
         return {
             "files_checked": self.files_checked,
-            "issues": self.issues,
-            "warnings": self.warnings,
+            "issues": list(self.issues),
+            "warnings": list(self.warnings),
+            "issue_count": len(self.issues),
+            "warning_count": len(self.warnings),
+            "rule_counts": self.findings.summary(),
+            "findings": [f._asdict() for f in self.findings.retained()],
             "passed_checks": self.passed_count,
             "compliant": len(self.issues) == 0
         }
 
+def run(project_path: str, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_per_rule: int = DEFAULT_KEEP_PER_RULE, use_cache: bool = True,
+        cache_dir: str = None, changed_files: list = None, **opts) -> dict:
+    """
+    Audit a file or directory (only changed_files in it, if given); returns
+    the JSON report with "passed" = compliant (no printing).
+    """
+    auditor = UXAuditor(keep_per_rule=max_per_rule)
+    if os.path.isfile(project_path):
+        auditor.audit_file(project_path)
+    else:
+        auditor.audit_directory(project_path, workers=workers, chunk_size=chunk_size,
+                                use_cache=use_cache, cache_dir=cache_dir, only_files=changed_files)
+    report = auditor.get_report()
+    report["passed"] = report["compliant"]
+    return report
+
+
 def main():
-    if len(sys.argv) < 2: sys.exit(1)
-    
-    path = sys.argv[1]
-    is_json = "--json" in sys.argv
-    
-    auditor = UXAuditor()
+    parser = argparse.ArgumentParser(description="UX audit for frontend source files")
+    parser.add_argument("path", help="File or directory to audit")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for directory audits (default: all cores, 1 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Files per worker task (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--max-per-rule", type=int, default=DEFAULT_KEEP_PER_RULE,
+                        help=f"Findings kept in the report per rule; totals stay exact (default: {DEFAULT_KEEP_PER_RULE})")
+    parser.add_argument("--findings-jsonl", metavar="PATH",
+                        help="Stream every finding to PATH as JSON lines")
+    parser.add_argument("--no-cache", action="store_true", help="Re-audit every file, ignoring cached results")
+    parser.add_argument("--cache-dir", default=None,
+                        help=f"Result cache location (default: <project root>/{CACHE_DIR_NAME})")
+    args = parser.parse_args()
+
+    path = args.path
+    is_json = args.json
+
+    findings_stream = open(args.findings_jsonl, 'w', encoding='utf-8') if args.findings_jsonl else None
+    auditor = UXAuditor(keep_per_rule=args.max_per_rule, findings_stream=findings_stream)
     if os.path.isfile(path): auditor.audit_file(path)
-    else: auditor.audit_directory(path)
+    else: auditor.audit_directory(path, workers=args.workers, chunk_size=args.chunk_size,
+                                use_cache=not args.no_cache, cache_dir=args.cache_dir)
     
     report = auditor.get_report()
+    if findings_stream:
+        findings_stream.close()
+    emit_report(report)
     
     if is_json:
         print(json.dumps(report))
@@ -707,10 +1145,10 @@ def main():
         print(f"\n[UX AUDIT] {report['files_checked']} files checked")
         print("-" * 50)
         if report['issues']:
-            print(f"[!] ISSUES ({len(report['issues'])}):")
+            print(f"[!] ISSUES ({report['issue_count']}):")
             for i in report['issues'][:10]: print(f"  - {i}")
         if report['warnings']:
-            print(f"[*] WARNINGS ({len(report['warnings'])}):")
+            print(f"[*] WARNINGS ({report['warning_count']}):")
             for w in report['warnings'][:15]: print(f"  - {w}")
         print(f"[+] PASSED CHECKS: {report['passed_checks']}")
         status = "PASS" if report['compliant'] else "FAIL"
@@ -13,14 +13,22 @@ WHAT IT CHECKS:
     - JSX/TSX files (React page components)
     - NOT markdown files (those are developer docs, not public content)
 
+Files are read through the shared frontend engine, so a combined run
+(frontend_engine.py) audits them in the same pass as the other checkers.
+
 Usage:
     python geo_checker.py <project_path>
 """
 import sys
 import re
 import json
+import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "audit"))
+from frontend_engine import SourceFile, add_run_arguments, register, run as run_engine
+from result_channel import emit_report
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -78,31 +86,10 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
-def find_web_pages(project_path: Path) -> list:
-    """Find public-facing web pages only."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
-    
-    return files[:30]  # Limit to 30 pages
-
-
-def check_page(file_path: Path) -> dict:
+def check_page(src: SourceFile) -> dict:
     """Check a single web page for GEO elements."""
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-    except Exception as e:
-        return {'file': str(file_path.name), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0}
-    
+    content = src.text
+    lower = src.folded
     issues = []
     passed = []
     
@@ -120,8 +107,8 @@ def check_page(file_path: Path) -> dict:
         issues.append("No JSON-LD structured data (AI engines prefer structured content)")
     
     # 2. Heading Structure
-    h1_count = len(re.findall(r'<h1[^>]*>', content, re.I))
-    h2_count = len(re.findall(r'<h2[^>]*>', content, re.I))
+    h1_count = len(src.tags('h1'))
+    h2_count = len(src.tags('h2'))
     
     if h1_count == 1:
         passed.append("Single H1 heading (clear topic)")
@@ -137,7 +124,7 @@ def check_page(file_path: Path) -> dict:
     
     # 3. Author Attribution (E-E-A-T signal)
     author_patterns = ['author', 'byline', 'written-by', 'contributor', 'rel="author"']
-    has_author = any(p in content.lower() for p in author_patterns)
+    has_author = any(p in lower for p in author_patterns)
     if has_author:
         passed.append("Author attribution found")
     else:
@@ -158,12 +145,12 @@ def check_page(file_path: Path) -> dict:
         passed.append("FAQ section detected (highly citable)")
     
     # 6. Lists (Structured content)
-    list_count = len(re.findall(r'<(ul|ol)[^>]*>', content, re.I))
+    list_count = len(src.tags('ul', 'ol'))
     if list_count >= 2:
         passed.append(f"{list_count} lists (structured content)")
     
     # 7. Tables (Comparison data)
-    table_count = len(re.findall(r'<table[^>]*>', content, re.I))
+    table_count = len(src.tags('table'))
     if table_count >= 1:
         passed.append(f"{table_count} table(s) (comparison data)")
     
@@ -212,16 +199,73 @@ def check_page(file_path: Path) -> dict:
     score = (len(passed) / total * 100) if total > 0 else 0
     
     return {
-        'file': str(file_path.name),
+        'file': src.name,
         'passed': passed,
         'issues': issues,
         'score': round(score)
     }
 
 
+@register('geo')
+class GEOChecker:
+    """Engine plugin: AI citation readiness score per public page."""
+    EXTENSIONS = {'.html', '.htm', '.jsx', '.tsx'}
+    SKIP_DIRS = SKIP_DIRS
+
+    def __init__(self):
+        self.results = []
+
+    def wants(self, path: str) -> bool:
+        return is_page_file(Path(path))
+
+    def evaluate(self, src: SourceFile) -> dict:
+        return check_page(src)
+
+    def collect(self, result: dict) -> None:
+        self.results.append(result)
+
+    def average_score(self) -> float:
+        return sum(r['score'] for r in self.results) / len(self.results) if self.results else 0
+
+    def passed(self) -> bool:
+        return not self.results or self.average_score() >= 60
+
+    def report(self) -> dict:
+        return {
+            "script": "geo_checker",
+            "pages_checked": len(self.results),
+            "average_score": round(self.average_score()),
+            "passed": self.passed()
+        }
+
+
+def json_report(project_path: str, checker: GEOChecker, stats: dict) -> dict:
+    """The CLI's JSON output for a finished engine run."""
+    if not checker.results and not stats["files_skipped"]:
+        return {"script": "geo_checker", "pages_found": 0, "passed": True}
+    output = {"script": "geo_checker", "project": project_path}
+    output.update(checker.report())
+    if stats["files_skipped"]:
+        output["pages_skipped"] = stats["files_skipped"]
+    return output
+
+
+def run(project_path: str, budget_seconds: float = None, workers: int = None,
+        changed_files: list = None, **opts) -> dict:
+    """Score project_path's public pages (only changed_files, if given); returns the JSON report (no printing)."""
+    project_path = str(Path(project_path).resolve())
+    checker = GEOChecker()
+    stats = run_engine(project_path, [checker], budget_seconds=budget_seconds, workers=workers,
+                       only_files=changed_files)
+    return json_report(project_path, checker, stats)
+
+
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    target_path = Path(target).resolve()
+    parser = argparse.ArgumentParser(description="GEO audit: AI citation readiness of public pages")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    add_run_arguments(parser)
+    args = parser.parse_args()
+    target_path = Path(args.project).resolve()
     
     print("\n" + "=" * 60)
     print("  GEO CHECKER - AI Citation Readiness Audit")
@@ -229,24 +273,22 @@ def main():
     print(f"Project: {target_path}")
     print("-" * 60)
     
-    # Find web pages only
-    pages = find_web_pages(target_path)
+    checker = GEOChecker()
+    stats = run_engine(str(target_path), [checker], budget_seconds=args.budget_seconds, workers=args.workers)
+    results = checker.results
     
-    if not pages:
+    if not results and not stats["files_skipped"]:
         print("\n[!] No public web pages found.")
         print("    Looking for: HTML, JSX, TSX files in pages/app directories")
         print("    Skipping: docs, tests, config files, node_modules")
-        output = {"script": "geo_checker", "pages_found": 0, "passed": True}
+        output = json_report(str(target_path), checker, stats)
+        emit_report(output)
         print("\n" + json.dumps(output, indent=2))
         sys.exit(0)
     
-    print(f"Found {len(pages)} public pages to analyze\n")
-    
-    # Check each page
-    results = []
-    for page in pages:
-        result = check_page(page)
-        results.append(result)
+    print(f"Found {len(results)} public pages to analyze\n")
+    if stats["budget_note"]:
+        print(f"[!] {stats['budget_note']}\n")
     
     # Print results
     for result in results:
@@ -257,7 +299,7 @@ def main():
                 print(f"    - {issue}")
     
     # Average score
-    avg_score = sum(r['score'] for r in results) / len(results) if results else 0
+    avg_score = checker.average_score()
     
     print("\n" + "=" * 60)
     print(f"AVERAGE GEO SCORE: {avg_score:.0f}%")
@@ -273,16 +315,11 @@ def main():
         print("[X] Poor - Content needs GEO optimization")
     
     # JSON output
-    output = {
-        "script": "geo_checker",
-        "project": str(target_path),
-        "pages_checked": len(results),
-        "average_score": round(avg_score),
-        "passed": avg_score >= 60
-    }
+    output = json_report(str(target_path), checker, stats)
+    emit_report(output)
     print("\n" + json.dumps(output, indent=2))
     
-    sys.exit(0 if avg_score >= 60 else 1)
+    sys.exit(0 if output["passed"] else 1)
 
 
 if __name__ == "__main__":
@@ -2,12 +2,34 @@
 """
 i18n Checker - Detects hardcoded strings and missing translations.
 Scans for untranslated text in React, Vue, and Python files.
+
+Every code file is scanned (streamed across worker processes); with
+--budget-seconds the most recently changed files are scanned first. Each
+file is read once: one combined regex gates out files that already use i18n,
+then a single markup pass extracts JSX/Vue text nodes and literal
+user-facing attributes.
+
+Locale bundles are loaded in parallel into sorted flat key lists (bundles
+over STREAM_THRESHOLD_BYTES are parsed incrementally when ijson is
+installed) and compared with a sorted merge that names every missing key.
 """
+import os
 import sys
 import re
 import json
+import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "audit"))
+from discovery import find_files
+from file_stream import FileStream
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -15,82 +37,176 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
-# Patterns that indicate hardcoded strings (should be translated)
-HARDCODED_PATTERNS = {
-    'jsx': [
-        # Text directly in JSX: <div>Hello World</div>
-        r'>\s*[A-Z][a-zA-Z\s]{3,30}\s*</',
-        # JSX attribute strings: title="Welcome"
-        r'(title|placeholder|label|alt|aria-label)="[A-Z][a-zA-Z\s]{2,}"',
-        # Button/heading text
-        r'<(button|h[1-6]|p|span|label)[^>]*>\s*[A-Z][a-zA-Z\s!?.,]{3,}\s*</',
-    ],
-    'vue': [
-        # Vue template text
-        r'>\s*[A-Z][a-zA-Z\s]{3,30}\s*</',
-        r'(placeholder|label|title)="[A-Z][a-zA-Z\s]{2,}"',
-    ],
-    'python': [
-        # print/raise with string literals
-        r'(print|raise\s+\w+)\s*\(\s*["\'][A-Z][^"\']{5,}["\']',
-        # Flask flash messages
-        r'flash\s*\(\s*["\'][A-Z][^"\']{5,}["\']',
-    ]
-}
-
 # Patterns that indicate proper i18n usage
 I18N_PATTERNS = [
-    r't\(["\']',           # t('key') - react-i18next
+    r'(?<![\w$])t\(["\']', # t('key') / i18n.t('key') - react-i18next (not split(' / alert(')
     r'useTranslation',     # React hook
     r'\$t\(',              # Vue i18n
-    r'_\(["\']',           # Python gettext
+    r'(?<![\w$])_\(["\']', # Python gettext
     r'gettext\(',          # Python gettext
     r'useTranslations',    # next-intl
     r'FormattedMessage',   # react-intl
     r'i18n\.',             # Generic i18n
 ]
 
+# One compiled alternation: a file's i18n gate is a single search
+I18N_RE = re.compile('|'.join(f'(?:{p})' for p in I18N_PATTERNS))
+
+# Hardcoded-string detection (files that use i18n are never scanned).
+#
+# JSX / Vue: one tokenizer pass over markup tags. Attribute values may hold
+# quoted strings and nested {...} expressions, so arrow functions in props
+# do not end a tag early; a '<' right after an identifier is a generic
+# (useState<string>), not a tag. The text node is whatever follows a tag up
+# to the next tag; its literal parts (outside {expressions}) must hold a word.
+_BRACED = r'\{(?:[^{}]|\{(?:[^{}]|\{[^{}]*\})*\})*\}'
+MARKUP_RE = re.compile(
+    r'(?<![\w$.)\]])<(?P<close>/)?(?P<name>[A-Za-z][\w.:-]*)'
+    r'(?P<attrs>(?:[^<>{}"\']|"[^"]*"|\'[^\']*\'|' + _BRACED + r')*)>'
+    r'(?P<text>(?:[^<>{};=]|' + _BRACED + r')*)'
+)
+BRACED_RE = re.compile(_BRACED)
+WORD_RE = re.compile(r'[^\W\d_]{2}')
+
+# User-facing attributes with a literal value (bound :title / {expr} values are not literals)
+TEXT_ATTRS = {
+    'jsx': ('title', 'placeholder', 'label', 'alt', 'aria-label'),
+    'vue': ('placeholder', 'label', 'title'),
+}
+ATTR_RES = {
+    kind: re.compile(r'(?<![:@\w-])(' + '|'.join(re.escape(a) for a in attrs) + r')\s*=\s*"([^"]*)"')
+    for kind, attrs in TEXT_ATTRS.items()
+}
+
+# Python: print/raise/flash with a sentence literal, as one alternation
+PYTHON_RE = re.compile(r'(?:print|raise\s+\w+|flash)\s*\(\s*["\']([A-Z][^"\']{5,})["\']')
+
+# Hardcoded examples kept per file
+MAX_FILE_EXAMPLES = 3
+
+LOCALE_PATTERNS = [
+    "**/locales/**/*.json",
+    "**/translations/**/*.json",
+    "**/lang/**/*.json",
+    "**/i18n/**/*.json",
+    "**/messages/*.json",
+    "**/*.po",  # gettext
+]
+
+# Directory/file name fragments excluded from the hardcoded-string scan
+CODE_EXCLUDES = ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec']
+
 def find_locale_files(project_path: Path) -> list:
-    """Find translation/locale files."""
-    patterns = [
-        "**/locales/**/*.json",
-        "**/translations/**/*.json",
-        "**/lang/**/*.json",
-        "**/i18n/**/*.json",
-        "**/messages/*.json",
-        "**/*.po",  # gettext
-    ]
-    
-    files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
-    
-    return [f for f in files if 'node_modules' not in str(f)]
-
-def check_locale_completeness(locale_files: list) -> dict:
+    """Find translation/locale files (one walk for all patterns, node_modules never entered)."""
+    return find_files(project_path, LOCALE_PATTERNS, {'node_modules', '.git'})
+
+# Bundles above this size are parsed as an event stream (needs ijson)
+STREAM_THRESHOLD_BYTES = 1024 * 1024
+
+# Missing/extra keys listed per namespace unless --all-keys is given
+MAX_KEYS_SHOWN = 20
+
+def flatten_keys(d, prefix=''):
+    """Flatten nested dict keys (iterative, so deep bundles cannot hit the recursion limit)."""
+    keys = set()
+    stack = [(prefix, d)]
+    while stack:
+        base, node = stack.pop()
+        for k, v in node.items():
+            new_key = f"{base}.{k}" if base else k
+            if isinstance(v, dict):
+                stack.append((new_key, v))
+            else:
+                keys.add(new_key)
+    return keys
+
+def stream_keys(f) -> set:
+    """Flat keys from a JSON object via ijson events, without building the object."""
+    keys = set()
+    stack = []        # dotted path of each open object
+    pending = None    # path of the key whose value comes next
+    arrays = 0        # depth inside arrays (arrays are leaf values)
+    for _, event, value in ijson.parse(f):
+        if arrays:
+            if event == 'start_array':
+                arrays += 1
+            elif event == 'end_array':
+                arrays -= 1
+            continue
+        if event == 'map_key':
+            pending = f"{stack[-1]}.{value}" if stack and stack[-1] else value
+            continue
+        if event == 'start_map':
+            stack.append(pending or '')
+        elif event == 'end_map':
+            stack.pop()
+        else:
+            if pending is not None:
+                keys.add(pending)
+            if event == 'start_array':
+                arrays = 1
+        pending = None
+    return keys
+
+def load_locale_keys(file_path: Path):
+    """Sorted flat key list of one locale bundle, None if it cannot be parsed."""
+    try:
+        if IJSON_AVAILABLE and os.path.getsize(file_path) > STREAM_THRESHOLD_BYTES:
+            with open(file_path, 'rb') as f:
+                keys = stream_keys(f)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+            keys = flatten_keys(content)
+    except Exception:
+        return None
+    return sorted(keys)
+
+def diff_sorted(base: list, other: list) -> tuple:
+    """(missing from other, extra in other) by merging two sorted key lists."""
+    missing, extra = [], []
+    i = j = 0
+    while i < len(base) and j < len(other):
+        if base[i] == other[j]:
+            i += 1
+            j += 1
+        elif base[i] < other[j]:
+            missing.append(base[i])
+            i += 1
+        else:
+            extra.append(other[j])
+            j += 1
+    missing.extend(base[i:])
+    extra.extend(other[j:])
+    return missing, extra
+
+def _key_lines(keys: list, show_all: bool) -> list:
+    shown = keys if show_all else keys[:MAX_KEYS_SHOWN]
+    lines = [f"   → {k}" for k in shown]
+    if len(keys) > len(shown):
+        lines.append(f"   … and {len(keys) - len(shown)} more (--all-keys to list them)")
+    return lines
+
+def check_locale_completeness(locale_files: list, workers: int = None, show_all_keys: bool = False) -> dict:
     """Check if all locales have the same keys."""
     issues = []
     passed = []
+    missing_keys = {}
     
     if not locale_files:
-        return {'passed': [], 'issues': ["[!] No locale files found"]}
+        return {'passed': [], 'issues': ["[!] No locale files found"], 'missing': missing_keys}
     
-    # Group by parent folder (language)
+    # Group by parent folder (language); bundles are parsed in parallel
     locales = {}
-    for f in locale_files:
-        if f.suffix == '.json':
-            try:
-                lang = f.parent.name
-                content = json.loads(f.read_text(encoding='utf-8'))
-                if lang not in locales:
-                    locales[lang] = {}
-                locales[lang][f.stem] = set(flatten_keys(content))
-            except:
-                continue
+    json_files = [f for f in locale_files if f.suffix == '.json']
+    for f, keys in FileStream(json_files, workers=workers).map(load_locale_keys):
+        if keys is None:
+            continue
+        locales.setdefault(f.parent.name, {})[f.stem] = keys
     
     if len(locales) < 2:
         passed.append(f"[OK] Found {len(locale_files)} locale file(s)")
-        return {'passed': passed, 'issues': issues}
+        return {'passed': passed, 'issues': issues, 'missing': missing_keys}
     
     passed.append(f"[OK] Found {len(locales)} language(s): {', '.join(locales.keys())}")
     
@@ -99,53 +215,80 @@ def check_locale_completeness(locale_files: list) -> dict:
     base_lang = all_langs[0]
     
     for namespace in locales.get(base_lang, {}):
-        base_keys = locales[base_lang].get(namespace, set())
+        base_keys = locales[base_lang].get(namespace, [])
         
         for lang in all_langs[1:]:
-            other_keys = locales.get(lang, {}).get(namespace, set())
+            other_keys = locales.get(lang, {}).get(namespace, [])
+            missing, extra = diff_sorted(base_keys, other_keys)
             
-            missing = base_keys - other_keys
             if missing:
-                issues.append(f"[X] {lang}/{namespace}: Missing {len(missing)} keys")
+                missing_keys[f"{lang}/{namespace}"] = missing
+                issues.append(f"[X] {lang}/{namespace}: Missing {len(missing)} keys (present in {base_lang})")
+                issues.extend(_key_lines(missing, show_all_keys))
             
-            extra = other_keys - base_keys
             if extra:
                 issues.append(f"[!] {lang}/{namespace}: {len(extra)} extra keys")
+                issues.extend(_key_lines(extra, show_all_keys))
     
     if not issues:
         passed.append("[OK] All locales have matching keys")
     
-    return {'passed': passed, 'issues': issues}
+    return {'passed': passed, 'issues': issues, 'missing': missing_keys}
 
-def flatten_keys(d, prefix=''):
-    """Flatten nested dict keys."""
-    keys = set()
-    for k, v in d.items():
-        new_key = f"{prefix}.{k}" if prefix else k
-        if isinstance(v, dict):
-            keys.update(flatten_keys(v, new_key))
-        else:
-            keys.add(new_key)
-    return keys
+CODE_EXTENSIONS = {
+    '.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'jsx', '.js': 'jsx',
+    '.vue': 'vue',
+    '.py': 'python'
+}
+
+def jsx_text_candidates(content: str, kind: str = 'jsx'):
+    """Hardcoded JSX/Vue text nodes and literal user-facing attributes, in source order."""
+    attr_re = ATTR_RES[kind]
+    for m in MARKUP_RE.finditer(content):
+        attrs = m.group('attrs')
+        if '="' in attrs:
+            for am in attr_re.finditer(attrs):
+                if WORD_RE.search(am.group(2)):
+                    yield f'{am.group(1)}="{am.group(2)}"'
+        text = m.group('text')
+        # A text node runs up to the next tag; stopping anywhere else means code
+        if text and content[m.end():m.end() + 1] == '<':
+            literal = BRACED_RE.sub(' ', text)
+            if WORD_RE.search(literal):
+                yield ' '.join(text.split())
+
+def scan_code_file(file_path: Path) -> tuple:
+    """(uses i18n, first hardcoded strings) for one code file, in a single pass."""
+    try:
+        content = file_path.read_text(encoding='utf-8', errors='ignore')
+    except Exception:
+        return False, []
+
+    # Files that already use i18n are gated out before any string scanning
+    if I18N_RE.search(content):
+        return True, []
+
+    file_type = CODE_EXTENSIONS.get(file_path.suffix, 'jsx')
+    if file_type == 'python':
+        candidates = (m.group(1) for m in PYTHON_RE.finditer(content))
+    else:
+        candidates = jsx_text_candidates(content, file_type)
+
+    found = []
+    for text in candidates:
+        found.append(text)
+        if len(found) >= MAX_FILE_EXAMPLES:
+            break
+    return False, found
 
-def check_hardcoded_strings(project_path: Path) -> dict:
+def check_hardcoded_strings(project_path: Path, budget_seconds: float = None, workers: int = None) -> dict:
     """Check for hardcoded strings in code files."""
     issues = []
     passed = []
     
     # Find code files
-    extensions = {
-        '.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'jsx', '.js': 'jsx',
-        '.vue': 'vue',
-        '.py': 'python'
-    }
-    
-    code_files = []
-    for ext in extensions:
-        code_files.extend(project_path.rglob(f"*{ext}"))
-    
-    code_files = [f for f in code_files if not any(x in str(f) for x in 
-                  ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec'])]
+    code_files = find_files(project_path, [f"**/*{ext}" for ext in CODE_EXTENSIONS],
+                            skip_name=lambda name: any(x in name for x in CODE_EXCLUDES))
     
     if not code_files:
         return {'passed': ["[!] No code files found"], 'issues': []}
@@ -154,35 +297,19 @@ def check_hardcoded_strings(project_path: Path) -> dict:
     files_with_hardcoded = 0
     hardcoded_examples = []
     
-    for file_path in code_files[:50]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            ext = file_path.suffix
-            file_type = extensions.get(ext, 'jsx')
-            
-            # Check for i18n usage
-            has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
-            if has_i18n:
-                files_with_i18n += 1
-            
-            # Check for hardcoded strings
-            patterns = HARDCODED_PATTERNS.get(file_type, [])
-            hardcoded_found = False
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                if matches and not has_i18n:
-                    hardcoded_found = True
-                    if len(hardcoded_examples) < 5:
-                        hardcoded_examples.append(f"{file_path.name}: {str(matches[0])[:40]}...")
-            
-            if hardcoded_found:
-                files_with_hardcoded += 1
-                
-        except:
-            continue
+    stream = FileStream(code_files, budget_seconds, workers)
+    for file_path, (has_i18n, found) in stream.map(scan_code_file):
+        if has_i18n:
+            files_with_i18n += 1
+        if found:
+            files_with_hardcoded += 1
+            for match in found:
+                if len(hardcoded_examples) < 5:
+                    hardcoded_examples.append(f"{file_path.name}: {match[:40]}")
     
-    passed.append(f"[OK] Analyzed {len(code_files)} code files")
+    passed.append(f"[OK] Analyzed {stream.checked} code files")
+    if stream.budget_note():
+        passed.append(f"[!] {stream.budget_note()}")
     
     if files_with_i18n > 0:
         passed.append(f"[OK] {files_with_i18n} files use i18n")
@@ -196,20 +323,39 @@ def check_hardcoded_strings(project_path: Path) -> dict:
     
     return {'passed': passed, 'issues': issues}
 
+def run(project_path: str, budget_seconds: float = None, workers: int = None,
+        all_keys: bool = False, **opts) -> dict:
+    """Locale completeness and hardcoded-string results as one report (no printing)."""
+    project_path = Path(project_path)
+    locale_result = check_locale_completeness(find_locale_files(project_path), workers, all_keys)
+    code_result = check_hardcoded_strings(project_path, budget_seconds, workers)
+    critical_issues = sum(1 for i in locale_result['issues'] + code_result['issues'] if i.startswith("[X]"))
+    return {
+        "script": "i18n_checker",
+        "project": str(project_path),
+        "locales": locale_result,
+        "code": code_result,
+        "critical_issues": critical_issues,
+        "passed": critical_issues == 0
+    }
+
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    project_path = Path(target)
+    parser = argparse.ArgumentParser(description="i18n audit: locale completeness and hardcoded strings")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--budget-seconds", type=float, default=None,
+                        help="Stop scanning code after this long, most recently changed files first")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: all cores, 1 = in-process)")
+    parser.add_argument("--all-keys", action="store_true",
+                        help=f"List every missing/extra locale key (default: first {MAX_KEYS_SHOWN} per namespace)")
+    args = parser.parse_args()
     
     print("\n" + "=" * 60)
     print("  i18n CHECKER - Internationalization Audit")
     print("=" * 60 + "\n")
     
-    # Check locale files
-    locale_files = find_locale_files(project_path)
-    locale_result = check_locale_completeness(locale_files)
-    
-    # Check hardcoded strings
-    code_result = check_hardcoded_strings(project_path)
+    output = run(args.project, args.budget_seconds, args.workers, args.all_keys)
+    locale_result, code_result = output['locales'], output['code']
     
     # Print results
     print("[LOCALE FILES]")
@@ -227,7 +373,7 @@ def main():
         print(f"  {item}")
     
     # Summary
-    critical_issues = sum(1 for i in locale_result['issues'] + code_result['issues'] if i.startswith("[X]"))
+    critical_issues = output['critical_issues']
     
     print("\n" + "=" * 60)
     if critical_issues == 0:
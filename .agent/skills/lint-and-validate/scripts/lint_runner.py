@@ -7,22 +7,77 @@ Usage:
     python lint_runner.py <project_path>
 
 Supports:
-    - Node.js: npm run lint, npx tsc --noEmit
+    - Node.js: npm run lint / eslint --cache, tsc --noEmit --incremental
     - Python: ruff check, mypy
+
+The detected linters run concurrently. Tools installed in node_modules/.bin
+are called directly (no npx resolution), and their state is kept under
+<project>/.agent-cache/lint/ (tsc's .tsbuildinfo, ESLint's cache), so a
+re-run only re-checks what changed. Each linter's full output goes to
+<name>.log in the same directory; the report carries the parsed
+diagnostics and the tail of the output.
+
+A result only describes the project when every linter actually ran from
+the project's own install: if one was missing, or resolved through npx
+(network, unpinned version), the report is marked "cacheable": false so
+the orchestrators' run cache never replays it.
 """
 
-import subprocess
+import re
+import os
 import sys
 import json
+import time
+import subprocess
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "audit"))
+from audit_pool import CACHE_DIR_NAME
 
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
-except:
+except AttributeError:
     pass
 
+LINT_DIR = "lint"
+TIMEOUT_SECONDS = 300
+# Exit status of a shell (npm run lint) whose command was not found
+COMMAND_NOT_FOUND = 127
+OUTPUT_TAIL_CHARS = 2000
+MAX_DIAGNOSTICS = 200
+
+# path(line,col): error TS2322: message
+TSC_RE = re.compile(r'^(?P<file>[^\s(][^(]*)\((?P<line>\d+),(?P<column>\d+)\): '
+                    r'(?P<severity>error|warning) (?P<code>TS\d+): (?P<message>.*)$')
+# path:line:col: CODE [*] message (the [*] marks auto-fixable rules)
+RUFF_RE = re.compile(r'^(?P<file>[^\s:][^:]*):(?P<line>\d+):(?P<column>\d+): (?P<code>[A-Z]+\d+) (?:\[\*\] )?(?P<message>.*)$')
+# path:line[:col]: error: message  [code]
+MYPY_RE = re.compile(r'^(?P<file>[^\s:][^:]*):(?P<line>\d+):(?:(?P<column>\d+):)? (?P<severity>error|warning|note): '
+                     r'(?P<message>.*?)(?:  \[(?P<code>[\w-]+)\])?$')
+# ESLint "stylish": a file path line, then "  line:col  error  message  rule" per problem
+ESLINT_RE = re.compile(r'^\s+(?P<line>\d+):(?P<column>\d+)\s+(?P<severity>error|warning)\s+'
+                       r'(?P<message>.+?)(?:\s{2,}(?P<code>[\w@/-]+))?\s*$')
+
+
+def lint_cache_dir(project_path: Path) -> Path:
+    return project_path / CACHE_DIR_NAME / LINT_DIR
+
+
+def node_tool(project_path: Path, tool: str) -> list:
+    """The project's own binary when installed, else npx (which resolves it on every call)."""
+    bin_dir = project_path / "node_modules" / ".bin"
+    for name in (tool, f"{tool}.cmd"):
+        if (bin_dir / name).exists():
+            return [str(bin_dir / name)]
+    return ["npx", tool]
+
+
+def eslint_cache_args(cache_dir: Path) -> list:
+    return ["--cache", "--cache-location", str(cache_dir / "eslintcache"), "--cache-strategy", "content"]
+
 
 def detect_project_type(project_path: Path) -> dict:
     """Detect project type and available linters."""
@@ -30,7 +85,8 @@ def detect_project_type(project_path: Path) -> dict:
         "type": "unknown",
         "linters": []
     }
-    
+    cache_dir = lint_cache_dir(project_path)
+
     # Node.js project
     package_json = project_path / "package.json"
     if package_json.exists():
@@ -39,86 +95,158 @@ def detect_project_type(project_path: Path) -> dict:
             pkg = json.loads(package_json.read_text(encoding='utf-8'))
             scripts = pkg.get("scripts", {})
             deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
-            
-            # Check for lint script
+
+            # Check for lint script; a plain eslint call gets the managed cache appended
             if "lint" in scripts:
-                result["linters"].append({"name": "npm lint", "cmd": ["npm", "run", "lint"]})
+                cmd = ["npm", "run", "lint"]
+                lint_script = scripts["lint"].split()
+                if lint_script[:1] == ["eslint"] and "--cache" not in lint_script:
+                    cmd += ["--"] + eslint_cache_args(cache_dir)
+                result["linters"].append({"name": "npm lint", "cmd": cmd, "parser": "eslint"})
             elif "eslint" in deps:
-                result["linters"].append({"name": "eslint", "cmd": ["npx", "eslint", "."]})
-            
+                cmd = node_tool(project_path, "eslint") + ["."] + eslint_cache_args(cache_dir)
+                result["linters"].append({"name": "eslint", "cmd": cmd, "parser": "eslint"})
+
             # Check for TypeScript
             if "typescript" in deps or (project_path / "tsconfig.json").exists():
-                result["linters"].append({"name": "tsc", "cmd": ["npx", "tsc", "--noEmit"]})
-                
-        except:
+                cmd = node_tool(project_path, "tsc") + [
+                    "--noEmit", "--incremental",
+                    "--tsBuildInfoFile", str(cache_dir / "tsconfig.tsbuildinfo"),
+                    "--pretty", "false",
+                ]
+                result["linters"].append({"name": "tsc", "cmd": cmd, "parser": "tsc"})
+
+        except (OSError, ValueError, AttributeError):
             pass
-    
+
     # Python project
     if (project_path / "pyproject.toml").exists() or (project_path / "requirements.txt").exists():
         result["type"] = "python"
-        
+
         # Check for ruff
-        result["linters"].append({"name": "ruff", "cmd": ["ruff", "check", "."]})
-        
+        result["linters"].append({"name": "ruff", "cmd": ["ruff", "check", "."], "parser": "ruff"})
+
         # Check for mypy
         if (project_path / "mypy.ini").exists() or (project_path / "pyproject.toml").exists():
-            result["linters"].append({"name": "mypy", "cmd": ["mypy", "."]})
-    
+            result["linters"].append({"name": "mypy", "cmd": ["mypy", "."], "parser": "mypy"})
+
     return result
 
 
-def run_linter(linter: dict, cwd: Path) -> dict:
-    """Run a single linter and return results."""
+def _relative(path: str, cwd: Path) -> str:
+    if os.path.isabs(path):
+        try:
+            return Path(path).relative_to(cwd).as_posix()
+        except ValueError:
+            pass
+    return path.replace(os.sep, '/')
+
+
+def parse_diagnostics(lines, parser: str, linter: str, cwd: Path):
+    """Yield one dict per problem found in a linter's output."""
+    current_file = None
+    for raw in lines:
+        line = raw.rstrip('\n')
+        if parser == "eslint":
+            match = ESLINT_RE.match(line)
+            if not match:
+                if line and not line[0].isspace() and not line.startswith(('✖', '>', '✔')):
+                    current_file = line.strip()
+                continue
+            if current_file is None:
+                continue
+            fields = dict(match.groupdict(), file=current_file)
+        else:
+            pattern = {"tsc": TSC_RE, "ruff": RUFF_RE, "mypy": MYPY_RE}.get(parser)
+            match = pattern.match(line) if pattern else None
+            if not match:
+                continue
+            fields = match.groupdict()
+        yield {
+            "linter": linter,
+            "file": _relative(fields["file"].strip(), cwd),
+            "line": int(fields["line"]),
+            "column": int(fields["column"]) if fields.get("column") else None,
+            "severity": fields.get("severity") or "error",
+            "code": fields.get("code"),
+            "message": fields["message"].strip(),
+        }
+
+
+def _tail(path: Path, chars: int) -> str:
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - chars * 4))
+        return f.read().decode('utf-8', errors='replace')[-chars:]
+
+
+def run_linter(linter: dict, cwd: Path, log_dir: Path = None) -> dict:
+    """Run a single linter, its output streamed to <log_dir>/<name>.log, and return results."""
+    log_dir = log_dir or lint_cache_dir(cwd)
+    log_path = log_dir / (re.sub(r'[^\w.-]+', '_', linter["name"]) + ".log")
     result = {
         "name": linter["name"],
         "passed": False,
         "output": "",
-        "error": ""
+        "error": "",
+        "log": str(log_path),
+        "duration": 0.0,
+        "diagnostics": [],
+        "diagnostic_count": 0,
+        "tool_missing": False,
+        "via_npx": linter["cmd"][0] == "npx"
     }
-    
+
+    start = time.monotonic()
     try:
-        proc = subprocess.run(
-            linter["cmd"],
-            cwd=str(cwd),
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            timeout=120
-        )
-        
-        result["output"] = proc.stdout[:2000] if proc.stdout else ""
-        result["error"] = proc.stderr[:500] if proc.stderr else ""
+        log_dir.mkdir(parents=True, exist_ok=True)
+        with open(log_path, 'wb') as log:
+            proc = subprocess.run(
+                linter["cmd"],
+                cwd=str(cwd),
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                timeout=TIMEOUT_SECONDS
+            )
         result["passed"] = proc.returncode == 0
-        
+        result["tool_missing"] = proc.returncode == COMMAND_NOT_FOUND
+
     except FileNotFoundError:
         result["error"] = f"Command not found: {linter['cmd'][0]}"
+        result["tool_missing"] = True
     except subprocess.TimeoutExpired:
-        result["error"] = "Timeout after 120s"
+        result["error"] = f"Timeout after {TIMEOUT_SECONDS}s"
     except Exception as e:
         result["error"] = str(e)
-    
+    result["duration"] = round(time.monotonic() - start, 2)
+
+    if log_path.exists():
+        result["output"] = _tail(log_path, OUTPUT_TAIL_CHARS)
+        with open(log_path, encoding='utf-8', errors='replace') as f:
+            for diagnostic in parse_diagnostics(f, linter.get("parser"), linter["name"], cwd):
+                if result["diagnostic_count"] < MAX_DIAGNOSTICS:
+                    result["diagnostics"].append(diagnostic)
+                result["diagnostic_count"] += 1
+
+    if not result["passed"] and not result["error"]:
+        if result["diagnostic_count"]:
+            first = result["diagnostics"][0]
+            result["error"] = (f"{result['diagnostic_count']} problem(s); first: "
+                               f"{first['file']}:{first['line']} {first['message']}")
+        else:
+            result["error"] = result["output"][-500:]
+
     return result
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    
-    print(f"\n{'='*60}")
-    print(f"[LINT RUNNER] Unified Linting")
-    print(f"{'='*60}")
-    print(f"Project: {project_path}")
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # Detect project type
+def run(project_path: str, **opts) -> dict:
+    """Run every detected linter concurrently; returns the JSON report (no printing)."""
+    project_path = Path(project_path).resolve()
     project_info = detect_project_type(project_path)
-    print(f"Type: {project_info['type']}")
-    print(f"Linters: {len(project_info['linters'])}")
-    print("-"*60)
-    
+
     if not project_info["linters"]:
-        print("No linters found for this project type.")
-        output = {
+        return {
             "script": "lint_runner",
             "project": str(project_path),
             "type": project_info["type"],
@@ -126,46 +254,70 @@ def main():
             "passed": True,
             "message": "No linters configured"
         }
+
+    linters = project_info["linters"]
+    with ThreadPoolExecutor(max_workers=len(linters)) as pool:
+        results = list(pool.map(lambda linter: run_linter(linter, project_path), linters))
+
+    return {
+        "script": "lint_runner",
+        "project": str(project_path),
+        "type": project_info["type"],
+        "checks": results,
+        "passed": all(r["passed"] for r in results),
+        # Missing tools and npx-resolved ones depend on the environment, not on the project's files
+        "cacheable": not any(r["tool_missing"] or r["via_npx"] for r in results)
+    }
+
+
+def main():
+    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+
+    print(f"\n{'='*60}")
+    print(f"[LINT RUNNER] Unified Linting")
+    print(f"{'='*60}")
+    print(f"Project: {project_path}")
+    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    output = run(str(project_path))
+    results = output["checks"]
+    print(f"Type: {output['type']}")
+    print(f"Linters: {len(results)}")
+    print("-"*60)
+
+    if not results:
+        print("No linters found for this project type.")
         print(json.dumps(output, indent=2))
         sys.exit(0)
-    
-    # Run each linter
-    results = []
-    all_passed = True
-    
-    for linter in project_info["linters"]:
-        print(f"\nRunning: {linter['name']}...")
-        result = run_linter(linter, project_path)
-        results.append(result)
-        
+
+    for result in results:
+        print(f"\nRan: {result['name']} ({result['duration']:.1f}s)")
         if result["passed"]:
-            print(f"  [PASS] {linter['name']}")
+            print(f"  [PASS] {result['name']}")
         else:
-            print(f"  [FAIL] {linter['name']}")
-            if result["error"]:
+            print(f"  [FAIL] {result['name']}")
+            for d in result["diagnostics"][:10]:
+                column = f":{d['column']}" if d["column"] else ""
+                code = f" [{d['code']}]" if d["code"] else ""
+                print(f"    {d['file']}:{d['line']}{column} {d['severity']}: {d['message']}{code}")
+            if result["diagnostic_count"] > 10:
+                print(f"    ... and {result['diagnostic_count'] - 10} more")
+            if result["error"] and not result["diagnostic_count"]:
                 print(f"  Error: {result['error'][:200]}")
-            all_passed = False
-    
+        print(f"  Log: {result['log']}")
+
     # Summary
     print("\n" + "="*60)
     print("SUMMARY")
     print("="*60)
-    
+
     for r in results:
         icon = "[PASS]" if r["passed"] else "[FAIL]"
-        print(f"{icon} {r['name']}")
-    
-    output = {
-        "script": "lint_runner",
-        "project": str(project_path),
-        "type": project_info["type"],
-        "checks": results,
-        "passed": all_passed
-    }
-    
+        print(f"{icon} {r['name']} ({r['diagnostic_count']} problem(s))")
+
     print("\n" + json.dumps(output, indent=2))
-    
-    sys.exit(0 if all_passed else 1)
+
+    sys.exit(0 if output["passed"] else 1)
 
 
 if __name__ == "__main__":
@@ -2,12 +2,21 @@
 """
 Type Coverage Checker - Measures TypeScript/Python type coverage.
 Identifies untyped functions, any usage, and type safety issues.
+
+Every source file is analyzed (streamed across worker processes); with
+--budget-seconds the most recently changed files are analyzed first.
 """
 import sys
 import re
+import time
+import argparse
 import subprocess
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "audit"))
+from discovery import find_files
+from file_stream import FileStream
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -15,40 +24,57 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
-def check_typescript_coverage(project_path: Path) -> dict:
+ANY_TS_RE = re.compile(r':\s*any\b')
+UNTYPED_FUNCTION_RE = re.compile(r'function\s+\w+\s*\([^)]*\)\s*{')
+UNTYPED_ARROW_RE = re.compile(r'=\s*\([^:)]*\)\s*=>')
+TYPED_FUNCTION_RE = re.compile(r'function\s+\w+\s*\([^)]*\)\s*:\s*\w+')
+TYPED_ARROW_RE = re.compile(r':\s*\([^)]*\)\s*=>\s*\w+')
+
+ANY_PY_RE = re.compile(r':\s*Any\b')
+TYPED_PARAMS_RE = re.compile(r'def\s+\w+\s*\([^)]*:[^)]+\)')
+TYPED_RETURN_RE = re.compile(r'def\s+\w+\s*\([^)]*\)\s*->')
+DEF_RE = re.compile(r'def\s+\w+\s*\(')
+
+
+def typescript_file_stats(file_path: Path) -> dict:
+    """'any' and typed/untyped function counts for one TypeScript file."""
+    stats = {'any_count': 0, 'untyped_functions': 0, 'total_functions': 0}
+    try:
+        content = file_path.read_text(encoding='utf-8', errors='ignore')
+    except Exception:
+        return stats
+
+    # Count 'any' usage
+    stats['any_count'] = len(ANY_TS_RE.findall(content))
+
+    # Find functions without return types
+    # function name(params) { - no return type
+    untyped = len(UNTYPED_FUNCTION_RE.findall(content))
+    # Arrow functions without types: const fn = (x) => or (x) =>
+    untyped += len(UNTYPED_ARROW_RE.findall(content))
+    stats['untyped_functions'] = untyped
+
+    # Count typed functions
+    typed = len(TYPED_FUNCTION_RE.findall(content)) + len(TYPED_ARROW_RE.findall(content))
+    stats['total_functions'] = typed + untyped
+    return stats
+
+def check_typescript_coverage(project_path: Path, budget_seconds: float = None, workers: int = None) -> dict:
     """Check TypeScript type coverage."""
     issues = []
     passed = []
     stats = {'any_count': 0, 'untyped_functions': 0, 'total_functions': 0}
     
-    ts_files = list(project_path.rglob("*.ts")) + list(project_path.rglob("*.tsx"))
-    ts_files = [f for f in ts_files if 'node_modules' not in str(f) and '.d.ts' not in str(f)]
+    ts_files = find_files(project_path, ["**/*.ts", "**/*.tsx"], {'node_modules'})
+    ts_files = [f for f in ts_files if not f.name.endswith('.d.ts')]
     
     if not ts_files:
         return {'type': 'typescript', 'files': 0, 'passed': [], 'issues': ["[!] No TypeScript files found"], 'stats': stats}
     
-    for file_path in ts_files[:30]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count 'any' usage
-            any_matches = re.findall(r':\s*any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions without return types
-            # function name(params) { - no return type
-            untyped = re.findall(r'function\s+\w+\s*\([^)]*\)\s*{', content)
-            # Arrow functions without types: const fn = (x) => or (x) =>
-            untyped += re.findall(r'=\s*\([^:)]*\)\s*=>', content)
-            stats['untyped_functions'] += len(untyped)
-            
-            # Count typed functions
-            typed = re.findall(r'function\s+\w+\s*\([^)]*\)\s*:\s*\w+', content)
-            typed += re.findall(r':\s*\([^)]*\)\s*=>\s*\w+', content)
-            stats['total_functions'] += len(typed) + len(untyped)
-            
-        except Exception:
-            continue
+    stream = FileStream(ts_files, budget_seconds, workers)
+    for _, file_stats in stream.map(typescript_file_stats):
+        for key, value in file_stats.items():
+            stats[key] += value
     
     # Analyze results
     if stats['any_count'] == 0:
@@ -67,41 +93,47 @@ def check_typescript_coverage(project_path: Path) -> dict:
         else:
             issues.append(f"[X] Type coverage: {typed_ratio:.0f}% (too low)")
     
-    passed.append(f"[OK] Analyzed {len(ts_files)} TypeScript files")
+    passed.append(f"[OK] Analyzed {stream.checked} TypeScript files")
+    if stream.budget_note():
+        issues.append(f"[!] {stream.budget_note()}")
     
     return {'type': 'typescript', 'files': len(ts_files), 'passed': passed, 'issues': issues, 'stats': stats}
 
-def check_python_coverage(project_path: Path) -> dict:
+def python_file_stats(file_path: Path) -> dict:
+    """'Any' and typed/untyped function counts for one Python file."""
+    stats = {'untyped_functions': 0, 'typed_functions': 0, 'any_count': 0}
+    try:
+        content = file_path.read_text(encoding='utf-8', errors='ignore')
+    except Exception:
+        return stats
+
+    # Count Any usage
+    stats['any_count'] = len(ANY_PY_RE.findall(content))
+
+    # Find functions with type hints
+    typed_funcs = len(TYPED_PARAMS_RE.findall(content)) + len(TYPED_RETURN_RE.findall(content))
+    stats['typed_functions'] = typed_funcs
+
+    # Find functions without type hints
+    stats['untyped_functions'] = len(DEF_RE.findall(content)) - typed_funcs
+    return stats
+
+def check_python_coverage(project_path: Path, budget_seconds: float = None, workers: int = None) -> dict:
     """Check Python type hints coverage."""
     issues = []
     passed = []
     stats = {'untyped_functions': 0, 'typed_functions': 0, 'any_count': 0}
     
-    py_files = list(project_path.rglob("*.py"))
-    py_files = [f for f in py_files if not any(x in str(f) for x in ['venv', '__pycache__', '.git', 'node_modules'])]
+    py_files = find_files(project_path, ["**/*.py"],
+                          skip_name=lambda name: any(x in name for x in ['venv', '__pycache__', '.git', 'node_modules']))
     
     if not py_files:
         return {'type': 'python', 'files': 0, 'passed': [], 'issues': ["[!] No Python files found"], 'stats': stats}
     
-    for file_path in py_files[:30]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count Any usage
-            any_matches = re.findall(r':\s*Any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions with type hints
-            typed_funcs = re.findall(r'def\s+\w+\s*\([^)]*:[^)]+\)', content)
-            typed_funcs += re.findall(r'def\s+\w+\s*\([^)]*\)\s*->', content)
-            stats['typed_functions'] += len(typed_funcs)
-            
-            # Find functions without type hints
-            all_funcs = re.findall(r'def\s+\w+\s*\(', content)
-            stats['untyped_functions'] += len(all_funcs) - len(typed_funcs)
-            
-        except Exception:
-            continue
+    stream = FileStream(py_files, budget_seconds, workers)
+    for _, file_stats in stream.map(python_file_stats):
+        for key, value in file_stats.items():
+            stats[key] += value
     
     total = stats['typed_functions'] + stats['untyped_functions']
     
@@ -121,36 +153,64 @@ def check_python_coverage(project_path: Path) -> dict:
     else:
         issues.append(f"[X] {stats['any_count']} 'Any' types found")
     
-    passed.append(f"[OK] Analyzed {len(py_files)} Python files")
+    passed.append(f"[OK] Analyzed {stream.checked} Python files")
+    if stream.budget_note():
+        issues.append(f"[!] {stream.budget_note()}")
     
     return {'type': 'python', 'files': len(py_files), 'passed': passed, 'issues': issues, 'stats': stats}
 
-def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    project_path = Path(target)
-    
-    print("\n" + "=" * 60)
-    print("  TYPE COVERAGE CHECKER")
-    print("=" * 60 + "\n")
+def run(project_path: str, budget_seconds: float = None, workers: int = None, **opts) -> dict:
+    """TypeScript and Python coverage for project_path as one report (no printing)."""
+    project_path = Path(project_path)
+    started = time.monotonic()
+
+    def remaining():
+        if budget_seconds is None:
+            return None
+        return max(0.0, budget_seconds - (time.monotonic() - started))
     
     results = []
     
     # Check TypeScript
-    ts_result = check_typescript_coverage(project_path)
+    ts_result = check_typescript_coverage(project_path, remaining(), workers)
     if ts_result['files'] > 0:
         results.append(ts_result)
     
     # Check Python
-    py_result = check_python_coverage(project_path)
+    py_result = check_python_coverage(project_path, remaining(), workers)
     if py_result['files'] > 0:
         results.append(py_result)
     
+    critical_issues = sum(1 for r in results for item in r['issues'] if item.startswith("[X]"))
+    return {
+        "script": "type_coverage",
+        "project": str(project_path),
+        "results": results,
+        "critical_issues": critical_issues,
+        "passed": critical_issues == 0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="TypeScript / Python type coverage")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--budget-seconds", type=float, default=None,
+                        help="Stop after this long, analyzing the most recently changed files first")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: all cores, 1 = in-process)")
+    args = parser.parse_args()
+    
+    print("\n" + "=" * 60)
+    print("  TYPE COVERAGE CHECKER")
+    print("=" * 60 + "\n")
+    
+    output = run(args.project, args.budget_seconds, args.workers)
+    results = output["results"]
+    
     if not results:
         print("[!] No TypeScript or Python files found.")
         sys.exit(0)
     
     # Print results
-    critical_issues = 0
     for result in results:
         print(f"\n[{result['type'].upper()}]")
         print("-" * 40)
@@ -158,9 +218,8 @@ def main():
             print(f"  {item}")
         for item in result['issues']:
             print(f"  {item}")
-            if item.startswith("[X]"):
-                critical_issues += 1
     
+    critical_issues = output["critical_issues"]
     print("\n" + "=" * 60)
     if critical_issues == 0:
         print("[OK] TYPE COVERAGE: ACCEPTABLE")
@@ -63,74 +63,176 @@ Analyzes React Native / Flutter code for compliance with:
    - API Response Caching
 
 Total: 50+ mobile-specific checks
+
+Files are only read in full when their project manifest (package.json /
+pubspec.yaml) allows a mobile framework and their import header mentions one.
 """
 
 import sys
 import os
 import re
 import json
+import argparse
+import functools
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "audit"))
+from audit_pool import (CACHE_DIR_NAME, DEFAULT_CHUNK_SIZE, collect_files, evaluate_source,
+                        merge_results, open_cache, run_pool)
+from findings import DEFAULT_KEEP_PER_RULE, ERROR, WARNING, FindingCollector
+from frontend_engine import SourceFile, register
+from result_channel import emit_report
+
+# ============================================================================
+#  FRAMEWORK DETECTION
+# ============================================================================
+
+# Framework markers live in the import header; only this much is read to decide
+SNIFF_BYTES = 8192
+FRAMEWORK_RE = re.compile(r"react-native|@react-navigation|React\.Native|import 'package:flutter|MaterialApp|Widget\.build")
+FLUTTER_RE = re.compile(r"import 'package:flutter|MaterialApp|Widget\.build")
+
+MOBILE_PACKAGES = {'react-native', 'expo'}
+MOBILE_PACKAGE_PREFIXES = ('react-native-', '@react-native', '@react-navigation/', 'expo-')
+FLUTTER_PUBSPEC_RE = re.compile(r'^\s*(?:flutter:|sdk:\s*flutter\b)', re.MULTILINE)
+
+
+def _manifest_framework(directory: Path):
+    """
+    Framework declared by a manifest in this directory:
+    'react-native' / 'flutter' / 'none', or None when there is no manifest.
+    """
+    pubspec = directory / 'pubspec.yaml'
+    if pubspec.is_file():
+        try:
+            text = pubspec.read_text(encoding='utf-8', errors='replace')
+        except OSError:
+            return None
+        return 'flutter' if FLUTTER_PUBSPEC_RE.search(text) else 'none'
+
+    package_json = directory / 'package.json'
+    if package_json.is_file():
+        try:
+            data = json.loads(package_json.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        deps = set()
+        for section in ('dependencies', 'devDependencies', 'peerDependencies'):
+            deps.update((data.get(section) or {}).keys())
+        if deps & MOBILE_PACKAGES or any(d.startswith(MOBILE_PACKAGE_PREFIXES) for d in deps):
+            return 'react-native'
+        return 'none'
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def project_framework(directory: str):
+    """Framework of the nearest enclosing project (cached per directory), None if unknown."""
+    path = Path(directory)
+    found = _manifest_framework(path)
+    if found is not None or path.parent == path:
+        return found
+    return project_framework(str(path.parent))
+
+
+def read_if_mobile(filepath: str):
+    """
+    Full file content when it looks like React Native / Flutter code, else None.
+    Files in a project whose manifest declares neither are not opened at all;
+    otherwise only the first SNIFF_BYTES are read unless a marker is found.
+    """
+    if project_framework(os.path.dirname(os.path.abspath(filepath))) == 'none':
+        return None
+    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+        head = f.read(SNIFF_BYTES)
+        if not FRAMEWORK_RE.search(head):
+            return None
+        return head + f.read()
+
+
+@register('mobile')
 class MobileAuditor:
-    def __init__(self):
-        self.issues = []
-        self.warnings = []
+    def __init__(self, keep_per_rule: int = DEFAULT_KEEP_PER_RULE, findings_stream=None):
+        self.findings = FindingCollector('mobile', keep_per_rule, findings_stream)
+        self.issues = self.findings.channel(ERROR)
+        self.warnings = self.findings.channel(WARNING)
         self.passed_count = 0
         self.files_checked = 0
 
     def audit_file(self, filepath: str) -> None:
+        self.findings.begin_file(filepath)
+        if not self.wants(filepath):
+            return  # non-mobile project: neither read nor counted, as in the engine
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            content = read_if_mobile(filepath)
         except:
             return
 
         self.files_checked += 1
+        if content is None:
+            return  # Skip non-mobile files
+        self.audit_text(filepath, content)
+
+    @staticmethod
+    def cache_context(path: str) -> str:
+        """The manifest framework gate: a cached result is only valid for the same one."""
+        return str(project_framework(os.path.dirname(os.path.abspath(path))))
+
+    def wants(self, path: str) -> bool:
+        """Engine filter: files of a non-mobile project are never read."""
+        return project_framework(os.path.dirname(os.path.abspath(path))) != 'none'
+
+    def check(self, src: SourceFile) -> None:
+        """Audit a file that has already been read (engine evaluate step)."""
+        self.files_checked += 1
+        if FRAMEWORK_RE.search(src.text[:SNIFF_BYTES]):
+            self.audit_text(src.path, src.text)
+
+    def audit_text(self, filepath: str, content: str) -> None:
+        self.findings.begin_file(filepath, content)
+
         filename = os.path.basename(filepath)
 
         # Detect framework
         is_react_native = bool(re.search(r'react-native|@react-navigation|React\.Native', content))
-        is_flutter = bool(re.search(r'import \'package:flutter|MaterialApp|Widget\.build', content))
-
-        if not (is_react_native or is_flutter):
-            return  # Skip non-mobile files
+        is_flutter = bool(FLUTTER_RE.search(content))
 
         # --- 1. TOUCH PSYCHOLOGY CHECKS ---
 
         # 1.1 Touch Target Size Check
         # Look for small touch targets
-        small_sizes = re.findall(r'(?:width|height|size):\s*([0-3]\d)', content)
-        for size in small_sizes:
+        for m in re.finditer(r'(?:width|height|size):\s*([0-3]\d)', content):
+            size = m.group(1)
             if int(size) < 44:
-                self.issues.append(f"[Touch Target] {filename}: Touch target size {size}px < 44px minimum (iOS: 44pt, Android: 48dp)")
+                self.issues.append(f"[Touch Target] {filename}: Touch target size {size}px < 44px minimum (iOS: 44pt, Android: 48dp)", span=m.span(), rule="touch-target/size")
 
         # 1.2 Touch Target Spacing Check
         # Look for inadequate spacing between touchable elements
-        small_gaps = re.findall(r'(?:margin|gap):\s*([0-7])\s*(?:px|dp)', content)
-        for gap in small_gaps:
+        for m in re.finditer(r'(?:margin|gap):\s*([0-7])\s*(?:px|dp)', content):
+            gap = m.group(1)
             if int(gap) < 8:
-                self.warnings.append(f"[Touch Spacing] {filename}: Touch target spacing {gap}px < 8px minimum. Accidental taps risk.")
+                self.warnings.append(f"[Touch Spacing] {filename}: Touch target spacing {gap}px < 8px minimum. Accidental taps risk.", span=m.span(), rule="touch-spacing/gap")
 
         # 1.3 Thumb Zone Placement Check
         # Primary CTAs should be at bottom (easy thumb reach)
         primary_buttons = re.findall(r'(?:testID|id):\s*["\'](?:.*(?:primary|cta|submit|confirm)[^"\']*)["\']', content, re.IGNORECASE)
         has_bottom_placement = bool(re.search(r'position:\s*["\']?absolute["\']?|bottom:\s*\d+|style.*bottom|justifyContent:\s*["\']?flex-end', content))
         if primary_buttons and not has_bottom_placement:
-            self.warnings.append(f"[Thumb Zone] {filename}: Primary CTA may not be in thumb zone (bottom). Place primary actions at bottom for easy reach.")
+            self.warnings.append(f"[Thumb Zone] {filename}: Primary CTA may not be in thumb zone (bottom). Place primary actions at bottom for easy reach.", rule="thumb-zone/primary-cta")
 
         # 1.4 Gesture Alternatives Check
         # Swipe actions should have visible button alternatives
         has_swipe_gestures = bool(re.search(r'Swipeable|onSwipe|PanGestureHandler|swipe', content))
         has_visible_buttons = bool(re.search(r'Button.*(?:delete|archive|more)|TouchableOpacity|Pressable', content))
         if has_swipe_gestures and not has_visible_buttons:
-            self.warnings.append(f"[Gestures] {filename}: Swipe gestures detected without visible button alternatives. Motor impaired users need alternatives.")
+            self.warnings.append(f"[Gestures] {filename}: Swipe gestures detected without visible button alternatives. Motor impaired users need alternatives.", rule="gestures/button-alternative")
 
         # 1.5 Haptic Feedback Check
         # Important actions should have haptic feedback
         has_important_actions = bool(re.search(r'(?:onPress|onSubmit|delete|remove|confirm|purchase)', content))
         has_haptics = bool(re.search(r'Haptics|Vibration|react-native-haptic-feedback|FeedbackManager', content))
         if has_important_actions and not has_haptics:
-            self.warnings.append(f"[Haptics] {filename}: Important actions without haptic feedback. Consider adding haptic confirmation.")
+            self.warnings.append(f"[Haptics] {filename}: Important actions without haptic feedback. Consider adding haptic confirmation.", rule="haptics/missing-feedback")
 
         # 1.6 Touch Feedback Timing Check
         # Touch feedback should be immediate (<50ms)
@@ -138,7 +240,7 @@ class MobileAuditor:
             has_pressable = bool(re.search(r'Pressable|TouchableOpacity', content))
             has_feedback_state = bool(re.search(r'pressed|style.*opacity|underlay', content))
             if has_pressable and not has_feedback_state:
-                self.warnings.append(f"[Touch Feedback] {filename}: Pressable without visual feedback state. Add opacity/scale change for tap confirmation.")
+                self.warnings.append(f"[Touch Feedback] {filename}: Pressable without visual feedback state. Add opacity/scale change for tap confirmation.", rule="touch-feedback/pressable-state")
 
         # --- 2. MOBILE PERFORMANCE CHECKS ---
 
@@ -146,21 +248,21 @@ class MobileAuditor:
         has_scrollview = bool(re.search(r'<ScrollView|ScrollView\.', content))
         has_map_in_scrollview = bool(re.search(r'ScrollView.*\.map\(|ScrollView.*\{.*\.map', content))
         if has_scrollview and has_map_in_scrollview:
-            self.issues.append(f"[Performance CRITICAL] {filename}: ScrollView with .map() detected. Use FlatList for lists to prevent memory explosion.")
+            self.issues.append(f"[Performance CRITICAL] {filename}: ScrollView with .map() detected. Use FlatList for lists to prevent memory explosion.", rule="performance/scrollview-map")
 
         # 2.2 React.memo Check
         if is_react_native:
             has_list = bool(re.search(r'FlatList|FlashList|SectionList', content))
             has_react_memo = bool(re.search(r'React\.memo|memo\(', content))
             if has_list and not has_react_memo:
-                self.warnings.append(f"[Performance] {filename}: FlatList without React.memo on list items. Items will re-render on every parent update.")
+                self.warnings.append(f"[Performance] {filename}: FlatList without React.memo on list items. Items will re-render on every parent update.", rule="performance/flatlist-memo")
 
         # 2.3 useCallback Check
         if is_react_native:
             has_flatlist = bool(re.search(r'FlatList|FlashList', content))
             has_use_callback = bool(re.search(r'useCallback', content))
             if has_flatlist and not has_use_callback:
-                self.warnings.append(f"[Performance] {filename}: FlatList renderItem without useCallback. New function created every render.")
+                self.warnings.append(f"[Performance] {filename}: FlatList renderItem without useCallback. New function created every render.", rule="performance/renderitem-callback")
 
         # 2.4 keyExtractor Check (CRITICAL)
         if is_react_native:
@@ -168,9 +270,9 @@ class MobileAuditor:
             has_key_extractor = bool(re.search(r'keyExtractor', content))
             uses_index_key = bool(re.search(r'key=\{.*index.*\}|key:\s*index', content))
             if has_flatlist and not has_key_extractor:
-                self.issues.append(f"[Performance CRITICAL] {filename}: FlatList without keyExtractor. Index-based keys cause bugs on reorder/delete.")
+                self.issues.append(f"[Performance CRITICAL] {filename}: FlatList without keyExtractor. Index-based keys cause bugs on reorder/delete.", rule="performance/key-extractor")
             if uses_index_key:
-                self.issues.append(f"[Performance CRITICAL] {filename}: Using index as key. This causes bugs when list changes. Use unique ID from data.")
+                self.issues.append(f"[Performance CRITICAL] {filename}: Using index as key. This causes bugs when list changes. Use unique ID from data.", rule="performance/index-key")
 
         # 2.5 useNativeDriver Check
         if is_react_native:
@@ -178,9 +280,9 @@ class MobileAuditor:
             has_native_driver = bool(re.search(r'useNativeDriver:\s*true', content))
             has_native_driver_false = bool(re.search(r'useNativeDriver:\s*false', content))
             if has_animated and has_native_driver_false:
-                self.warnings.append(f"[Performance] {filename}: Animation with useNativeDriver: false. Use true for 60fps (only supports transform/opacity).")
+                self.warnings.append(f"[Performance] {filename}: Animation with useNativeDriver: false. Use true for 60fps (only supports transform/opacity).", rule="performance/native-driver-disabled")
             if has_animated and not has_native_driver:
-                self.warnings.append(f"[Performance] {filename}: Animated component without useNativeDriver. Add useNativeDriver: true for 60fps.")
+                self.warnings.append(f"[Performance] {filename}: Animated component without useNativeDriver. Add useNativeDriver: true for 60fps.", rule="performance/native-driver-missing")
 
         # 2.6 Memory Leak Check
         if is_react_native:
@@ -188,31 +290,31 @@ class MobileAuditor:
             has_cleanup = bool(re.search(r'return\s*\(\)\s*=>|return\s+function', content))
             has_subscriptions = bool(re.search(r'addEventListener|subscribe|\.focus\(\)|\.off\(', content))
             if has_effect and has_subscriptions and not has_cleanup:
-                self.issues.append(f"[Memory Leak] {filename}: useEffect with subscriptions but no cleanup function. Memory leak on unmount.")
+                self.issues.append(f"[Memory Leak] {filename}: useEffect with subscriptions but no cleanup function. Memory leak on unmount.", rule="memory-leak/effect-cleanup")
 
         # 2.7 Console.log Detection
         console_logs = len(re.findall(r'console\.log|console\.warn|console\.error|console\.debug', content))
         if console_logs > 5:
-            self.warnings.append(f"[Performance] {filename}: {console_logs} console.log statements detected. Remove before production (blocks JS thread).")
+            self.warnings.append(f"[Performance] {filename}: {console_logs} console.log statements detected. Remove before production (blocks JS thread).", rule="performance/console-log")
 
         # 2.8 Inline Function Detection
         if is_react_native:
             inline_functions = re.findall(r'(?:onPress|onPressIn|onPressOut|renderItem):\s*\([^)]*\)\s*=>', content)
             if len(inline_functions) > 3:
-                self.warnings.append(f"[Performance] {filename}: {len(inline_functions)} inline arrow functions in props. Creates new function every render. Use useCallback.")
+                self.warnings.append(f"[Performance] {filename}: {len(inline_functions)} inline arrow functions in props. Creates new function every render. Use useCallback.", rule="performance/inline-functions")
 
         # 2.9 Animation Properties Check
         # Warn if animating expensive properties
         animating_layout = bool(re.search(r'Animated\.timing.*(?:width|height|margin|padding)', content))
         if animating_layout:
-            self.issues.append(f"[Performance] {filename}: Animating layout properties (width/height/margin). Use transform/opacity for 60fps.")
+            self.issues.append(f"[Performance] {filename}: Animating layout properties (width/height/margin). Use transform/opacity for 60fps.", rule="performance/layout-animation")
 
         # --- 3. MOBILE NAVIGATION CHECKS ---
 
         # 3.1 Tab Bar Max Items Check
         tab_bar_items = len(re.findall(r'Tab\.Screen|createBottomTabNavigator|BottomTab', content))
         if tab_bar_items > 5:
-            self.warnings.append(f"[Navigation] {filename}: {tab_bar_items} tab bar items (max 5 recommended). More than 5 becomes hard to tap.")
+            self.warnings.append(f"[Navigation] {filename}: {tab_bar_items} tab bar items (max 5 recommended). More than 5 becomes hard to tap.", rule="navigation/tab-count")
 
         # 3.2 Tab State Preservation Check
         has_tab_nav = bool(re.search(r'createBottomTabNavigator|Tab\.Navigator', content))
@@ -220,13 +322,13 @@ class MobileAuditor:
             # Look for lazy prop (false preserves state)
             has_lazy_false = bool(re.search(r'lazy:\s*false', content))
             if not has_lazy_false:
-                self.warnings.append(f"[Navigation] {filename}: Tab navigation without lazy: false. Tabs may lose state on switch.")
+                self.warnings.append(f"[Navigation] {filename}: Tab navigation without lazy: false. Tabs may lose state on switch.", rule="navigation/tab-lazy")
 
         # 3.3 Back Handling Check
         has_back_listener = bool(re.search(r'BackHandler|useFocusEffect|navigation\.addListener', content))
         has_custom_back = bool(re.search(r'onBackPress|handleBackPress', content))
         if has_custom_back and not has_back_listener:
-            self.warnings.append(f"[Navigation] {filename}: Custom back handling without BackHandler listener. May not work correctly.")
+            self.warnings.append(f"[Navigation] {filename}: Custom back handling without BackHandler listener. May not work correctly.", rule="navigation/back-handler")
 
         # 3.4 Deep Link Support Check
         has_linking = bool(re.search(r'Linking\.|Linking\.openURL|deepLink|universalLink', content))
@@ -235,7 +337,7 @@ class MobileAuditor:
             self.passed_count += 1
         else:
             if has_linking and not has_config:
-                self.warnings.append(f"[Navigation] {filename}: Deep linking detected but may lack proper configuration. Test notification/share flows.")
+                self.warnings.append(f"[Navigation] {filename}: Deep linking detected but may lack proper configuration. Test notification/share flows.", rule="navigation/deep-linking")
 
         # --- 4. MOBILE TYPOGRAPHY CHECKS ---
 
@@ -244,41 +346,40 @@ class MobileAuditor:
             has_custom_font = bool(re.search(r"fontFamily:\s*[\"'][^\"']+", content))
             has_system_font = bool(re.search(r"fontFamily:\s*[\"']?(?:System|San Francisco|Roboto|-apple-system)", content))
             if has_custom_font and not has_system_font:
-                self.warnings.append(f"[Typography] {filename}: Custom font detected. Consider system fonts (iOS: SF Pro, Android: Roboto) for native feel.")
+                self.warnings.append(f"[Typography] {filename}: Custom font detected. Consider system fonts (iOS: SF Pro, Android: Roboto) for native feel.", rule="typography/custom-font")
 
         # 4.2 Text Scaling Check (iOS Dynamic Type)
         if is_react_native:
             has_font_sizes = bool(re.search(r'fontSize:', content))
             has_scaling = bool(re.search(r'allowFontScaling:\s*true|responsiveFontSize|useWindowDimensions', content))
             if has_font_sizes and not has_scaling:
-                self.warnings.append(f"[Typography] {filename}: Fixed font sizes without scaling support. Consider allowFontScaling for accessibility.")
+                self.warnings.append(f"[Typography] {filename}: Fixed font sizes without scaling support. Consider allowFontScaling for accessibility.", rule="typography/font-scaling")
 
         # 4.3 Mobile Line Height Check
-        line_heights = re.findall(r'lineHeight:\s*([\d.]+)', content)
-        for lh in line_heights:
+        for m in re.finditer(r'lineHeight:\s*([\d.]+)', content):
+            lh = m.group(1)
             if float(lh) > 1.8:
-                self.warnings.append(f"[Typography] {filename}: lineHeight {lh} too high for mobile. Mobile text needs tighter spacing (1.3-1.5).")
+                self.warnings.append(f"[Typography] {filename}: lineHeight {lh} too high for mobile. Mobile text needs tighter spacing (1.3-1.5).", span=m.span(), rule="typography/line-height")
 
         # 4.4 Font Size Limits
-        font_sizes = re.findall(r'fontSize:\s*([\d.]+)', content)
-        for fs in font_sizes:
-            size = float(fs)
+        for m in re.finditer(r'fontSize:\s*([\d.]+)', content):
+            size = float(m.group(1))
             if size < 12:
-                self.warnings.append(f"[Typography] {filename}: fontSize {size}px below 12px minimum readability.")
+                self.warnings.append(f"[Typography] {filename}: fontSize {size}px below 12px minimum readability.", span=m.span(), rule="typography/font-size-small")
             elif size > 32:
-                self.warnings.append(f"[Typography] {filename}: fontSize {size}px very large. Consider using responsive scaling.")
+                self.warnings.append(f"[Typography] {filename}: fontSize {size}px very large. Consider using responsive scaling.", span=m.span(), rule="typography/font-size-large")
 
         # --- 5. MOBILE COLOR SYSTEM CHECKS ---
 
         # 5.1 Pure Black Avoidance
         if re.search(r'#000000|color:\s*black|backgroundColor:\s*["\']?black', content):
-            self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use dark gray (#1C1C1E iOS, #121212 Android) for better OLED/battery.")
+            self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use dark gray (#1C1C1E iOS, #121212 Android) for better OLED/battery.", rule="color/pure-black")
 
         # 5.2 Dark Mode Support
         has_color_schemes = bool(re.search(r'useColorScheme|colorScheme|appearance:\s*["\']?dark', content))
         has_dark_mode_style = bool(re.search(r'\\\?.*dark|style:\s*.*dark|isDark', content))
         if not has_color_schemes and not has_dark_mode_style:
-            self.warnings.append(f"[Color] {filename}: No dark mode support detected. Consider useColorScheme for system dark mode.")
+            self.warnings.append(f"[Color] {filename}: No dark mode support detected. Consider useColorScheme for system dark mode.", rule="color/dark-mode")
 
         # --- 6. PLATFORM iOS CHECKS ---
 
@@ -293,12 +394,12 @@ class MobileAuditor:
             has_haptic_import = bool(re.search(r'expo-haptics|react-native-haptic-feedback', content))
             has_haptic_types = bool(re.search(r'ImpactFeedback|NotificationFeedback|SelectionFeedback', content))
             if has_haptic_import and not has_haptic_types:
-                self.warnings.append(f"[iOS Haptics] {filename}: Haptic library imported but not using typed haptics (Impact/Notification/Selection).")
+                self.warnings.append(f"[iOS Haptics] {filename}: Haptic library imported but not using typed haptics (Impact/Notification/Selection).", rule="ios-haptics/typed-haptics")
 
             # 6.3 iOS Safe Area
             has_safe_area = bool(re.search(r'SafeAreaView|useSafeAreaInsets|safeArea', content))
             if not has_safe_area:
-                self.warnings.append(f"[iOS] {filename}: No SafeArea detected. Content may be hidden by notch/home indicator.")
+                self.warnings.append(f"[iOS] {filename}: No SafeArea detected. Content may be hidden by notch/home indicator.", rule="ios/safe-area")
 
         # --- 7. PLATFORM ANDROID CHECKS ---
 
@@ -312,14 +413,14 @@ class MobileAuditor:
             has_ripple = bool(re.search(r'ripple|android_ripple|foregroundRipple', content))
             has_pressable = bool(re.search(r'Pressable|Touchable', content))
             if has_pressable and not has_ripple:
-                self.warnings.append(f"[Android] {filename}: Touchable without ripple effect. Android users expect ripple feedback.")
+                self.warnings.append(f"[Android] {filename}: Touchable without ripple effect. Android users expect ripple feedback.", rule="android/ripple")
 
             # 7.3 Hardware Back Button
             if is_react_native:
                 has_back_button = bool(re.search(r'BackHandler|useBackHandler', content))
                 has_navigation = bool(re.search(r'@react-navigation', content))
                 if has_navigation and not has_back_button:
-                    self.warnings.append(f"[Android] {filename}: React Navigation detected without BackHandler listener. Android hardware back may not work correctly.")
+                    self.warnings.append(f"[Android] {filename}: React Navigation detected without BackHandler listener. Android hardware back may not work correctly.", rule="android/back-handler")
 
         # --- 8. MOBILE BACKEND CHECKS ---
 
@@ -328,19 +429,19 @@ class MobileAuditor:
         has_secure_storage = bool(re.search(r'SecureStore|Keychain|EncryptedSharedPreferences', content))
         has_token_storage = bool(re.search(r'token|jwt|auth.*storage', content, re.IGNORECASE))
         if has_token_storage and has_async_storage and not has_secure_storage:
-            self.issues.append(f"[Security] {filename}: Storing auth tokens in AsyncStorage (insecure). Use SecureStore (iOS) / EncryptedSharedPreferences (Android).")
+            self.issues.append(f"[Security] {filename}: Storing auth tokens in AsyncStorage (insecure). Use SecureStore (iOS) / EncryptedSharedPreferences (Android).", rule="security/async-storage-tokens")
 
         # 8.2 Offline Handling Check
         has_network = bool(re.search(r'fetch|axios|netinfo|@react-native-community/netinfo', content))
         has_offline = bool(re.search(r'offline|isConnected|netInfo|cache.*offline', content))
         if has_network and not has_offline:
-            self.warnings.append(f"[Offline] {filename}: Network requests detected without offline handling. Consider NetInfo for connection status.")
+            self.warnings.append(f"[Offline] {filename}: Network requests detected without offline handling. Consider NetInfo for connection status.", rule="offline/network-handling")
 
         # 8.3 Push Notification Support
         has_push = bool(re.search(r'Notifications|pushNotification|Firebase\.messaging|PushNotificationIOS', content))
         has_push_handler = bool(re.search(r'onNotification|addNotificationListener|notification\.open', content))
         if has_push and not has_push_handler:
-            self.warnings.append(f"[Push] {filename}: Push notifications imported but no handler found. May miss notifications.")
+            self.warnings.append(f"[Push] {filename}: Push notifications imported but no handler found. May miss notifications.", rule="push/handler")
 
         # --- 9. EXTENDED MOBILE TYPOGRAPHY CHECKS ---
 
@@ -358,7 +459,7 @@ class MobileAuditor:
             matching_ios = sum(1 for size in font_sizes if any(abs(float(size) - ios_size) < 1 for ios_size in ios_scale_sizes))
 
             if len(font_sizes) > 3 and matching_ios < len(font_sizes) / 2:
-                self.warnings.append(f"[iOS Typography] {filename}: Font sizes don't match iOS type scale. Consider iOS text styles for native feel.")
+                self.warnings.append(f"[iOS Typography] {filename}: Font sizes don't match iOS type scale. Consider iOS text styles for native feel.", rule="ios-typography/type-scale")
 
         # 9.2 Android Material Type Scale Check
         if is_react_native:
@@ -373,7 +474,7 @@ class MobileAuditor:
             uses_sp = bool(re.search(r'\d+\s*sp\b', content))
             if has_display or has_headline_material:
                 if not uses_sp:
-                    self.warnings.append(f"[Android Typography] {filename}: Material typography detected without sp units. Use sp for text to respect user font size preferences.")
+                    self.warnings.append(f"[Android Typography] {filename}: Material typography detected without sp units. Use sp for text to respect user font size preferences.", rule="android-typography/sp-units")
 
         # 9.3 Modular Scale Check
         # Check if font sizes follow modular scale
@@ -389,7 +490,7 @@ class MobileAuditor:
             common_ratios = {1.125, 1.2, 1.25, 1.333, 1.5}
             for ratio in ratios[:3]:
                 if not any(abs(ratio - cr) < 0.03 for cr in common_ratios):
-                    self.warnings.append(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio.")
+                    self.warnings.append(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio.", rule="typography/modular-scale")
                     break
 
         # 9.4 Line Length Check (Mobile-specific)
@@ -398,7 +499,7 @@ class MobileAuditor:
             has_long_text = bool(re.search(r'<Text[^>]*>[^<]{40,}', content))
             has_max_width = bool(re.search(r'maxWidth|max-w-\d+|width:\s*["\']?\d+', content))
             if has_long_text and not has_max_width:
-                self.warnings.append(f"[Mobile Typography] {filename}: Text without max-width constraint. Mobile text should be 40-60 characters per line for readability.")
+                self.warnings.append(f"[Mobile Typography] {filename}: Text without max-width constraint. Mobile text should be 40-60 characters per line for readability.", rule="mobile-typography/max-width")
 
         # 9.5 Font Weight Pattern Check
         # Check for font weight distribution
@@ -417,7 +518,7 @@ class MobileAuditor:
             bold_count = sum(1 for w in numeric_weights if w >= 700)
             regular_count = sum(1 for w in numeric_weights if 400 <= w < 500)
             if bold_count > regular_count:
-                self.warnings.append(f"[Mobile Typography] {filename}: More bold weights than regular. Mobile typography should be regular-dominant for readability.")
+                self.warnings.append(f"[Mobile Typography] {filename}: More bold weights than regular. Mobile typography should be regular-dominant for readability.", rule="mobile-typography/weight-balance")
 
         # --- 10. EXTENDED MOBILE COLOR SYSTEM CHECKS ---
 
@@ -430,7 +531,7 @@ class MobileAuditor:
             pass
         elif re.search(r'backgroundColor:\s*["\']?#[0-9A-Fa-f]{6}', content):
             # Check if using light colors in dark mode (bad for OLED)
-            self.warnings.append(f"[Mobile Color] {filename}: Consider OLED-optimized dark backgrounds (#121212 Android, #000000 iOS) for battery savings.")
+            self.warnings.append(f"[Mobile Color] {filename}: Consider OLED-optimized dark backgrounds (#121212 Android, #000000 iOS) for battery savings.", rule="mobile-color/oled-dark")
 
         # 10.2 Saturated Color Detection (Battery)
         # Highly saturated colors consume more power on OLED
@@ -451,7 +552,7 @@ class MobileAuditor:
                 pass
 
         if saturated_count > 10:
-            self.warnings.append(f"[Mobile Color] {filename}: {saturated_count} highly saturated colors detected. Desaturated colors save battery on OLED screens.")
+            self.warnings.append(f"[Mobile Color] {filename}: {saturated_count} highly saturated colors detected. Desaturated colors save battery on OLED screens.", rule="mobile-color/saturation")
 
         # 10.3 Outdoor Visibility Check
         # Low contrast combinations fail in outdoor sunlight
@@ -459,7 +560,7 @@ class MobileAuditor:
         # Check for potential low contrast (light gray on white, dark gray on black)
         potential_low_contrast = bool(re.search(r'#[EeEeEeEe].*#ffffff|#999999.*#ffffff|#333333.*#000000|#666666.*#000000', content))
         if potential_low_contrast:
-            self.warnings.append(f"[Mobile Color] {filename}: Possible low contrast combination detected. Critical for outdoor visibility. Ensure WCAG AAA (7:1) for mobile.")
+            self.warnings.append(f"[Mobile Color] {filename}: Possible low contrast combination detected. Critical for outdoor visibility. Ensure WCAG AAA (7:1) for mobile.", rule="mobile-color/low-contrast")
 
         # 10.4 Dark Mode Text Color Check
         # In dark mode, text should not be pure white
@@ -467,7 +568,7 @@ class MobileAuditor:
         if has_dark_mode:
             has_pure_white_text = bool(re.search(r'color:\s*["\']?#ffffff|#fff["\']?\}|textColor:\s*["\']?white', content))
             if has_pure_white_text:
-                self.warnings.append(f"[Mobile Color] {filename}: Pure white text (#FFFFFF) in dark mode. Use #E8E8E8 or light gray for better readability.")
+                self.warnings.append(f"[Mobile Color] {filename}: Pure white text (#FFFFFF) in dark mode. Use #E8E8E8 or light gray for better readability.", rule="mobile-color/pure-white-text")
 
         # --- 11. EXTENDED PLATFORM IOS CHECKS ---
 
@@ -476,7 +577,7 @@ class MobileAuditor:
             has_sf_pro = bool(re.search(r'SF Pro|SFPro|fontFamily:\s*["\']?[-\s]*SF', content))
             has_custom_font = bool(re.search(r'fontFamily:\s*["\'][^"\']+', content))
             if has_custom_font and not has_sf_pro:
-                self.warnings.append(f"[iOS] {filename}: Custom font without SF Pro fallback. Consider SF Pro Text for body, SF Pro Display for headings.")
+                self.warnings.append(f"[iOS] {filename}: Custom font without SF Pro fallback. Consider SF Pro Text for body, SF Pro Display for headings.", rule="ios/sf-pro-fallback")
 
             # 11.2 iOS System Colors Check
             # Check for semantic color usage
@@ -486,7 +587,7 @@ class MobileAuditor:
 
             has_hardcoded_gray = bool(re.search(r'#[78]0{4}', content))
             if has_hardcoded_gray and not (has_label or has_secondaryLabel):
-                self.warnings.append(f"[iOS] {filename}: Hardcoded gray colors detected. Consider iOS semantic colors (label, secondaryLabel) for automatic dark mode.")
+                self.warnings.append(f"[iOS] {filename}: Hardcoded gray colors detected. Consider iOS semantic colors (label, secondaryLabel) for automatic dark mode.", rule="ios/semantic-colors")
 
             # 11.3 iOS Accent Colors Check
             ios_blue = bool(re.search(r'#007AFF|#0A84FF|systemBlue', content))
@@ -495,13 +596,13 @@ class MobileAuditor:
 
             has_custom_primary = bool(re.search(r'primaryColor|theme.*primary|colors\.primary', content))
             if has_custom_primary and not (ios_blue or ios_green or ios_red):
-                self.warnings.append(f"[iOS] {filename}: Custom primary color without iOS system color fallback. Consider systemBlue for consistent iOS feel.")
+                self.warnings.append(f"[iOS] {filename}: Custom primary color without iOS system color fallback. Consider systemBlue for consistent iOS feel.", rule="ios/system-color")
 
             # 11.4 iOS Navigation Patterns Check
             has_navigation_bar = bool(re.search(r'navigationOptions|headerStyle|cardStyle', content))
             has_header_title = bool(re.search(r'title:\s*["\']|headerTitle|navigation\.setOptions', content))
             if has_navigation_bar and not has_header_title:
-                self.warnings.append(f"[iOS] {filename}: Navigation bar detected without title. iOS apps should have clear context in nav bar.")
+                self.warnings.append(f"[iOS] {filename}: Navigation bar detected without title. iOS apps should have clear context in nav bar.", rule="ios/nav-title")
 
             # 11.5 iOS Component Patterns Check
             # Check for iOS-specific components
@@ -519,20 +620,20 @@ class MobileAuditor:
             has_roboto = bool(re.search(r'Roboto|fontFamily:\s*["\']?[-\s]*Roboto', content))
             has_custom_font = bool(re.search(r'fontFamily:\s*["\'][^"\']+', content))
             if has_custom_font and not has_roboto:
-                self.warnings.append(f"[Android] {filename}: Custom font without Roboto fallback. Roboto is optimized for Android displays.")
+                self.warnings.append(f"[Android] {filename}: Custom font without Roboto fallback. Roboto is optimized for Android displays.", rule="android/roboto-fallback")
 
             # 12.2 Material 3 Dynamic Color Check
             has_material_colors = bool(re.search(r'MD3|MaterialYou|dynamicColor|useColorScheme', content))
             has_theme_provider = bool(re.search(r'MaterialTheme|ThemeProvider|PaperProvider|ThemeProvider', content))
             if not has_material_colors and not has_theme_provider:
-                self.warnings.append(f"[Android] {filename}: No Material 3 dynamic color detected. Consider Material 3 theming for personalized feel.")
+                self.warnings.append(f"[Android] {filename}: No Material 3 dynamic color detected. Consider Material 3 theming for personalized feel.", rule="android/dynamic-color")
 
             # 12.3 Material Elevation Check
             # Check for elevation values (Material 3 uses elevation for depth)
             has_elevation = bool(re.search(r'elevation:\s*\d+|shadowOpacity|shadowRadius|android:elevation', content))
             has_box_shadow = bool(re.search(r'boxShadow:', content))
             if has_box_shadow and not has_elevation:
-                self.warnings.append(f"[Android] {filename}: CSS box-shadow detected without elevation. Consider Material elevation system for consistent depth.")
+                self.warnings.append(f"[Android] {filename}: CSS box-shadow detected without elevation. Consider Material elevation system for consistent depth.", rule="android/elevation")
 
             # 12.4 Material Component Patterns Check
             # Check for Material components
@@ -553,7 +654,7 @@ class MobileAuditor:
             if has_bottom_nav:
                 self.passed_count += 1  # Good Android pattern
             elif has_top_app_bar and not (has_bottom_nav or has_navigation_rail):
-                self.warnings.append(f"[Android] {filename}: TopAppBar without bottom navigation. Consider BottomNavigation for thumb-friendly access.")
+                self.warnings.append(f"[Android] {filename}: TopAppBar without bottom navigation. Consider BottomNavigation for thumb-friendly access.", rule="android/bottom-navigation")
 
         # --- 13. MOBILE TESTING CHECKS ---
 
@@ -570,21 +671,21 @@ class MobileAuditor:
         if has_maestro: testing_tools.append('Maestro')
 
         if len(testing_tools) == 0:
-            self.warnings.append(f"[Testing] {filename}: No testing framework detected. Consider Jest (unit) + Detox/Maestro (E2E) for mobile.")
+            self.warnings.append(f"[Testing] {filename}: No testing framework detected. Consider Jest (unit) + Detox/Maestro (E2E) for mobile.", rule="testing/framework")
 
         # 13.2 Test Pyramid Balance Check
         test_files = len(re.findall(r'\.test\.(tsx|ts|js|jsx)|\.spec\.', content))
         e2e_tests = len(re.findall(r'detox|maestro|e2e|spec\.e2e', content.lower()))
 
         if test_files > 0 and e2e_tests == 0:
-            self.warnings.append(f"[Testing] {filename}: Unit tests found but no E2E tests. Mobile needs E2E on real devices for complete coverage.")
+            self.warnings.append(f"[Testing] {filename}: Unit tests found but no E2E tests. Mobile needs E2E on real devices for complete coverage.", rule="testing/e2e")
 
         # 13.3 Accessibility Label Check (Mobile-specific)
         if is_react_native:
             has_pressable = bool(re.search(r'Pressable|TouchableOpacity|TouchableHighlight', content))
             has_a11y_label = bool(re.search(r'accessibilityLabel|aria-label|testID', content))
             if has_pressable and not has_a11y_label:
-                self.warnings.append(f"[A11y Mobile] {filename}: Touchable element without accessibilityLabel. Screen readers need labels for all interactive elements.")
+                self.warnings.append(f"[A11y Mobile] {filename}: Touchable element without accessibilityLabel. Screen readers need labels for all interactive elements.", rule="a11y-mobile/accessibility-label")
 
         # --- 14. MOBILE DEBUGGING CHECKS ---
 
@@ -594,7 +695,7 @@ class MobileAuditor:
         has_debugger = bool(re.search(r'debugger|__DEV__|React\.DevTools', content))
 
         if has_console_log > 10:
-            self.warnings.append(f"[Debugging] {filename}: {has_console_log} console.log statements. Remove before production; they block JS thread.")
+            self.warnings.append(f"[Debugging] {filename}: {has_console_log} console.log statements. Remove before production; they block JS thread.", rule="debugging/console-log")
 
         if has_performance:
             self.passed_count += 1  # Good performance monitoring
@@ -602,7 +703,7 @@ class MobileAuditor:
         # 14.2 Error Boundary Check
         has_error_boundary = bool(re.search(r'ErrorBoundary|componentDidCatch|getDerivedStateFromError', content))
         if not has_error_boundary and is_react_native:
-            self.warnings.append(f"[Debugging] {filename}: No ErrorBoundary detected. Consider adding ErrorBoundary to prevent app crashes.")
+            self.warnings.append(f"[Debugging] {filename}: No ErrorBoundary detected. Consider adding ErrorBoundary to prevent app crashes.", rule="debugging/error-boundary")
 
         # 14.3 Hermes Check (React Native specific)
         if is_react_native:
@@ -610,39 +711,97 @@ class MobileAuditor:
             # This is more of a configuration check, not code pattern
             self.passed_count += 1  # Hermes is default in RN 0.70+
 
-    def audit_directory(self, directory: str) -> None:
-        extensions = {'.tsx', '.ts', '.jsx', '.js', '.dart'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', 'build', '.idea'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+    EXTENSIONS = {'.tsx', '.ts', '.jsx', '.js', '.dart'}
+    SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', '.idea', CACHE_DIR_NAME}
+
+    def audit_directory(self, directory: str, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        use_cache: bool = True, cache_dir: str = None, only_files: list = None) -> None:
+        """
+        Audit every matching file (or only_files, relative to directory);
+        workers > 1 fans chunks out to a process pool.
+        Unchanged files reuse their results from the mobile_audit cache.
+        """
+        files = collect_files(directory, self.EXTENSIONS, self.SKIP_DIRS, only_files)
+        cache = open_cache(type(self), directory, 'mobile_audit', cache_dir) if use_cache else None
+        run_pool(self, files, workers=workers, chunk_size=chunk_size, cache=cache)
+
+    def evaluate(self, src: SourceFile):
+        return evaluate_source(type(self), src)
+
+    def collect(self, result) -> None:
+        merge_results(self, (result,))
+
+    def passed(self) -> bool:
+        return len(self.issues) == 0
+
+    def report(self) -> dict:
+        return self.get_report()
 
     def get_report(self):
         return {
             "files_checked": self.files_checked,
-            "issues": self.issues,
-            "warnings": self.warnings,
+            "issues": list(self.issues),
+            "warnings": list(self.warnings),
+            "issue_count": len(self.issues),
+            "warning_count": len(self.warnings),
+            "rule_counts": self.findings.summary(),
+            "findings": [f._asdict() for f in self.findings.retained()],
             "passed_checks": self.passed_count,
             "compliant": len(self.issues) == 0
         }
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python mobile_audit.py <directory>")
-        sys.exit(1)
+def run(project_path: str, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_per_rule: int = DEFAULT_KEEP_PER_RULE, use_cache: bool = True,
+        cache_dir: str = None, changed_files: list = None, **opts) -> dict:
+    """
+    Audit a file or directory (only changed_files in it, if given); returns
+    the JSON report with "passed" = compliant (no printing).
+    """
+    project_framework.cache_clear()  # manifests may have changed since a previous in-process run
+    auditor = MobileAuditor(keep_per_rule=max_per_rule)
+    if os.path.isfile(project_path):
+        auditor.audit_file(project_path)
+    else:
+        auditor.audit_directory(project_path, workers=workers, chunk_size=chunk_size,
+                                use_cache=use_cache, cache_dir=cache_dir, only_files=changed_files)
+    report = auditor.get_report()
+    report["passed"] = report["compliant"]
+    return report
 
-    path = sys.argv[1]
-    is_json = "--json" in sys.argv
 
-    auditor = MobileAuditor()
+def main():
+    parser = argparse.ArgumentParser(description="Mobile UX audit for React Native / Flutter code")
+    parser.add_argument("path", help="File or directory to audit")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for directory audits (default: all cores, 1 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Files per worker task (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--max-per-rule", type=int, default=DEFAULT_KEEP_PER_RULE,
+                        help=f"Findings kept in the report per rule; totals stay exact (default: {DEFAULT_KEEP_PER_RULE})")
+    parser.add_argument("--findings-jsonl", metavar="PATH",
+                        help="Stream every finding to PATH as JSON lines")
+    parser.add_argument("--no-cache", action="store_true", help="Re-audit every file, ignoring cached results")
+    parser.add_argument("--cache-dir", default=None,
+                        help=f"Result cache location (default: <project root>/{CACHE_DIR_NAME})")
+    args = parser.parse_args()
+
+    path = args.path
+    is_json = args.json
+
+    findings_stream = open(args.findings_jsonl, 'w', encoding='utf-8') if args.findings_jsonl else None
+    auditor = MobileAuditor(keep_per_rule=args.max_per_rule, findings_stream=findings_stream)
     if os.path.isfile(path):
         auditor.audit_file(path)
     else:
-        auditor.audit_directory(path)
+        auditor.audit_directory(path, workers=args.workers, chunk_size=args.chunk_size,
+                                use_cache=not args.no_cache, cache_dir=args.cache_dir)
 
     report = auditor.get_report()
+    if findings_stream:
+        findings_stream.close()
+    emit_report(report)
 
     if is_json:
         print(json.dumps(report, indent=2))
@@ -650,11 +809,11 @@ def main():
         print(f"\n[MOBILE AUDIT] {report['files_checked']} mobile files checked")
         print("-" * 50)
         if report['issues']:
-            print(f"[!] ISSUES ({len(report['issues'])}):")
+            print(f"[!] ISSUES ({report['issue_count']}):")
             for i in report['issues'][:10]:
                 print(f"  - {i}")
         if report['warnings']:
-            print(f"[*] WARNINGS ({len(report['warnings'])}):")
+            print(f"[*] WARNINGS ({report['warning_count']}):")
             for w in report['warnings'][:15]:
                 print(f"  - {w}")
         print(f"[+] PASSED CHECKS: {report['passed_checks']}")
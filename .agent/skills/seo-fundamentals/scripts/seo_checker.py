@@ -14,15 +14,22 @@ WHAT IT CHECKS:
     - JSX/TSX files (React page components)
     - Only files that are likely PUBLIC pages
 
+Files are read through the shared frontend engine, so a combined run
+(frontend_engine.py) audits them in the same pass as the other checkers.
+
 Usage:
     python seo_checker.py <project_path>
 """
 import sys
 import json
-import re
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "audit"))
+from frontend_engine import SourceFile, add_run_arguments, register, run as run_engine
+from result_channel import emit_report
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -75,78 +82,117 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
-def find_pages(project_path: Path) -> list:
-    """Find page files to check."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
-    
-    return files[:50]  # Limit to 50 files
-
-
-def check_page(file_path: Path) -> dict:
+def check_page(src: SourceFile) -> list:
     """Check a single page for SEO issues."""
     issues = []
-    
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-    except Exception as e:
-        return {"file": str(file_path.name), "issues": [f"Error: {e}"]}
+    content = src.text
+    lower = src.folded
     
     # Detect if this is a layout/template file (has Head component)
-    is_layout = 'Head>' in content or '<head' in content.lower()
+    is_layout = 'Head>' in content or '<head' in lower
     
     # 1. Title tag
-    has_title = '<title' in content.lower() or 'title=' in content or 'Head>' in content
+    has_title = '<title' in lower or 'title=' in content or 'Head>' in content
     if not has_title and is_layout:
         issues.append("Missing <title> tag")
     
     # 2. Meta description
-    has_description = 'name="description"' in content.lower() or 'name=\'description\'' in content.lower()
+    has_description = 'name="description"' in lower or 'name=\'description\'' in lower
     if not has_description and is_layout:
         issues.append("Missing meta description")
     
     # 3. Open Graph tags
-    has_og = 'og:' in content or 'property="og:' in content.lower()
+    has_og = 'og:' in content or 'property="og:' in lower
     if not has_og and is_layout:
         issues.append("Missing Open Graph tags")
     
     # 4. Heading hierarchy - multiple H1s
-    h1_matches = re.findall(r'<h1[^>]*>', content, re.I)
-    if len(h1_matches) > 1:
-        issues.append(f"Multiple H1 tags ({len(h1_matches)})")
+    h1_count = len(src.tags('h1'))
+    if h1_count > 1:
+        issues.append(f"Multiple H1 tags ({h1_count})")
     
     # 5. Images without alt
-    img_pattern = r'<img[^>]+>'
-    imgs = re.findall(img_pattern, content, re.I)
-    for img in imgs:
-        if 'alt=' not in img.lower():
+    for img in src.tags('img'):
+        if not img.attrs:
+            continue
+        if 'alt=' not in img.attrs.lower():
             issues.append("Image missing alt attribute")
             break
-        if 'alt=""' in img or "alt=''" in img:
+        if 'alt=""' in img.attrs or "alt=''" in img.attrs:
             issues.append("Image has empty alt attribute")
             break
     
     # 6. Check for canonical link (nice to have)
-    # has_canonical = 'rel="canonical"' in content.lower()
+    # has_canonical = 'rel="canonical"' in lower
     
-    return {
-        "file": str(file_path.name),
-        "issues": issues
-    }
+    return issues
+
+
+@register('seo')
+class SEOChecker:
+    """Engine plugin: meta/OG/heading/alt checks on likely public pages."""
+    EXTENSIONS = {'.html', '.htm', '.jsx', '.tsx'}
+    SKIP_DIRS = SKIP_DIRS
+
+    def __init__(self):
+        self.files_checked = 0
+        self.results = []
+
+    def wants(self, path: str) -> bool:
+        return is_page_file(Path(path))
+
+    def evaluate(self, src: SourceFile) -> dict:
+        return {"file": src.name, "issues": check_page(src)}
+
+    def collect(self, result: dict) -> None:
+        self.files_checked += 1
+        if result["issues"]:
+            self.results.append(result)
+
+    def total_issues(self) -> int:
+        return sum(len(item["issues"]) for item in self.results)
+
+    def passed(self) -> bool:
+        return self.total_issues() == 0
+
+    def report(self) -> dict:
+        return {
+            "script": "seo_checker",
+            "files_checked": self.files_checked,
+            "files_with_issues": len(self.results),
+            "issues_found": self.total_issues(),
+            "passed": self.passed()
+        }
+
+
+def json_report(project_path: str, checker: SEOChecker, stats: dict) -> dict:
+    """The CLI's JSON output for a finished engine run."""
+    if not checker.files_checked and not stats["files_skipped"]:
+        return {"script": "seo_checker", "files_checked": 0, "passed": True}
+    report = checker.report()
+    output = {"script": report["script"], "project": project_path}
+    output.update(report)
+    if stats["files_skipped"]:
+        output["files_skipped"] = stats["files_skipped"]
+    return output
+
+
+def run(project_path: str, budget_seconds: float = None, workers: int = None,
+        changed_files: list = None, **opts) -> dict:
+    """Audit project_path's pages (only changed_files, if given); returns the JSON report (no printing)."""
+    project_path = str(Path(project_path).resolve())
+    checker = SEOChecker()
+    stats = run_engine(project_path, [checker], budget_seconds=budget_seconds, workers=workers,
+                       only_files=changed_files)
+    return json_report(project_path, checker, stats)
 
 
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    parser = argparse.ArgumentParser(description="SEO audit for public page files")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    add_run_arguments(parser)
+    args = parser.parse_args()
+    project_path = Path(args.project).resolve()
     
     print(f"\n{'='*60}")
     print(f"  SEO CHECKER - Search Engine Optimization Audit")
@@ -155,24 +201,21 @@ def main():
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
     
-    # Find pages
-    pages = find_pages(project_path)
+    checker = SEOChecker()
+    stats = run_engine(str(project_path), [checker], budget_seconds=args.budget_seconds, workers=args.workers)
     
-    if not pages:
+    if not checker.files_checked and not stats["files_skipped"]:
         print("\n[!] No page files found.")
         print("    Looking for: HTML, JSX, TSX in pages/app/routes directories")
-        output = {"script": "seo_checker", "files_checked": 0, "passed": True}
+        output = json_report(str(project_path), checker, stats)
+        emit_report(output)
         print("\n" + json.dumps(output, indent=2))
         sys.exit(0)
     
-    print(f"Found {len(pages)} page files to analyze\n")
-    
-    # Check each page
-    all_issues = []
-    for f in pages:
-        result = check_page(f)
-        if result["issues"]:
-            all_issues.append(result)
+    print(f"Found {checker.files_checked} page files to analyze\n")
+    if stats["budget_note"]:
+        print(f"[!] {stats['budget_note']}\n")
+    all_issues = checker.results
     
     # Summary
     print("=" * 60)
@@ -198,21 +241,12 @@ def main():
     else:
         print("\n[OK] No SEO issues found!")
     
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    passed = total_issues == 0
-    
-    output = {
-        "script": "seo_checker",
-        "project": str(project_path),
-        "files_checked": len(pages),
-        "files_with_issues": len(all_issues),
-        "issues_found": total_issues,
-        "passed": passed
-    }
+    output = json_report(str(project_path), checker, stats)
+    emit_report(output)
     
     print("\n" + json.dumps(output, indent=2))
     
-    sys.exit(0 if passed else 1)
+    sys.exit(0 if output["passed"] else 1)
 
 
 if __name__ == "__main__":
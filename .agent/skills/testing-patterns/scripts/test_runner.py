@@ -137,6 +137,40 @@ def run_tests(cmd: list, cwd: Path) -> dict:
     return result
 
 
+def run(project_path: str, coverage: bool = False, **opts) -> dict:
+    """Run the detected test suite; returns the JSON report plus the captured output (no printing)."""
+    project_path = Path(project_path).resolve()
+    test_info = detect_test_framework(project_path)
+    
+    if not test_info["cmd"]:
+        return {
+            "script": "test_runner",
+            "project": str(project_path),
+            "type": test_info["type"],
+            "framework": None,
+            "passed": True,
+            "message": "No tests configured"
+        }
+    
+    # Choose command
+    cmd = test_info["coverage_cmd"] if coverage and test_info["coverage_cmd"] else test_info["cmd"]
+    result = run_tests(cmd, project_path)
+    
+    return {
+        "script": "test_runner",
+        "project": str(project_path),
+        "type": test_info["type"],
+        "framework": test_info["framework"],
+        "tests_run": result["tests_run"],
+        "tests_passed": result["tests_passed"],
+        "tests_failed": result["tests_failed"],
+        "passed": result["passed"],
+        "command": cmd,
+        "output": result["output"],
+        "error": result["error"]
+    }
+
+
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
     with_coverage = "--coverage" in sys.argv
@@ -148,37 +182,27 @@ def main():
     print(f"Coverage: {'enabled' if with_coverage else 'disabled'}")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Detect test framework
-    test_info = detect_test_framework(project_path)
-    print(f"Type: {test_info['type']}")
-    print(f"Framework: {test_info['framework']}")
+    output = run(str(project_path), coverage=with_coverage)
+    print(f"Type: {output['type']}")
+    print(f"Framework: {output['framework']}")
     print("-"*60)
     
-    if not test_info["cmd"]:
+    if "command" not in output:
         print("No test framework found for this project.")
-        output = {
-            "script": "test_runner",
-            "project": str(project_path),
-            "type": test_info["type"],
-            "framework": None,
-            "passed": True,
-            "message": "No tests configured"
-        }
         print(json.dumps(output, indent=2))
         sys.exit(0)
     
-    # Choose command
-    cmd = test_info["coverage_cmd"] if with_coverage and test_info["coverage_cmd"] else test_info["cmd"]
+    # Display-only fields; the JSON summary stays as it was
+    cmd = output.pop("command")
+    test_output = output.pop("output")
+    error = output.pop("error")
     
     print(f"Running: {' '.join(cmd)}")
     print("-"*60)
     
-    # Run tests
-    result = run_tests(cmd, project_path)
-    
     # Print output (truncated)
-    if result["output"]:
-        lines = result["output"].split("\n")
+    if test_output:
+        lines = test_output.split("\n")
         for line in lines[:30]:
             print(line)
         if len(lines) > 30:
@@ -189,30 +213,19 @@ def main():
     print("SUMMARY")
     print("="*60)
     
-    if result["passed"]:
+    if output["passed"]:
         print("[PASS] All tests passed")
     else:
         print("[FAIL] Some tests failed")
-        if result["error"]:
-            print(f"Error: {result['error'][:200]}")
-    
-    if result["tests_run"] > 0:
-        print(f"Tests: {result['tests_run']} total, {result['tests_passed']} passed, {result['tests_failed']} failed")
+        if error:
+            print(f"Error: {error[:200]}")
     
-    output = {
-        "script": "test_runner",
-        "project": str(project_path),
-        "type": test_info["type"],
-        "framework": test_info["framework"],
-        "tests_run": result["tests_run"],
-        "tests_passed": result["tests_passed"],
-        "tests_failed": result["tests_failed"],
-        "passed": result["passed"]
-    }
+    if output["tests_run"] > 0:
+        print(f"Tests: {output['tests_run']} total, {output['tests_passed']} passed, {output['tests_failed']} failed")
     
     print("\n" + json.dumps(output, indent=2))
     
-    sys.exit(0 if result["passed"] else 1)
+    sys.exit(0 if output["passed"] else 1)
 
 
 if __name__ == "__main__":
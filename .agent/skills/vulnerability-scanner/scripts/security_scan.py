@@ -4,13 +4,19 @@ Skill: vulnerability-scanner
 Script: security_scan.py
 Purpose: Validate that security principles from SKILL.md are applied correctly
 Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config]
-Output: JSON with validation findings
+                               [--output json|summary|jsonl|sarif] [--output-file PATH]
+                               [--rules PACK ...] [--rule-timings]
+                               [--rule-budget-ms MS] [--rule-call-timeout-ms MS] [--max-line-length N]
+Output: JSON with validation findings (jsonl/sarif stream every finding, untruncated)
 
 This script verifies:
 1. Dependencies - Supply chain security (OWASP A03)
 2. Secrets - No hardcoded credentials (OWASP A04)
 3. Code Patterns - Dangerous patterns identified (OWASP A05)
 4. Configuration - Security settings validated (OWASP A02)
+
+Secret, pattern and config rules are loaded from rule packs (rules/default.json
+plus any --rules PACK) and only run against the file extensions they declare.
 """
 import subprocess
 import json
@@ -18,8 +24,10 @@ import os
 import sys
 import re
 import argparse
+import functools
+import time
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Optional, TextIO, Tuple
 from datetime import datetime
 
 # Fix Windows console encoding for Unicode output
@@ -34,67 +42,360 @@ except AttributeError:
 #  CONFIGURATION
 # ============================================================================
 
-SECRET_PATTERNS = [
-    # API Keys & Tokens
-    (r'api[_-]?key\s*[=:]\s*["\'][^"\']{10,}["\']', "API Key", "high"),
-    (r'token\s*[=:]\s*["\'][^"\']{10,}["\']', "Token", "high"),
-    (r'bearer\s+[a-zA-Z0-9\-_.]+', "Bearer Token", "critical"),
-    
-    # Cloud Credentials
-    (r'AKIA[0-9A-Z]{16}', "AWS Access Key", "critical"),
-    (r'aws[_-]?secret[_-]?access[_-]?key\s*[=:]\s*["\'][^"\']+["\']', "AWS Secret", "critical"),
-    (r'AZURE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']', "Azure Credential", "critical"),
-    (r'GOOGLE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']', "GCP Credential", "critical"),
-    
-    # Database & Connections
-    (r'password\s*[=:]\s*["\'][^"\']{4,}["\']', "Password", "high"),
-    (r'(mongodb|postgres|mysql|redis):\/\/[^\s"\']+', "Database Connection String", "critical"),
-    
-    # Private Keys
-    (r'-----BEGIN\s+(RSA|PRIVATE|EC)\s+KEY-----', "Private Key", "critical"),
-    (r'ssh-rsa\s+[A-Za-z0-9+/]+', "SSH Key", "critical"),
-    
-    # JWT
-    (r'eyJ[A-Za-z0-9-_]+\.eyJ[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+', "JWT Token", "high"),
-]
-
-DANGEROUS_PATTERNS = [
-    # Injection risks
-    (r'eval\s*\(', "eval() usage", "critical", "Code Injection risk"),
-    (r'exec\s*\(', "exec() usage", "critical", "Code Injection risk"),
-    (r'new\s+Function\s*\(', "Function constructor", "high", "Code Injection risk"),
-    (r'child_process\.exec\s*\(', "child_process.exec", "high", "Command Injection risk"),
-    (r'subprocess\.call\s*\([^)]*shell\s*=\s*True', "subprocess with shell=True", "high", "Command Injection risk"),
-    
-    # XSS risks
-    (r'dangerouslySetInnerHTML', "dangerouslySetInnerHTML", "high", "XSS risk"),
-    (r'\.innerHTML\s*=', "innerHTML assignment", "medium", "XSS risk"),
-    (r'document\.write\s*\(', "document.write", "medium", "XSS risk"),
-    
-    # SQL Injection indicators
-    (r'["\'][^"\']*\+\s*[a-zA-Z_]+\s*\+\s*["\'].*(?:SELECT|INSERT|UPDATE|DELETE)', "SQL String Concat", "critical", "SQL Injection risk"),
-    (r'f"[^"]*(?:SELECT|INSERT|UPDATE|DELETE)[^"]*\{', "SQL f-string", "critical", "SQL Injection risk"),
-    
-    # Insecure configurations
-    (r'verify\s*=\s*False', "SSL Verify Disabled", "high", "MITM risk"),
-    (r'--insecure', "Insecure flag", "medium", "Security disabled"),
-    (r'disable[_-]?ssl', "SSL Disabled", "high", "MITM risk"),
-    
-    # Unsafe deserialization
-    (r'pickle\.loads?\s*\(', "pickle usage", "high", "Deserialization risk"),
-    (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
-]
+# Rule packs (JSON, or YAML when PyYAML is installed). Rules live in packs so
+# teams can add their own without touching this script; see rules/default.json.
+DEFAULT_RULE_PACK = Path(__file__).resolve().parent.parent / "rules" / "default.json"
+RULE_SCANNERS = {"secrets", "patterns", "config"}
+
+# Regex guards (see RuleEngine): single call limit for every rule, and for
+# rules marked "expensive" a cumulative time budget and the longest input
+# they are allowed to see
+DEFAULT_RULE_BUDGET_MS = 5000
+DEFAULT_RULE_CALL_TIMEOUT_MS = 1000
+DEFAULT_MAX_LINE_LENGTH = 4000
 
 SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
-CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
-CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
+
+# Called as on_finding(tool, finding) the moment a scanner records a finding
+FindingCallback = Callable[[str, Dict[str, Any]], None]
+
+SARIF_LEVELS = {"critical": "error", "high": "error", "medium": "warning", "moderate": "warning", "low": "note"}
+
+
+# ============================================================================
+#  STREAMING OUTPUT
+# ============================================================================
+
+class JsonLinesWriter:
+    """Emit each finding as one JSON object per line, flushed immediately."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write_finding(self, tool: str, finding: Dict[str, Any]):
+        self._write({"record": "finding", "tool": tool, **finding})
+
+    def close(self, report: Dict[str, Any]):
+        self._write({"record": "summary", "project": report["project"],
+                     "timestamp": report["timestamp"], **report["summary"],
+                     "rule_guard": report.get("rule_guard")})
+
+    def _write(self, record: Dict[str, Any]):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+class SarifWriter:
+    """
+    Incremental SARIF 2.1.0 writer.
+    Results are written as they arrive; the rule table is small and is
+    emitted after the results array, when the run is closed.
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.rules: Dict[str, Dict[str, Any]] = {}
+        self.count = 0
+        self.stream.write('{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", '
+                          '"version": "2.1.0", "runs": [{"results": [\n')
+
+    def write_finding(self, tool: str, finding: Dict[str, Any]):
+        rule_name = finding.get("pattern") or finding.get("type") or finding.get("issue") or tool
+        rule_id = finding.get("rule") or f"{tool}/{re.sub(r'[^A-Za-z0-9]+', '-', rule_name).strip('-').lower()}"
+        severity = finding.get("severity", "low")
+        if rule_id not in self.rules:
+            self.rules[rule_id] = {
+                "id": rule_id,
+                "name": rule_name,
+                "shortDescription": {"text": finding.get("category") or rule_name},
+                "properties": {"severity": severity},
+            }
+
+        message = finding.get("message") or finding.get("issue") or rule_name
+        if finding.get("count"):
+            message = f"{message} ({finding['count']} matches)"
+        result: Dict[str, Any] = {
+            "ruleId": rule_id,
+            "level": SARIF_LEVELS.get(severity, "warning"),
+            "message": {"text": message},
+        }
+        if finding.get("file"):
+            location: Dict[str, Any] = {"artifactLocation": {"uri": Path(finding["file"]).as_posix()}}
+            if finding.get("line"):
+                location["region"] = {"startLine": finding["line"]}
+                if finding.get("snippet"):
+                    location["region"]["snippet"] = {"text": finding["snippet"]}
+            result["locations"] = [{"physicalLocation": location}]
+
+        prefix = ",\n" if self.count else ""
+        self.stream.write(prefix + json.dumps(result, ensure_ascii=False))
+        self.stream.flush()
+        self.count += 1
+
+    def close(self, report: Dict[str, Any]):
+        driver = {
+            "name": "security_scan",
+            "informationUri": "https://owasp.org/Top10/",
+            "rules": list(self.rules.values()),
+        }
+        # Aborted rules mean the scan was incomplete; surface them as notifications
+        notifications = [{
+            "level": "warning",
+            "message": {"text": f"Rule {a['rule']} aborted: {a['reason']}"},
+            "descriptor": {"id": a["rule"]},
+        } for a in report.get("rule_guard", {}).get("aborted", [])]
+        invocation = {"executionSuccessful": not report["summary"].get("incomplete"),
+                      "toolExecutionNotifications": notifications}
+        self.stream.write('\n], "tool": {"driver": ' + json.dumps(driver, ensure_ascii=False) +
+                          '}, "invocations": [' + json.dumps(invocation, ensure_ascii=False) + ']}]}\n')
+        self.stream.flush()
+
+
+def _emit(on_finding: Optional[FindingCallback], tool: str, results: Dict[str, Any], finding: Dict[str, Any],
+          keep: Optional[int] = None):
+    """
+    Record a finding. Every finding is counted (finding_count, severity_counts)
+    and passed to on_finding, but only the first keep (None = all) are held in
+    results["findings"] - a streaming run keeps none.
+    """
+    results["finding_count"] = results.get("finding_count", 0) + 1
+    counts = results.setdefault("severity_counts", {})
+    severity = finding.get("severity", "low")
+    counts[severity] = counts.get(severity, 0) + 1
+    if keep is None or len(results["findings"]) < keep:
+        results["findings"].append(finding)
+    if on_finding:
+        on_finding(tool, finding)
+
+
+# ============================================================================
+#  RULE ENGINE
+# ============================================================================
+
+class Rule:
+    """A single compiled rule from a rule pack."""
+    __slots__ = ("id", "scanner", "name", "severity", "category", "regex", "extensions", "filenames",
+                 "requires", "expensive")
+
+    def __init__(self, spec: Dict[str, Any]):
+        missing = [k for k in ("id", "scanner", "name", "severity", "pattern") if k not in spec]
+        if missing:
+            raise ValueError(f"Rule {spec.get('id', '?')}: missing {', '.join(missing)}")
+        if spec["scanner"] not in RULE_SCANNERS:
+            raise ValueError(f"Rule {spec['id']}: unknown scanner '{spec['scanner']}'")
+
+        self.id = spec["id"]
+        self.scanner = spec["scanner"]
+        self.name = spec["name"]
+        self.severity = spec["severity"]
+        self.category = spec.get("category", "")
+        flags = re.IGNORECASE if spec.get("ignore_case", True) else 0
+        try:
+            self.regex = re.compile(spec["pattern"], flags)
+        except re.error as e:
+            raise ValueError(f"Rule {self.id}: invalid pattern ({e})")
+        self.extensions = frozenset(e.lower() for e in spec.get("extensions", []))
+        self.filenames = frozenset(spec.get("filenames", []))
+        # Cheap pre-filter: the regex only runs when one of these literals is present
+        self.requires = tuple(lit.lower() for lit in spec.get("requires", []))
+        # Expensive rules never run on inputs longer than the engine's max_line_length
+        self.expensive = bool(spec.get("expensive", False))
+
+
+class RuleEngine:
+    """
+    Rules from one or more packs, compiled once and indexed by file type.
+    Every file only runs the rules whose extensions (or filenames) match it,
+    and per-rule timing is recorded to spot pathological regexes.
+
+    Python's re cannot be interrupted mid-match, so the guards work around
+    calls: literal pre-filters keep most calls from running at all, expensive
+    rules never see a line longer than max_line_length (whole-file inputs
+    have those lines blanked out), and a rule that overruns its call timeout
+    (or, if expensive, its cumulative budget) is aborted for the rest of the
+    scan. Call times are wall-clock, so a loaded machine can abort a rule:
+    that makes the scan incomplete, which is reported as a warning in its
+    status (and SARIF invocation), not as a failure.
+    """
+
+    def __init__(self, rules: List[Rule], packs: List[str]):
+        self.rules = rules
+        self.packs = packs
+        self.budget_ms = DEFAULT_RULE_BUDGET_MS
+        self.call_timeout_ms = DEFAULT_RULE_CALL_TIMEOUT_MS
+        self.max_line_length = DEFAULT_MAX_LINE_LENGTH
+        self._by_type: Dict[Tuple[str, str], List[Rule]] = {}
+        self._filenames = frozenset().union(*(r.filenames for r in rules))
+        # Pack file name -> resolved paths: the packs are never scanned themselves
+        self._packs: Dict[str, set] = {}
+        for pack in packs:
+            self._packs.setdefault(os.path.basename(pack), set()).add(os.path.realpath(pack))
+        self.reset_stats()
+
+    def set_limits(self, budget_ms: Optional[float] = None, call_timeout_ms: Optional[float] = None,
+                   max_line_length: Optional[int] = None):
+        if budget_ms is not None:
+            self.budget_ms = budget_ms
+        if call_timeout_ms is not None:
+            self.call_timeout_ms = call_timeout_ms
+        if max_line_length is not None:
+            self.max_line_length = max_line_length
+
+    def reset_stats(self):
+        # rule id -> [calls, seconds, matches, prefiltered, skipped_long, skipped_aborted]
+        self._stats: Dict[str, List[float]] = {r.id: [0, 0.0, 0, 0, 0, 0] for r in self.rules}
+        self._aborted: Dict[str, str] = {}
+        self._capped_for: Optional[str] = None
+
+    def scannable(self, root: str, files: List[str]) -> List[str]:
+        """files in root, minus the loaded rule packs (their patterns match their own examples)."""
+        return [f for f in files
+                if f not in self._packs or os.path.realpath(os.path.join(root, f)) not in self._packs[f]]
+
+    def rules_for(self, scanner: str, filename: str) -> List[Rule]:
+        """Rules of a scanner applicable to filename (cached per extension/name)."""
+        ext = Path(filename).suffix.lower()
+        key = (scanner, filename if filename in self._filenames else ext)
+        rules = self._by_type.get(key)
+        if rules is None:
+            rules = [r for r in self.rules
+                     if r.scanner == scanner and (ext in r.extensions or filename in r.filenames)]
+            self._by_type[key] = rules
+        return rules
+
+    def search(self, rule: Rule, text: str, folded: Optional[str] = None):
+        text = self._admit(rule, text, folded)
+        if text is None:
+            return None
+        start = time.perf_counter()
+        match = rule.regex.search(text)
+        self._record(rule, start, 1 if match else 0)
+        return match
+
+    def findall(self, rule: Rule, text: str, folded: Optional[str] = None) -> List[Any]:
+        text = self._admit(rule, text, folded)
+        if text is None:
+            return []
+        start = time.perf_counter()
+        matches = rule.regex.findall(text)
+        self._record(rule, start, len(matches))
+        return matches
+
+    def _admit(self, rule: Rule, text: str, folded: Optional[str]) -> Optional[str]:
+        """
+        Apply abort, pre-filter and length guards before running a rule: the
+        text to run it on, or None to skip it.
+        """
+        stat = self._stats[rule.id]
+        if rule.id in self._aborted:
+            stat[5] += 1
+            return None
+        if rule.requires:
+            folded = folded if folded is not None else text.lower()
+            if not any(lit in folded for lit in rule.requires):
+                stat[3] += 1
+                return None
+        if rule.expensive and len(text) > self.max_line_length:
+            capped, skipped = self._capped(text)
+            stat[4] += skipped
+            return capped if capped.strip() else None
+        return text
+
+    def _capped(self, text: str) -> Tuple[str, int]:
+        """text with every line over max_line_length blanked (line numbers kept), and how many were."""
+        if self._capped_for is not text:
+            kept, skipped = [], 0
+            for line in text.splitlines(keepends=True):
+                if len(line.rstrip('\r\n')) > self.max_line_length:
+                    kept.append('\n')
+                    skipped += 1
+                else:
+                    kept.append(line)
+            self._capped_for, self._capped_result = text, (''.join(kept), skipped)
+        return self._capped_result
+
+    def _record(self, rule: Rule, start: float, matches: int):
+        elapsed = time.perf_counter() - start
+        stat = self._stats[rule.id]
+        stat[0] += 1
+        stat[1] += elapsed
+        stat[2] += matches
+        if elapsed * 1000 > self.call_timeout_ms:
+            self._aborted[rule.id] = f"single call took {elapsed * 1000:.1f} ms (limit {self.call_timeout_ms:g} ms)"
+        elif rule.expensive and stat[1] * 1000 > self.budget_ms:
+            self._aborted[rule.id] = f"exceeded {self.budget_ms:g} ms budget"
+
+    def timing_report(self) -> List[Dict[str, Any]]:
+        """Per-rule calls, total/avg time and matches, slowest first."""
+        report = []
+        for rule in self.rules:
+            calls, seconds, matches = self._stats[rule.id][:3]
+            if not calls:
+                continue
+            report.append({
+                "rule": rule.id,
+                "calls": calls,
+                "total_ms": round(seconds * 1000, 3),
+                "avg_us": round(seconds / calls * 1e6, 2),
+                "matches": matches,
+            })
+        return sorted(report, key=lambda r: r["total_ms"], reverse=True)
+
+    def guard_report(self) -> Dict[str, Any]:
+        """Rules that were aborted, or skipped by the pre-filter / length cap."""
+        aborted = [{"rule": rule_id, "reason": reason, "skipped_after_abort": int(self._stats[rule_id][5])}
+                   for rule_id, reason in self._aborted.items()]
+        skipped = []
+        for rule in self.rules:
+            prefiltered, skipped_long = self._stats[rule.id][3:5]
+            if prefiltered or skipped_long:
+                skipped.append({"rule": rule.id, "prefiltered": int(prefiltered),
+                                "skipped_long_input": int(skipped_long)})
+        return {
+            "limits": {"budget_ms": self.budget_ms, "call_timeout_ms": self.call_timeout_ms,
+                       "max_line_length": self.max_line_length},
+            "aborted": aborted,
+            "skipped": skipped,
+        }
+
+
+def read_rule_pack(path: Path) -> Dict[str, Any]:
+    """Read a JSON or YAML rule pack."""
+    text = path.read_text(encoding='utf-8')
+    if path.suffix.lower() in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"{path}: YAML rule packs require PyYAML (pip install pyyaml)")
+        return yaml.safe_load(text) or {}
+    return json.loads(text)
+
+
+@functools.lru_cache(maxsize=None)
+def load_rule_engine(extra_packs: Tuple[str, ...] = (), include_default: bool = True) -> RuleEngine:
+    """
+    Load and compile rule packs once per process.
+    Later packs override earlier rules with the same id.
+    """
+    pack_paths = ([DEFAULT_RULE_PACK] if include_default else []) + [Path(p) for p in extra_packs]
+    rules: Dict[str, Rule] = {}
+    for pack_path in pack_paths:
+        try:
+            pack = read_rule_pack(pack_path)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Cannot load rule pack {pack_path}: {e}")
+        for spec in pack.get("rules", []):
+            rule = Rule(spec)
+            rules[rule.id] = rule
+    return RuleEngine(list(rules.values()), [str(p) for p in pack_paths])
 
 
 # ============================================================================
 #  SCANNING FUNCTIONS
 # ============================================================================
 
-def scan_dependencies(project_path: str) -> Dict[str, Any]:
+def scan_dependencies(project_path: str, on_finding: Optional[FindingCallback] = None,
+                      max_findings: Optional[int] = None) -> Dict[str, Any]:
     """
     Validate supply chain security (OWASP A03).
     Checks: npm audit, lock file presence, dependency age.
@@ -122,11 +423,11 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
                 found_locks.append(manager)
             else:
                 missing_locks.append(manager)
-                results["findings"].append({
+                _emit(on_finding, results["tool"], results, {
                     "type": "Missing Lock File",
                     "severity": "high",
                     "message": f"{manager}: No lock file found. Supply chain integrity at risk."
-                })
+                }, max_findings)
     
     # Run npm audit if applicable
     if (Path(project_path) / "package.json").exists():
@@ -151,18 +452,18 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
                 
                 if severity_count["critical"] > 0:
                     results["status"] = "[!!] Critical vulnerabilities"
-                    results["findings"].append({
+                    _emit(on_finding, results["tool"], results, {
                         "type": "npm audit",
                         "severity": "critical",
                         "message": f"{severity_count['critical']} critical vulnerabilities in dependencies"
-                    })
+                    }, max_findings)
                 elif severity_count["high"] > 0:
                     results["status"] = "[!] High vulnerabilities"
-                    results["findings"].append({
+                    _emit(on_finding, results["tool"], results, {
                         "type": "npm audit",
                         "severity": "high",
                         "message": f"{severity_count['high']} high severity vulnerabilities"
-                    })
+                    }, max_findings)
                 
                 results["npm_audit"] = severity_count
                 
@@ -172,17 +473,19 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
         except (FileNotFoundError, subprocess.TimeoutExpired):
             pass
     
-    if not results["findings"]:
+    if not results.get("finding_count"):
         results["status"] = "[OK] Supply chain checks passed"
     
     return results
 
 
-def scan_secrets(project_path: str) -> Dict[str, Any]:
+def scan_secrets(project_path: str, on_finding: Optional[FindingCallback] = None,
+                 max_findings: Optional[int] = 15, engine: Optional[RuleEngine] = None) -> Dict[str, Any]:
     """
     Validate no hardcoded secrets (OWASP A04).
     Checks: API keys, tokens, passwords, cloud credentials.
     """
+    engine = engine or load_rule_engine()
     results = {
         "tool": "secret_scanner",
         "findings": [],
@@ -194,9 +497,9 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
     for root, dirs, files in os.walk(project_path):
         dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
+        for file in engine.scannable(root, files):
+            rules = engine.rules_for("secrets", file)
+            if not rules:
                 continue
                 
             filepath = Path(root) / file
@@ -205,17 +508,19 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
             try:
                 with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
                     content = f.read()
+                    folded = content.lower()
                     
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
+                    for rule in rules:
+                        matches = engine.findall(rule, content, folded)
                         if matches:
-                            results["findings"].append({
+                            _emit(on_finding, results["tool"], results, {
                                 "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
+                                "type": rule.name,
+                                "rule": rule.id,
+                                "severity": rule.severity,
                                 "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
+                            }, max_findings)
+                            results["by_severity"][rule.severity] = results["by_severity"].get(rule.severity, 0) + len(matches)
                             
             except Exception:
                 pass
@@ -227,17 +532,16 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
     elif sum(results["by_severity"].values()) > 0:
         results["status"] = "[?] Potential secrets detected"
     
-    # Limit findings for output
-    results["findings"] = results["findings"][:15]
-    
     return results
 
 
-def scan_code_patterns(project_path: str) -> Dict[str, Any]:
+def scan_code_patterns(project_path: str, on_finding: Optional[FindingCallback] = None,
+                       max_findings: Optional[int] = 20, engine: Optional[RuleEngine] = None) -> Dict[str, Any]:
     """
     Validate dangerous code patterns (OWASP A05).
     Checks: Injection risks, XSS, unsafe deserialization.
     """
+    engine = engine or load_rule_engine()
     results = {
         "tool": "pattern_scanner",
         "findings": [],
@@ -249,9 +553,9 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
     for root, dirs, files in os.walk(project_path):
         dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
+        for file in engine.scannable(root, files):
+            rules = engine.rules_for("patterns", file)
+            if not rules:
                 continue
                 
             filepath = Path(root) / file
@@ -262,42 +566,44 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
                     lines = f.readlines()
                     
                     for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
+                        folded = line.lower()
+                        for rule in rules:
+                            if engine.search(rule, line, folded):
+                                _emit(on_finding, results["tool"], results, {
                                     "file": str(filepath.relative_to(project_path)),
                                     "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
+                                    "pattern": rule.name,
+                                    "rule": rule.id,
+                                    "severity": rule.severity,
+                                    "category": rule.category,
                                     "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
+                                }, max_findings)
+                                results["by_category"][rule.category] = results["by_category"].get(rule.category, 0) + 1
                                 
             except Exception:
                 pass
     
-    critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
-    high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
+    counts = results.get("severity_counts", {})
+    critical_count = counts.get("critical", 0)
+    high_count = counts.get("high", 0)
     
     if critical_count > 0:
         results["status"] = f"[!!] CRITICAL: {critical_count} dangerous patterns"
     elif high_count > 0:
         results["status"] = f"[!] HIGH: {high_count} risky patterns"
-    elif results["findings"]:
+    elif results.get("finding_count"):
         results["status"] = "[?] Some patterns need review"
     
-    # Limit findings
-    results["findings"] = results["findings"][:20]
-    
     return results
 
 
-def scan_configuration(project_path: str) -> Dict[str, Any]:
+def scan_configuration(project_path: str, on_finding: Optional[FindingCallback] = None,
+                       engine: Optional[RuleEngine] = None, max_findings: Optional[int] = None) -> Dict[str, Any]:
     """
     Validate security configuration (OWASP A02).
     Checks: Security headers, CORS, debug modes.
     """
+    engine = engine or load_rule_engine()
     results = {
         "tool": "config_scanner",
         "findings": [],
@@ -305,22 +611,12 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
         "checks": {}
     }
     
-    # Check common config files for issues
-    config_issues = [
-        (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
-        (r'debug\s*=\s*True', "Debug mode enabled", "high"),
-        (r'NODE_ENV.*development', "Development mode in config", "medium"),
-        (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
-        (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
-        (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
-    ]
-    
     for root, dirs, files in os.walk(project_path):
         dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
         
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
+        for file in engine.scannable(root, files):
+            rules = engine.rules_for("config", file)
+            if not rules:
                 continue
                 
             filepath = Path(root) / file
@@ -328,14 +624,16 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
             try:
                 with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
                     content = f.read()
+                    folded = content.lower()
                     
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
+                    for rule in rules:
+                        if engine.search(rule, content, folded):
+                            _emit(on_finding, results["tool"], results, {
                                 "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
+                                "issue": rule.name,
+                                "rule": rule.id,
+                                "severity": rule.severity
+                            }, max_findings)
                             
             except Exception:
                 pass
@@ -349,17 +647,18 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
             break
     else:
         results["checks"]["security_headers_config"] = False
-        results["findings"].append({
+        _emit(on_finding, results["tool"], results, {
             "issue": "No security headers configuration found",
             "severity": "medium",
             "recommendation": "Configure CSP, HSTS, X-Frame-Options headers"
-        })
+        }, max_findings)
     
-    if any(f["severity"] == "critical" for f in results["findings"]):
+    counts = results.get("severity_counts", {})
+    if counts.get("critical"):
         results["status"] = "[!!] CRITICAL: Configuration issues"
-    elif any(f["severity"] == "high" for f in results["findings"]):
+    elif counts.get("high"):
         results["status"] = "[!] HIGH: Configuration review needed"
-    elif results["findings"]:
+    elif results.get("finding_count"):
         results["status"] = "[?] Minor configuration issues"
     
     return results
@@ -369,8 +668,16 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
 #  MAIN
 # ============================================================================
 
-def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
-    """Execute security validation scans."""
+def run_full_scan(project_path: str, scan_type: str = "all", writer=None,
+                  engine: Optional[RuleEngine] = None, rule_timings: bool = False) -> Dict[str, Any]:
+    """
+    Execute security validation scans.
+    With a writer (JsonLinesWriter/SarifWriter) every finding is streamed as soon
+    as it is found and none are held in memory: the scanner results keep only
+    their counts.
+    """
+    engine = engine or load_rule_engine()
+    engine.reset_stats()
     
     report = {
         "project": project_path,
@@ -385,27 +692,29 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
         }
     }
     
+    limit = {"max_findings": 0} if writer else {}
     scanners = {
-        "deps": ("dependencies", scan_dependencies),
-        "secrets": ("secrets", scan_secrets),
-        "patterns": ("code_patterns", scan_code_patterns),
-        "config": ("configuration", scan_configuration),
+        "deps": ("dependencies", scan_dependencies, {**limit}),
+        "secrets": ("secrets", scan_secrets, {"engine": engine, **limit}),
+        "patterns": ("code_patterns", scan_code_patterns, {"engine": engine, **limit}),
+        "config": ("configuration", scan_configuration, {"engine": engine, **limit}),
     }
     
-    for key, (name, scanner) in scanners.items():
+    def on_finding(tool: str, finding: Dict[str, Any]):
+        # Tally here so the summary reflects every finding, not the truncated lists
+        report["summary"]["total_findings"] += 1
+        sev = finding.get("severity", "low")
+        if sev == "critical":
+            report["summary"]["critical"] += 1
+        elif sev == "high":
+            report["summary"]["high"] += 1
+        if writer:
+            writer.write_finding(tool, finding)
+    
+    for key, (name, scanner, kwargs) in scanners.items():
         if scan_type == "all" or scan_type == key:
-            result = scanner(project_path)
+            result = scanner(project_path, on_finding, **kwargs)
             report["scans"][name] = result
-            
-            findings_count = len(result.get("findings", []))
-            report["summary"]["total_findings"] += findings_count
-            
-            for finding in result.get("findings", []):
-                sev = finding.get("severity", "low")
-                if sev == "critical":
-                    report["summary"]["critical"] += 1
-                elif sev == "high":
-                    report["summary"]["high"] += 1
     
     # Determine overall status
     if report["summary"]["critical"] > 0:
@@ -415,6 +724,39 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
     elif report["summary"]["total_findings"] > 0:
         report["summary"]["overall_status"] = "[?] REVIEW RECOMMENDED"
     
+    report["rule_packs"] = engine.packs
+    report["rule_guard"] = engine.guard_report()
+    
+    # A rule aborted by the guards did not see every file: never report that as secure (but a
+    # wall-clock abort depends on machine load, so it is a warning, not a failed scan)
+    aborted = len(report["rule_guard"]["aborted"])
+    report["summary"]["incomplete"] = aborted > 0
+    if aborted and report["summary"]["total_findings"] == 0:
+        report["summary"]["overall_status"] = f"[?] REVIEW: {aborted} rule(s) aborted, results incomplete"
+    if rule_timings:
+        report["rule_timings"] = engine.timing_report()
+    
+    return report
+
+
+def run(project_path: str, scan_type: str = "all", rules: Tuple[str, ...] = (),
+        default_rules: bool = True, rule_timings: bool = False, **opts) -> Dict[str, Any]:
+    """
+    The JSON report for project_path, without printing. Findings are advisory
+    (the CLI exits 0 whatever it finds), so "passed" is only False when the
+    scan could not run at all. Rules aborted by the guards (see RuleEngine)
+    leave the scan incomplete, which is reported as a warning.
+    """
+    if not os.path.isdir(project_path):
+        return {"error": f"Directory not found: {project_path}", "passed": False}
+    try:
+        engine = load_rule_engine(tuple(rules), default_rules)
+    except ValueError as e:
+        return {"error": str(e), "passed": False}
+    report = run_full_scan(project_path, scan_type, engine=engine, rule_timings=rule_timings)
+    report["passed"] = True
+    if report["summary"]["incomplete"]:
+        report["warning"] = f"{len(report['rule_guard']['aborted'])} rule(s) aborted by the regex guards; results incomplete"
     return report
 
 
@@ -425,8 +767,21 @@ def main():
     parser.add_argument("project_path", nargs="?", default=".", help="Project directory to scan")
     parser.add_argument("--scan-type", choices=["all", "deps", "secrets", "patterns", "config"],
                         default="all", help="Type of scan to run")
-    parser.add_argument("--output", choices=["json", "summary"], default="json",
-                        help="Output format")
+    parser.add_argument("--output", choices=["json", "summary", "jsonl", "sarif"], default="json",
+                        help="Output format (jsonl/sarif stream every finding as it is found)")
+    parser.add_argument("--output-file", help="Write output to this file instead of stdout")
+    parser.add_argument("--rules", action="append", default=[], metavar="PACK",
+                        help="Extra rule pack (JSON/YAML); repeatable, overrides rules by id")
+    parser.add_argument("--no-default-rules", action="store_true",
+                        help="Only use the rule packs given with --rules")
+    parser.add_argument("--rule-timings", action="store_true",
+                        help="Report per-rule match timing (find slow regexes)")
+    parser.add_argument("--rule-budget-ms", type=float, default=DEFAULT_RULE_BUDGET_MS,
+                        help="Abort an expensive rule once its total match time exceeds this")
+    parser.add_argument("--rule-call-timeout-ms", type=float, default=DEFAULT_RULE_CALL_TIMEOUT_MS,
+                        help="Abort a rule after a single match call slower than this")
+    parser.add_argument("--max-line-length", type=int, default=DEFAULT_MAX_LINE_LENGTH,
+                        help="Skip expensive rules on lines/inputs longer than this")
     
     args = parser.parse_args()
     
@@ -434,24 +789,65 @@ def main():
         print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
         sys.exit(1)
     
-    result = run_full_scan(args.project_path, args.scan_type)
+    try:
+        engine = load_rule_engine(tuple(args.rules), not args.no_default_rules)
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+    engine.set_limits(args.rule_budget_ms, args.rule_call_timeout_ms, args.max_line_length)
+    
+    stream = open(args.output_file, 'w', encoding='utf-8') if args.output_file else sys.stdout
+    
+    try:
+        emit_report(args, engine, stream)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+def emit_report(args: argparse.Namespace, engine: RuleEngine, stream: TextIO) -> Dict[str, Any]:
+    """Run the scan, write it to stream in the requested format and return it."""
+    if args.output in ("jsonl", "sarif"):
+        writer = JsonLinesWriter(stream) if args.output == "jsonl" else SarifWriter(stream)
+        result = run_full_scan(args.project_path, args.scan_type, writer, engine, args.rule_timings)
+        writer.close(result)
+        return result
+    
+    result = run_full_scan(args.project_path, args.scan_type, engine=engine, rule_timings=args.rule_timings)
     
     if args.output == "summary":
-        print(f"\n{'='*60}")
-        print(f"Security Scan: {result['project']}")
-        print(f"{'='*60}")
-        print(f"Status: {result['summary']['overall_status']}")
-        print(f"Total Findings: {result['summary']['total_findings']}")
-        print(f"  Critical: {result['summary']['critical']}")
-        print(f"  High: {result['summary']['high']}")
-        print(f"{'='*60}\n")
+        print(f"\n{'='*60}", file=stream)
+        print(f"Security Scan: {result['project']}", file=stream)
+        print(f"{'='*60}", file=stream)
+        print(f"Status: {result['summary']['overall_status']}", file=stream)
+        print(f"Total Findings: {result['summary']['total_findings']}", file=stream)
+        print(f"  Critical: {result['summary']['critical']}", file=stream)
+        print(f"  High: {result['summary']['high']}", file=stream)
+        print(f"{'='*60}\n", file=stream)
         
         for scan_name, scan_result in result['scans'].items():
-            print(f"\n{scan_name.upper()}: {scan_result['status']}")
+            print(f"\n{scan_name.upper()}: {scan_result['status']}", file=stream)
             for finding in scan_result.get('findings', [])[:5]:
-                print(f"  - {finding}")
+                print(f"  - {finding}", file=stream)
+        
+        guard = result["rule_guard"]
+        if guard["aborted"]:
+            print(f"\nABORTED RULES (results incomplete):", file=stream)
+            for aborted in guard["aborted"]:
+                print(f"  - {aborted['rule']}: {aborted['reason']}", file=stream)
+        long_skips = [s for s in guard["skipped"] if s["skipped_long_input"]]
+        if long_skips:
+            print(f"\nSKIPPED ON LONG LINES (> {guard['limits']['max_line_length']} chars):", file=stream)
+            for skipped in long_skips:
+                print(f"  - {skipped['rule']}: {skipped['skipped_long_input']} line(s)", file=stream)
+        
+        if result.get("rule_timings"):
+            print(f"\nSLOWEST RULES:", file=stream)
+            for timing in result["rule_timings"][:10]:
+                print(f"  {timing['total_ms']:>9.2f} ms  {timing['calls']:>7} calls  {timing['rule']}", file=stream)
     else:
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result, indent=2), file=stream)
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for security_scan.py
+
+Usage:
+    python -m unittest discover .agent/skills/vulnerability-scanner/tests
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+import security_scan
+
+
+class RulePackNotScannedTest(unittest.TestCase):
+    """A tree that contains the rule pack (this repo's own .agent/) must not flag the pack."""
+
+    def setUp(self):
+        self.project = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.project)
+        rules_dir = self.project / ".agent" / "skills" / "vulnerability-scanner" / "rules"
+        rules_dir.mkdir(parents=True)
+        self.pack = rules_dir / "default.json"
+        shutil.copy(security_scan.DEFAULT_RULE_PACK, self.pack)
+        # A genuine finding next to it, so the scanners are known to have run
+        # (the key is split so this file does not trip the scanner itself)
+        fake_key = "AKIA" + "ABCDEFGHIJKLMNOP"
+        (self.project / "settings.py").write_text(f'DEBUG = True\naws_key = "{fake_key}"\n', encoding="utf-8")
+
+    def scan(self, pack):
+        engine = security_scan.load_rule_engine((str(pack),), False)
+        return security_scan.run_full_scan(str(self.project), "all", engine=engine)
+
+    def findings(self, report):
+        return [f for scan in report["scans"].values() for f in scan["findings"]]
+
+    def test_pack_inside_tree_is_skipped(self):
+        report = self.scan(self.pack)
+        files = {f.get("file") for f in self.findings(report)}
+        self.assertNotIn(str(self.pack.relative_to(self.project)), files)
+        self.assertIn("settings.py", files)
+        self.assertNotIn("CRITICAL", report["scans"]["configuration"]["status"])
+
+    def test_pack_loaded_from_elsewhere_is_still_skipped(self):
+        # Loaded by one path, found by the walk under another (symlinked checkout)
+        link = Path(tempfile.mkdtemp()) / "rules"
+        self.addCleanup(shutil.rmtree, link.parent)
+        link.symlink_to(self.pack.parent, target_is_directory=True)
+        report = self.scan(link / "default.json")
+        files = {f.get("file") for f in self.findings(report)}
+        self.assertNotIn(str(self.pack.relative_to(self.project)), files)
+
+    def test_copy_of_pack_elsewhere_is_scanned(self):
+        # Only the loaded packs are excluded, not every file with the same name
+        copy = self.project / "config" / "default.json"
+        copy.parent.mkdir()
+        shutil.copy(self.pack, copy)
+        files = {f.get("file") for f in self.findings(self.scan(self.pack))}
+        self.assertIn(str(copy.relative_to(self.project)), files)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -149,6 +149,18 @@ def run_accessibility_check(url: str) -> dict:
     return result
 
 
+def run(project_path: str, url: str = None, screenshot: bool = False, a11y: bool = False, **opts) -> dict:
+    """
+    Test url; project_path is accepted because every check gets it. Like the
+    CLI, problems are reported inside the result, not as a failure.
+    """
+    if not url:
+        return {"error": "Usage: python playwright_runner.py <url> [--screenshot] [--a11y]", "passed": False}
+    result = run_accessibility_check(url) if a11y else run_basic_test(url, screenshot)
+    result["passed"] = True
+    return result
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({